@@ -0,0 +1,154 @@
+"""Synthetic SAM template generator used to measure how translation scales with template size."""
+
+from typing import Any, Dict, List, NamedTuple
+
+POLICY_TEMPLATES = (
+    ("SQSPollerPolicy", "QueueName", "queue"),
+    ("DynamoDBCrudPolicy", "TableName", "table"),
+    ("S3ReadPolicy", "BucketName", "bucket"),
+    ("SNSPublishMessagePolicy", "TopicName", "topic"),
+)
+
+# Lambda functions can have at most 5 layers
+MAX_LAYERS_PER_FUNCTION = 5
+
+
+class TemplateShape(NamedTuple):
+    """
+    Knobs of a synthetic SAM template.
+
+    Event counts are per function, every other count is per template.
+    """
+
+    functions: int = 1
+    api_events: int = 0
+    http_api_events: int = 0
+    sqs_events: int = 0
+    kinesis_events: int = 0
+    schedule_events: int = 0
+    policy_templates: int = 0
+    connectors: int = 0
+    state_machines: int = 0
+    state_machine_states: int = 3
+    layers: int = 0
+    applications: int = 0
+    globals_variables: int = 0
+
+    @classmethod
+    def dimensions(cls) -> List[str]:
+        return list(cls._fields)
+
+
+def _function(index: int, shape: TemplateShape) -> Dict[str, Any]:
+    events: Dict[str, Any] = {}
+    for j in range(shape.api_events):
+        events[f"Api{j}"] = {"Type": "Api", "Properties": {"Path": f"/f{index}/r{j}", "Method": "get"}}
+    for j in range(shape.http_api_events):
+        events[f"HttpApi{j}"] = {"Type": "HttpApi", "Properties": {"Path": f"/f{index}/h{j}", "Method": "post"}}
+    for j in range(shape.sqs_events):
+        events[f"Sqs{j}"] = {
+            "Type": "SQS",
+            "Properties": {
+                "Queue": {"Fn::Sub": f"arn:${{AWS::Partition}}:sqs:${{AWS::Region}}:${{AWS::AccountId}}:q{j}"}
+            },
+        }
+    for j in range(shape.kinesis_events):
+        events[f"Kinesis{j}"] = {
+            "Type": "Kinesis",
+            "Properties": {
+                "Stream": {
+                    "Fn::Sub": f"arn:${{AWS::Partition}}:kinesis:${{AWS::Region}}:${{AWS::AccountId}}:stream/s{j}"
+                },
+                "StartingPosition": "LATEST",
+            },
+        }
+    for j in range(shape.schedule_events):
+        events[f"Schedule{j}"] = {"Type": "Schedule", "Properties": {"Schedule": f"rate({j + 1} minutes)"}}
+
+    policies: List[Any] = ["AWSLambdaRole"]
+    for j in range(shape.policy_templates):
+        name, parameter, prefix = POLICY_TEMPLATES[j % len(POLICY_TEMPLATES)]
+        policies.append({name: {parameter: f"{prefix}{j}"}})
+
+    properties: Dict[str, Any] = {
+        "CodeUri": f"s3://sam-benchmark/function{index}.zip",
+        "Handler": "index.handler",
+        "Policies": policies,
+    }
+    if events:
+        properties["Events"] = events
+    if shape.layers:
+        properties["Layers"] = [{"Ref": f"Layer{j}"} for j in range(min(shape.layers, MAX_LAYERS_PER_FUNCTION))]
+    return {"Type": "AWS::Serverless::Function", "Properties": properties}
+
+
+def _state_machine(index: int, shape: TemplateShape) -> Dict[str, Any]:
+    state_count = max(shape.state_machine_states, 1)
+    states: Dict[str, Any] = {}
+    for j in range(state_count):
+        state: Dict[str, Any] = {
+            "Type": "Task",
+            "Resource": "${FunctionArn}",
+            "Parameters": {"Payload.$": "$", "Step": j, "FunctionName": {"Ref": "Function0"}},
+        }
+        if j == state_count - 1:
+            state["End"] = True
+        else:
+            state["Next"] = f"Step{j + 1}"
+        states[f"Step{j}"] = state
+    return {
+        "Type": "AWS::Serverless::StateMachine",
+        "Properties": {
+            "Definition": {"StartAt": "Step0", "States": states},
+            "DefinitionSubstitutions": {"FunctionArn": {"Fn::GetAtt": ["Function0", "Arn"]}},
+            "Policies": [{"LambdaInvokePolicy": {"FunctionName": {"Ref": "Function0"}}}],
+        },
+    }
+
+
+def generate_template(shape: TemplateShape) -> Dict[str, Any]:
+    """Builds a SAM template with the given shape."""
+    if shape.functions < 1:
+        raise ValueError("At least one function is required.")
+
+    resources: Dict[str, Any] = {}
+    for j in range(shape.layers):
+        resources[f"Layer{j}"] = {
+            "Type": "AWS::Serverless::LayerVersion",
+            "Properties": {"ContentUri": f"s3://sam-benchmark/layer{j}.zip"},
+        }
+    for i in range(shape.functions):
+        resources[f"Function{i}"] = _function(i, shape)
+    for i in range(shape.state_machines):
+        resources[f"StateMachine{i}"] = _state_machine(i, shape)
+    for i in range(shape.connectors):
+        resources[f"Table{i}"] = {"Type": "AWS::Serverless::SimpleTable"}
+        resources[f"Connector{i}"] = {
+            "Type": "AWS::Serverless::Connector",
+            "Properties": {
+                "Source": {"Id": f"Function{i % shape.functions}"},
+                "Destination": {"Id": f"Table{i}"},
+                "Permissions": ["Read", "Write"],
+            },
+        }
+    for i in range(shape.applications):
+        resources[f"Application{i}"] = {
+            "Type": "AWS::Serverless::Application",
+            "Properties": {
+                "Location": {
+                    "ApplicationId": f"arn:aws:serverlessrepo:us-east-1:123456789012:applications/app{i}",
+                    "SemanticVersion": "1.0.0",
+                },
+                "Parameters": {"Index": str(i)},
+            },
+        }
+
+    template: Dict[str, Any] = {"Transform": "AWS::Serverless-2016-10-31", "Resources": resources}
+    global_function: Dict[str, Any] = {"Runtime": "python3.11", "MemorySize": 256, "Timeout": 30}
+    if shape.globals_variables:
+        global_function["Environment"] = {
+            "Variables": {f"VARIABLE_{j}": f"value{j}" for j in range(shape.globals_variables)}
+        }
+        global_function["Tags"] = {f"tag{j}": f"value{j}" for j in range(shape.globals_variables)}
+    template["Globals"] = {"Function": global_function}
+    return template
@@ -46,7 +46,7 @@ def generate_transform_test_output_files(input_file_path: Path, file_basename: s
     output_file_option = file_basename + ".json"
 
     with input_file_path.open(encoding="utf-8") as f:
-        manifest = yaml_parse(f)  # type: ignore[no-untyped-call]
+        manifest = yaml_parse(f)
 
     transform_test_output_paths = {
         "aws": ("us-west-2", TRANSFORM_TEST_DIR / "output" / output_file_option),
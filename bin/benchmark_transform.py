@@ -0,0 +1,521 @@
+#!/usr/bin/env python
+"""
+Benchmark SAM to CloudFormation translation over a corpus of SAM templates.
+
+By default every template under tests/translator/input is translated through `transform()`
+with a stubbed managed policy loader and a stubbed Serverless Application Repository, so no
+AWS credentials or network access are needed. For each template the wall time of every run,
+the percentile spread over the runs and the tracemalloc peak of one extra run are recorded.
+
+The `scale` command translates synthetic templates growing along one dimension (functions,
+API events, connectors, ...) to show how translate time and peak memory grow with template size.
+
+Usage:
+    bin/benchmark_transform.py run --output .tmp/benchmark.json
+    bin/benchmark_transform.py compare .tmp/baseline.json .tmp/benchmark.json --threshold 10
+    bin/benchmark_transform.py scale --dimension functions --values 10,100,1000 --set api_events=2
+    bin/benchmark_transform.py generate --set functions=1000 --set connectors=200 --output .tmp/large.json
+    bin/benchmark_transform.py parse --set state_machines=20 --set state_machine_states=500
+"""
+import argparse
+import copy
+import json
+import logging
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from unittest.mock import patch
+
+import yaml
+
+# To allow this script to be executed from other directories
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from bin._template_generator import TemplateShape, generate_template
+from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton
+from samtranslator.model.exceptions import InvalidDocumentException
+from samtranslator.translator.arn_generator import ArnGenerator
+from samtranslator.translator.managed_policy_translator import ManagedPolicyLoader
+from samtranslator.translator.transform import transform
+from samtranslator.yaml_helper import IntrinsicsSafeLoader, PurePythonIntrinsicsSafeLoader, yaml_parse
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_INPUT_DIR = SCRIPT_DIR.parent / "tests" / "translator" / "input"
+DEFAULT_REGION = "us-east-1"
+PERCENTILES = (50, 90, 99)
+# Scaling exponents above this are reported as super-linear growth
+SUPER_LINEAR_EXPONENT = 1.2
+
+# Same policies the transform tests provide, so translated output matches tests/translator/output.
+STUB_MANAGED_POLICIES = {
+    "AWSLambdaBasicExecutionRole": "arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole",
+    "AmazonDynamoDBFullAccess": "arn:aws:iam::aws:policy/AmazonDynamoDBFullAccess",
+    "AmazonDynamoDBReadOnlyAccess": "arn:aws:iam::aws:policy/AmazonDynamoDBReadOnlyAccess",
+    "AWSLambdaRole": "arn:aws:iam::aws:policy/service-role/AWSLambdaRole",
+    "AWSXrayWriteOnlyAccess": "arn:aws:iam::aws:policy/AWSXrayWriteOnlyAccess",
+}
+
+
+class StubManagedPolicyLoader(ManagedPolicyLoader):
+    """ManagedPolicyLoader that never calls IAM."""
+
+    def __init__(self, policy_map: Optional[Dict[str, str]] = None) -> None:
+        super().__init__(None)  # type: ignore[arg-type]
+        self._policy_map = dict(policy_map if policy_map is not None else STUB_MANAGED_POLICIES)
+
+
+def _stub_sar_service_call(self: Any, service_call_function: Any, logical_id: str, *args: Any) -> Dict[str, Any]:
+    application_id = args[0]
+    return {
+        "ApplicationId": application_id,
+        "SemanticVersion": args[1] if len(args) > 1 else "1.0.0",
+        "Status": "ACTIVE",
+        "TemplateId": "id-xx-xx",
+        "TemplateUrl": "https://awsserverlessrepo-changesets-xxx.s3.amazonaws.com/signed-url",
+    }
+
+
+def offline_transform_context(region: str) -> ExitStack:
+    """
+    Patches every external lookup done during a transform so that it can run offline, and restores
+    the process wide region and metrics set by Translator on exit.
+    """
+    stack = ExitStack()
+    stack.enter_context(patch.object(ArnGenerator, "BOTO_SESSION_REGION_NAME", ArnGenerator.BOTO_SESSION_REGION_NAME))
+    stack.enter_context(
+        patch.object(
+            MetricsMethodWrapperSingleton, "_METRICS_INSTANCE", MetricsMethodWrapperSingleton._METRICS_INSTANCE
+        )
+    )
+    stack.enter_context(
+        patch(
+            "samtranslator.plugins.application.serverless_app_plugin.ServerlessAppPlugin._sar_service_call",
+            _stub_sar_service_call,
+        )
+    )
+    stack.enter_context(patch("samtranslator.translator.arn_generator._get_region_from_session", return_value=region))
+    stack.enter_context(patch("boto3.session.Session.region_name", region))
+    return stack
+
+
+def dominant_resource_type(template: Any) -> str:
+    """Returns the most common resource type of the template, used to group benchmark results."""
+    resources = template.get("Resources") if isinstance(template, dict) else None
+    if not isinstance(resources, dict):
+        return "None"
+    types = Counter(
+        resource.get("Type")
+        for resource in resources.values()
+        if isinstance(resource, dict) and isinstance(resource.get("Type"), str)
+    )
+    if not types:
+        return "None"
+    return str(types.most_common(1)[0][0])
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Linearly interpolated percentile of an already sorted, non-empty sequence."""
+    if not sorted_values:
+        raise ValueError("Cannot compute a percentile of an empty sequence.")
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def summarize_timings(timings_ms: Sequence[float]) -> Dict[str, float]:
+    ordered = sorted(timings_ms)
+    summary = {
+        "min_ms": ordered[0],
+        "max_ms": ordered[-1],
+        "mean_ms": sum(ordered) / len(ordered),
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = percentile(ordered, pct)
+    return summary
+
+
+def _translate_once(manifest: Dict[str, Any], policy_loader: ManagedPolicyLoader) -> str:
+    # transform() mutates its input, every run gets its own copy.
+    try:
+        transform(copy.deepcopy(manifest), {}, policy_loader)
+    except InvalidDocumentException:
+        return "invalid"
+    return "ok"
+
+
+def benchmark_template(
+    manifest: Dict[str, Any],
+    runs: int,
+    warmup: int,
+    translate: Optional[Callable[[Dict[str, Any]], str]] = None,
+) -> Dict[str, Any]:
+    """
+    Translates the given SAM template `warmup + runs` times plus one traced run.
+
+    :param manifest: parsed SAM template
+    :param runs: number of timed runs
+    :param warmup: number of untimed runs done before the timed ones
+    :param translate: callable translating a manifest and returning its status, defaults to `transform()`
+    :return: dict with status, timing summary and tracemalloc peak
+    """
+    if runs < 1:
+        raise ValueError("At least one run is required.")
+    if translate is None:
+        policy_loader = StubManagedPolicyLoader()
+
+        def translate(m: Dict[str, Any]) -> str:
+            return _translate_once(m, policy_loader)
+
+    status = "ok"
+    for _ in range(warmup):
+        status = translate(manifest)
+
+    timings_ms: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter_ns()
+        status = translate(manifest)
+        timings_ms.append((time.perf_counter_ns() - start) / 1e6)
+
+    # tracemalloc slows down allocations a lot, so memory is measured in a separate run
+    tracemalloc.start()
+    try:
+        translate(manifest)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "status": status,
+        "runs": runs,
+        "timings_ms": timings_ms,
+        "summary": summarize_timings(timings_ms),
+        "tracemalloc_peak_bytes": peak,
+    }
+
+
+def iter_template_paths(input_dir: Path, pattern: str) -> Iterator[Path]:
+    yield from sorted(input_dir.glob(pattern))
+
+
+def run_benchmark(paths: Sequence[Path], runs: int, warmup: int, region: str) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with offline_transform_context(region):
+        for index, path in enumerate(paths, start=1):
+            manifest = None
+            try:
+                manifest = yaml_parse(path.read_text(encoding="utf-8"))
+                # Same normalization as the transform tests do
+                manifest = json.loads(json.dumps(manifest))
+                result = benchmark_template(manifest, runs, warmup)
+            except Exception as e:
+                result = {"status": "crash", "error": f"{type(e).__name__}: {e}"}
+            result["dominant_resource_type"] = dominant_resource_type(manifest)
+            results[path.stem] = result
+            print(f"[{index}/{len(paths)}] {path.stem}: {result.get('summary', {}).get('p50_ms', float('nan')):.2f} ms")
+    return {"metadata": _metadata(runs, warmup, region), "templates": results}
+
+
+def _metadata(runs: int, warmup: int, region: str) -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "warmup": warmup,
+        "region": region,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def parse_shape(overrides: Sequence[str]) -> TemplateShape:
+    """Builds a TemplateShape from `dimension=value` strings."""
+    values: Dict[str, int] = {}
+    for override in overrides:
+        name, sep, value = override.partition("=")
+        if not sep or name not in TemplateShape.dimensions():
+            raise ValueError(f"Invalid template shape '{override}', expected one of {TemplateShape.dimensions()}=N.")
+        values[name] = int(value)
+    return TemplateShape(**values)
+
+
+def scaling_exponent(points: Sequence[Tuple[float, float]]) -> float:
+    """
+    Least-squares slope of log(y) against log(x).
+
+    About 1 means y grows linearly with x, 2 means quadratically. Points with a non-positive
+    coordinate are ignored, NaN is returned when fewer than two points are left.
+    """
+    logs = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len(logs) < 2:  # noqa: PLR2004
+        return math.nan
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    variance = sum((x - mean_x) ** 2 for x, _ in logs)
+    if variance == 0:
+        return math.nan
+    return sum((x - mean_x) * (y - mean_y) for x, y in logs) / variance
+
+
+def run_scaling(
+    dimension: str, values: Sequence[int], base_shape: TemplateShape, runs: int, warmup: int, region: str
+) -> Dict[str, Any]:
+    """Benchmarks synthetic templates where only `dimension` changes between `values`."""
+    if dimension not in TemplateShape.dimensions():
+        raise ValueError(f"Unknown dimension '{dimension}', expected one of {TemplateShape.dimensions()}.")
+    points: List[Dict[str, Any]] = []
+    policy_loader = StubManagedPolicyLoader()
+    with offline_transform_context(region):
+        for value in values:
+            shape = base_shape._replace(**{dimension: value})
+            manifest = generate_template(shape)
+            output = transform(copy.deepcopy(manifest), {}, policy_loader)
+            result = benchmark_template(manifest, runs, warmup)
+            result.update(
+                {
+                    "value": value,
+                    "shape": shape._asdict(),
+                    "input_resources": len(manifest["Resources"]),
+                    "output_resources": len(output["Resources"]),
+                    "output_bytes": len(json.dumps(output)),
+                }
+            )
+            points.append(result)
+            print(f"{dimension}={value}: {result['summary']['p50_ms']:.1f} ms")
+
+    return {
+        "metadata": _metadata(runs, warmup, region),
+        "dimension": dimension,
+        "points": points,
+        "time_exponent": scaling_exponent([(p["value"], p["summary"]["p50_ms"]) for p in points]),
+        "memory_exponent": scaling_exponent([(p["value"], p["tracemalloc_peak_bytes"]) for p in points]),
+    }
+
+
+def benchmark_parse(documents: Dict[str, str], runs: int) -> Dict[str, Any]:
+    """Times yaml_parse() against the pure Python loader on the given YAML documents."""
+    results: Dict[str, Any] = {}
+    for name, loader in (("pure_python", PurePythonIntrinsicsSafeLoader), ("yaml_parse", IntrinsicsSafeLoader)):
+        timings_ms: List[float] = []
+        for _ in range(runs):
+            start = time.perf_counter_ns()
+            for document in documents.values():
+                yaml.load(document, Loader=loader)  # noqa: S506
+            timings_ms.append((time.perf_counter_ns() - start) / 1e6)
+        results[name] = summarize_timings(timings_ms)
+    results["loader"] = IntrinsicsSafeLoader.__name__
+    results["documents"] = len(documents)
+    results["bytes"] = sum(len(document) for document in documents.values())
+    results["speedup"] = results["pure_python"]["p50_ms"] / results["yaml_parse"]["p50_ms"]
+    return results
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold_percent: float, metric: str = "p50_ms"
+) -> Dict[str, Any]:
+    """
+    Compares two benchmark results.
+
+    A template regresses when its `metric` or its tracemalloc peak grew by more than `threshold_percent`.
+    Totals are also grouped by dominant resource type so that a regression in, for example,
+    API generation shows up even when each single template stays under the threshold.
+    """
+    regressions: List[Dict[str, Any]] = []
+    groups: Dict[str, Dict[str, Any]] = {}
+    baseline_templates = baseline.get("templates", {})
+    current_templates = current.get("templates", {})
+
+    for name in sorted(set(baseline_templates) & set(current_templates)):
+        before, after = baseline_templates[name], current_templates[name]
+        if "summary" not in before or "summary" not in after:
+            continue
+        group = groups.setdefault(
+            after.get("dominant_resource_type", "None"),
+            {"templates": 0, "baseline_ms": 0.0, "current_ms": 0.0},
+        )
+        group["templates"] += 1
+        group["baseline_ms"] += before["summary"][metric]
+        group["current_ms"] += after["summary"][metric]
+
+        for key, old, new in (
+            (metric, before["summary"][metric], after["summary"][metric]),
+            ("tracemalloc_peak_bytes", before["tracemalloc_peak_bytes"], after["tracemalloc_peak_bytes"]),
+        ):
+            change = _percent_change(old, new)
+            if change > threshold_percent:
+                regressions.append(
+                    {"template": name, "metric": key, "baseline": old, "current": new, "change_percent": change}
+                )
+
+    for group in groups.values():
+        group["change_percent"] = _percent_change(group["baseline_ms"], group["current_ms"])
+
+    return {
+        "threshold_percent": threshold_percent,
+        "metric": metric,
+        "regressions": regressions,
+        "groups": dict(sorted(groups.items(), key=_group_change_percent, reverse=True)),
+        "missing": sorted(set(baseline_templates) - set(current_templates)),
+        "added": sorted(set(current_templates) - set(baseline_templates)),
+    }
+
+
+def _group_change_percent(item: Tuple[str, Dict[str, Any]]) -> float:
+    return float(item[1]["change_percent"])
+
+
+def _percent_change(old: float, new: float) -> float:
+    if old <= 0:
+        return 0.0
+    return (new - old) * 100.0 / old
+
+
+def _print_comparison(comparison: Dict[str, Any]) -> None:
+    print(f"{'Dominant resource type':<45} {'templates':>9} {'baseline':>12} {'current':>12} {'change':>8}")
+    for resource_type, group in comparison["groups"].items():
+        print(
+            f"{resource_type:<45} {group['templates']:>9} {group['baseline_ms']:>10.1f}ms"
+            f" {group['current_ms']:>10.1f}ms {group['change_percent']:>+7.1f}%"
+        )
+    print()
+    for regression in comparison["regressions"]:
+        print(
+            f"REGRESSION {regression['template']} {regression['metric']}: "
+            f"{regression['baseline']:.2f} -> {regression['current']:.2f} ({regression['change_percent']:+.1f}%)"
+        )
+    print(f"{len(comparison['regressions'])} regression(s) above {comparison['threshold_percent']}%.")
+
+
+def _print_scaling(scaling: Dict[str, Any]) -> None:
+    print(
+        f"{scaling['dimension']:>20} {'resources in':>12} {'resources out':>13} {'p50':>12} {'ms/unit':>9} {'peak':>10}"
+    )
+    for point in scaling["points"]:
+        per_unit = point["summary"]["p50_ms"] / point["value"] if point["value"] else math.nan
+        print(
+            f"{point['value']:>20} {point['input_resources']:>12} {point['output_resources']:>13}"
+            f" {point['summary']['p50_ms']:>10.1f}ms {per_unit:>9.3f} {point['tracemalloc_peak_bytes'] / 2**20:>8.1f}MB"
+        )
+    print()
+    # Translate time has a fixed per-template cost, only large values give meaningful exponents
+    print(f"Time grows as {scaling['dimension']}^{scaling['time_exponent']:.2f}")
+    print(f"Peak memory grows as {scaling['dimension']}^{scaling['memory_exponent']:.2f}")
+    if scaling["time_exponent"] > SUPER_LINEAR_EXPONENT:
+        print(f"WARNING: translate time grows super-linearly with {scaling['dimension']}")
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    result: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return result
+
+
+def _write_json(obj: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(obj, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def _run_command(args: argparse.Namespace) -> None:
+    results = run_benchmark(
+        list(iter_template_paths(args.input_dir, args.pattern)), args.runs, args.warmup, args.region
+    )
+    _write_json(results, args.output)
+    print(f"Wrote benchmark results to {args.output}")
+
+
+def _compare_command(args: argparse.Namespace) -> None:
+    comparison = compare_results(_read_json(args.baseline), _read_json(args.current), args.threshold, args.metric)
+    _print_comparison(comparison)
+    if comparison["regressions"]:
+        sys.exit(1)
+
+
+def _scale_command(args: argparse.Namespace) -> None:
+    values = [int(value) for value in args.values.split(",")]
+    scaling = run_scaling(args.dimension, values, parse_shape(args.set), args.runs, args.warmup, args.region)
+    _print_scaling(scaling)
+    if args.output:
+        _write_json(scaling, args.output)
+
+
+def _generate_command(args: argparse.Namespace) -> None:
+    _write_json(generate_template(parse_shape(args.set)), args.output)
+    print(f"Wrote generated template to {args.output}")
+
+
+def _parse_documents(args: argparse.Namespace) -> Dict[str, str]:
+    if args.set:
+        return {"synthetic": yaml.safe_dump(generate_template(parse_shape(args.set)))}
+    return {path.stem: path.read_text(encoding="utf-8") for path in iter_template_paths(args.input_dir, args.pattern)}
+
+
+def _parse_command(args: argparse.Namespace) -> None:
+    documents = _parse_documents(args)
+    parsing = benchmark_parse(documents, args.runs)
+    print(f"{parsing['documents']} document(s), {parsing['bytes'] / 2**20:.2f}MB")
+    print(f"pure Python loader: {parsing['pure_python']['p50_ms']:.1f}ms")
+    print(f"yaml_parse ({parsing['loader']}): {parsing['yaml_parse']['p50_ms']:.1f}ms")
+    print(f"speedup: {parsing['speedup']:.1f}x")
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", help="Enables verbose logging", action="store_true")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Benchmark a corpus of SAM templates")
+    run.set_defaults(func=_run_command)
+    run.add_argument("--input-dir", type=Path, default=DEFAULT_INPUT_DIR, help="Directory with SAM templates")
+    run.add_argument("--pattern", default="*.yaml", help="Glob pattern of templates in input dir [default: *.yaml]")
+    run.add_argument("--runs", type=int, default=5, help="Timed runs per template [default: 5]")
+    run.add_argument("--warmup", type=int, default=1, help="Untimed runs per template [default: 1]")
+    run.add_argument("--region", default=DEFAULT_REGION, help=f"Region to translate for [default: {DEFAULT_REGION}]")
+    run.add_argument("--output", type=Path, required=True, help="JSON file to write the results to")
+
+    compare = subparsers.add_parser("compare", help="Compare two benchmark results")
+    compare.set_defaults(func=_compare_command)
+    compare.add_argument("baseline", type=Path, help="Baseline JSON written by `run`")
+    compare.add_argument("current", type=Path, help="Current JSON written by `run`")
+    compare.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in %% [default: 10]")
+    compare.add_argument("--metric", default="p50_ms", help="Timing statistic to compare [default: p50_ms]")
+
+    scale = subparsers.add_parser("scale", help="Benchmark synthetic templates growing along one dimension")
+    scale.set_defaults(func=_scale_command)
+    scale.add_argument("--dimension", choices=TemplateShape.dimensions(), required=True, help="Dimension to grow")
+    scale.add_argument("--values", default="1,10,100,1000", help="Comma separated values [default: 1,10,100,1000]")
+    scale.add_argument("--set", action="append", default=[], help="Fixed dimension, e.g. --set api_events=2")
+    scale.add_argument("--runs", type=int, default=3, help="Timed runs per template [default: 3]")
+    scale.add_argument("--warmup", type=int, default=0, help="Untimed runs per template [default: 0]")
+    scale.add_argument("--region", default=DEFAULT_REGION, help=f"Region to translate for [default: {DEFAULT_REGION}]")
+    scale.add_argument("--output", type=Path, help="Optional JSON file to write the results to")
+
+    generate = subparsers.add_parser("generate", help="Write a synthetic SAM template")
+    generate.set_defaults(func=_generate_command)
+    generate.add_argument("--set", action="append", default=[], help="Template dimension, e.g. --set functions=100")
+    generate.add_argument("--output", type=Path, required=True, help="JSON file to write the template to")
+
+    parse = subparsers.add_parser("parse", help="Benchmark YAML parsing of a corpus or of a synthetic template")
+    parse.set_defaults(func=_parse_command)
+    parse.add_argument("--input-dir", type=Path, default=DEFAULT_INPUT_DIR, help="Directory with SAM templates")
+    parse.add_argument("--pattern", default="*.yaml", help="Glob pattern of templates in input dir [default: *.yaml]")
+    parse.add_argument("--set", action="append", default=[], help="Parse a synthetic template of this shape instead")
+    parse.add_argument("--runs", type=int, default=5, help="Timed runs [default: 5]")
+
+    return parser
+
+
+def main() -> None:
+    args = _build_arg_parser().parse_args()
+
+    # Translation warnings are repeated for every run and would drown the results
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR)
+
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
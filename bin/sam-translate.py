@@ -2,25 +2,34 @@
 
 """Convert SAM templates to CloudFormation templates.
 
+The `batch` command transforms many templates (directories or glob patterns given with --templates)
+on a pool of worker processes, and writes each output as transformed-<name>.json next to its input.
+
 Known limitations: cannot transform CodeUri pointing at local directory.
 """
 import argparse
+import glob
 import json
 import logging
+import os
 import platform
 import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import boto3
 
 # To allow this script to be executed from other directories
 sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
 
+from samtranslator.metrics.tracing import ChromeTraceSpanExporter, Tracer, use_tracer
 from samtranslator.model.exceptions import InvalidDocumentException
 from samtranslator.public.translator import ManagedPolicyLoader
+from samtranslator.translator.stack_splitter import analyze_template_size, split_template
 from samtranslator.translator.transform import transform
 from samtranslator.yaml_helper import yaml_parse
 
@@ -63,6 +72,30 @@ parser.add_argument(
     help="Write transformed template to stdout instead of a file",
     action="store_true",
 )
+parser.add_argument(
+    "--trace",
+    help="Write a Chrome trace (for chrome://tracing or https://ui.perfetto.dev) of the transform to this file.",
+    type=Path,
+)
+parser.add_argument(
+    "--split-nested-stacks",
+    help="Split transformed templates with more resources than this (or over the CloudFormation size limit) into "
+    "nested stacks, written next to the output template.",
+    type=int,
+    metavar="MAX_RESOURCES",
+)
+parser.add_argument(
+    "--templates",
+    help="Directories or glob patterns of SAM templates to transform with the `batch` command.",
+    nargs="+",
+    default=[],
+)
+parser.add_argument(
+    "--workers",
+    help="Number of worker processes used by the `batch` command [default: number of CPUs].",
+    type=int,
+    default=os.cpu_count(),
+)
 cli_options = parser.parse_args()
 
 if cli_options.verbose:
@@ -105,12 +138,24 @@ def package(input_file_path: Path) -> Path:
     return package_output_template_file
 
 
-def transform_template(input_file_path: Path, output_file_path: Path, stdout: bool):  # type: ignore[no-untyped-def]
+def transform_template(  # type: ignore[no-untyped-def]
+    input_file_path: Path,
+    output_file_path: Path,
+    stdout: bool,
+    trace_file_path: Optional[Path] = None,
+    split_max_resources: Optional[int] = None,
+):
     with input_file_path.open() as f:
-        sam_template = yaml_parse(f)  # type: ignore[no-untyped-call]
+        sam_template = yaml_parse(f)
 
+    exporter = ChromeTraceSpanExporter()
     try:
-        cloud_formation_template = transform(sam_template, {}, ManagedPolicyLoader(iam_client))
+        with use_tracer(Tracer([exporter]) if trace_file_path else None):
+            cloud_formation_template = transform(sam_template, {}, ManagedPolicyLoader(iam_client))
+        if split_max_resources:
+            cloud_formation_template = split_nested_stacks(
+                cloud_formation_template, output_file_path, split_max_resources
+            )
         cloud_formation_template_prettified = json.dumps(cloud_formation_template, indent=1)
 
         if stdout:
@@ -121,10 +166,110 @@ def transform_template(input_file_path: Path, output_file_path: Path, stdout: bo
 
         print("Wrote transformed CloudFormation template to: ", output_file_path)
     except InvalidDocumentException as e:
-        error_message = reduce(lambda message, error: message + " " + error.message, e.causes, e.message)
+        error_message = _document_error_message(e)
         LOG.error(error_message)
         errors = (cause.message for cause in e.causes)
         LOG.error(errors)
+    finally:
+        if trace_file_path:
+            exporter.write(trace_file_path)
+            print("Wrote trace of the transform to: ", trace_file_path, file=sys.stderr)
+
+
+def split_nested_stacks(template: Dict[str, Any], output_file_path: Path, max_resources: int) -> Dict[str, Any]:
+    """Splits the template into nested stacks when it is over the limits, and returns the parent template."""
+    analysis = analyze_template_size(template)
+    print(
+        f"Transformed template: {analysis['resource_count']} resources, {analysis['template_bytes']} bytes",
+        file=sys.stderr,
+    )
+    if analysis["resource_count"] <= max_resources and not analysis["exceeds_size_limit"]:
+        return template
+
+    def child_path(stack_id: str) -> Path:
+        return output_file_path.with_name(f"{output_file_path.stem}-{stack_id}.json")
+
+    parent, children = split_template(template, max_resources, template_url=lambda stack_id: child_path(stack_id).name)
+    for stack_id, child in children.items():
+        child_path(stack_id).write_text(json.dumps(child, indent=1), encoding="utf-8")
+        print(f"Wrote {len(child['Resources'])} resources to nested stack: {child_path(stack_id)}", file=sys.stderr)
+    return parent
+
+
+def _document_error_message(e: InvalidDocumentException) -> str:
+    return reduce(lambda message, error: message + " " + error.message, e.causes, e.message)
+
+
+# Loader of the current batch worker process, kept warm across all templates the worker transforms
+_worker_policy_loader: Optional[ManagedPolicyLoader] = None
+
+
+def _init_batch_worker() -> None:
+    global _worker_policy_loader  # noqa: PLW0603
+    # boto3 clients must not be shared with the parent process
+    _worker_policy_loader = ManagedPolicyLoader(boto3.client("iam"))
+
+
+def batch_output_path(input_file_path: Path) -> Path:
+    return input_file_path.with_name(f"transformed-{input_file_path.stem}.json")
+
+
+def _transform_batch_template(input_file_path: Path) -> Tuple[Path, Optional[str], float]:
+    start = time.perf_counter()
+    error: Optional[str] = None
+    try:
+        with input_file_path.open() as f:
+            sam_template = yaml_parse(f)
+        cloud_formation_template = transform(sam_template, {}, _worker_policy_loader)  # type: ignore[arg-type]
+        batch_output_path(input_file_path).write_text(json.dumps(cloud_formation_template, indent=1), encoding="utf-8")
+    except InvalidDocumentException as e:
+        error = _document_error_message(e)
+    except Exception as e:
+        # Report any failure (unreadable file, invalid YAML, ...) without stopping the whole batch
+        error = f"{type(e).__name__}: {e}"
+    return input_file_path, error, time.perf_counter() - start
+
+
+def collect_batch_templates(patterns: List[str]) -> List[Path]:
+    """Expands directories (all *.yaml and *.yml files, recursively) and glob patterns to template paths."""
+    paths: Set[Path] = set()
+    for pattern in patterns:
+        if Path(pattern).is_dir():
+            paths.update(Path(pattern).rglob("*.yaml"))
+            paths.update(Path(pattern).rglob("*.yml"))
+        else:
+            # Path.glob() does not support absolute patterns
+            paths.update(Path(path) for path in glob.glob(pattern, recursive=True))  # noqa: PTH207
+    return sorted(path for path in paths if path.is_file())
+
+
+def batch(patterns: List[str], workers: int) -> int:
+    """Transforms all templates matching the patterns and returns the number of failed templates."""
+    paths = collect_batch_templates(patterns)
+    if not paths:
+        LOG.error("No SAM templates found in %s", patterns)
+        return 1
+
+    failures: List[Tuple[Path, str]] = []
+    durations: List[float] = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as executor:
+        for input_file_path, error, duration in executor.map(_transform_batch_template, paths):
+            durations.append(duration)
+            if error is None:
+                LOG.debug("Wrote transformed CloudFormation template to: %s", batch_output_path(input_file_path))
+            else:
+                failures.append((input_file_path, error))
+    elapsed = time.perf_counter() - start
+
+    for input_file_path, error in failures:
+        print(f"FAILED {input_file_path}: {error}", file=sys.stderr)
+    print(
+        f"Transformed {len(paths) - len(failures)}/{len(paths)} template(s) in {elapsed:.2f}s "
+        f"with {workers} worker(s): {len(paths) / elapsed:.1f} templates/s, "
+        f"{sum(durations) / len(durations) * 1000:.1f}ms mean per template, {len(failures)} failure(s)."
+    )
+    return len(failures)
 
 
 def deploy(template_file: Path) -> None:
@@ -141,10 +286,26 @@ if __name__ == "__main__":
 
     if cli_options.command == "package":
         package_output_template_file = package(input_file_path)
-        transform_template(package_output_template_file, output_file_path, cli_options.stdout)
+        transform_template(
+            package_output_template_file,
+            output_file_path,
+            cli_options.stdout,
+            cli_options.trace,
+            cli_options.split_nested_stacks,
+        )
     elif cli_options.command == "deploy":
         package_output_template_file = package(input_file_path)
-        transform_template(package_output_template_file, output_file_path, cli_options.stdout)
+        transform_template(
+            package_output_template_file,
+            output_file_path,
+            cli_options.stdout,
+            cli_options.trace,
+            cli_options.split_nested_stacks,
+        )
         deploy(output_file_path)
+    elif cli_options.command == "batch":
+        sys.exit(1 if batch(cli_options.templates, cli_options.workers) else 0)
     else:
-        transform_template(input_file_path, output_file_path, cli_options.stdout)
+        transform_template(
+            input_file_path, output_file_path, cli_options.stdout, cli_options.trace, cli_options.split_nested_stacks
+        )
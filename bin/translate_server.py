@@ -0,0 +1,468 @@
+#!/usr/bin/env python
+"""
+Local SAM translation server.
+
+Starting sam-translate.py for every template pays the process start-up, the imports, the loading and
+validation of the policy templates and the managed policy lookup again and again. The server keeps
+that state warm: it loads everything once and then translates templates sent over a UNIX socket or
+localhost HTTP, running at most --max-concurrency translations at a time.
+
+The `translate` command is a thin client accepting the same options as sam-translate.py.
+
+Usage:
+    bin/translate_server.py serve --socket .tmp/sam-translate.sock
+    bin/translate_server.py translate --socket .tmp/sam-translate.sock --template-file template.yaml
+    curl --unix-socket .tmp/sam-translate.sock http://localhost/stats
+
+Endpoints:
+    POST /translate  {"template_body": "<YAML or JSON>"} or {"template": {...}}, optional "parameters": {...}
+    GET  /stats      request counters, queue depth and latency percentiles
+    GET  /health
+"""
+import argparse
+import http.client
+import json
+import logging
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import boto3
+import yaml
+
+# To allow this script to be executed from other directories
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from samtranslator.metrics.metrics import BackgroundMetricsPublisher, DummyMetricsPublisher, Metrics, MetricsPublisher
+from samtranslator.model.exceptions import InvalidDocumentException
+from samtranslator.parser.parser import Parser
+from samtranslator.policy_template_processor.processor import PolicyTemplatesProcessor
+from samtranslator.translator.managed_policy_translator import ManagedPolicyLoader
+from samtranslator.translator.translator import Translator
+from samtranslator.utils.py27hash_fix import to_py27_compatible_template, undo_mark_unicode_str_in_template
+from samtranslator.yaml_helper import yaml_parse
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8734
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_QUEUE = 64
+LATENCY_WINDOW = 1000
+
+WARM_UP_TEMPLATE = {
+    "Resources": {
+        "Function": {
+            "Type": "AWS::Serverless::Function",
+            "Properties": {
+                "CodeUri": "s3://bucket/key",
+                "Handler": "index.handler",
+                "Runtime": "python3.11",
+                "Policies": [{"SQSPollerPolicy": {"QueueName": "queue"}}],
+                "Events": {"Api": {"Type": "Api", "Properties": {"Path": "/", "Method": "get"}}},
+            },
+        }
+    }
+}
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class InvalidRequestError(Exception):
+    pass
+
+
+class TranslationService:
+    """Translates SAM templates with state kept warm between translations."""
+
+    def __init__(
+        self,
+        get_managed_policy_map: Callable[[], Dict[str, str]],
+        boto_session: Optional[boto3.session.Session] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        metrics_publisher: Optional[MetricsPublisher] = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self._get_managed_policy_map = get_managed_policy_map
+        self._boto_session = boto_session or boto3.session.Session()
+        self._metrics_publisher = metrics_publisher or DummyMetricsPublisher()
+        self._policy_templates_processor = PolicyTemplatesProcessor(
+            PolicyTemplatesProcessor.get_default_policy_templates_json()
+        )
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._in_flight = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._rejected = 0
+        self._latencies_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._queue_waits_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def warm_up(self) -> None:
+        """Translates a small template, so that lazily loaded state is ready before the first request."""
+        self._get_managed_policy_map()
+        self._translate(json.loads(json.dumps(WARM_UP_TEMPLATE)), {})
+
+    def translate(self, template: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Translates the template, waiting for a free slot when max_concurrency translations are running.
+
+        :raises QueueFullError: when max_queue translations are already waiting for a slot
+        :raises InvalidDocumentException: when the template is invalid
+        """
+        with self._lock:
+            if self._queue_depth >= self.max_queue:
+                self._rejected += 1
+                raise QueueFullError(f"{self._queue_depth} translations are already waiting.")
+            self._queue_depth += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+
+        start = time.perf_counter()
+        self._slots.acquire()
+        with self._lock:
+            self._queue_depth -= 1
+            self._in_flight += 1
+            self._queue_waits_ms.append((time.perf_counter() - start) * 1000)
+
+        succeeded = False
+        try:
+            result = self._translate(template, parameters)
+            succeeded = True
+            return result
+        finally:
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+                self._latencies_ms.append((time.perf_counter() - start) * 1000)
+                if succeeded:
+                    self._succeeded += 1
+                else:
+                    self._failed += 1
+
+    def _translate(self, template: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        # Same as samtranslator.translator.transform.transform(), with the warm state passed in
+        to_py27_compatible_template(template, parameters)
+        metrics = Metrics("ServerlessTransform", self._metrics_publisher)
+        translator = Translator(
+            None,
+            Parser(),
+            boto_session=self._boto_session,
+            metrics=metrics,
+            policy_templates_processor=self._policy_templates_processor,
+        )
+        try:
+            transformed = translator.translate(
+                template, parameter_values=parameters, get_managed_policy_map=self._get_managed_policy_map
+            )
+        finally:
+            metrics.publish()
+        return undo_mark_unicode_str_in_template(transformed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies_ms)
+            queue_waits = sorted(self._queue_waits_ms)
+            return {
+                "uptime_seconds": time.monotonic() - self._started,
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "succeeded": self._succeeded,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "latency_ms": _percentiles(latencies),
+                "queue_wait_ms": _percentiles(queue_waits),
+            }
+
+
+def _percentiles(sorted_values: List[float]) -> Dict[str, Optional[float]]:
+    def at(pct: int) -> Optional[float]:
+        if not sorted_values:
+            return None
+        return sorted_values[min(len(sorted_values) - 1, len(sorted_values) * pct // 100)]
+
+    return {"p50": at(50), "p90": at(90), "p99": at(99), "max": sorted_values[-1] if sorted_values else None}
+
+
+def _parse_request(payload: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    if not isinstance(payload, dict):
+        raise InvalidRequestError("Request body must be a JSON object.")
+    if "template_body" in payload:
+        if not isinstance(payload["template_body"], str):
+            raise InvalidRequestError("'template_body' must be a string.")
+        template = yaml_parse(payload["template_body"])
+    else:
+        template = payload.get("template")
+    parameters = payload.get("parameters") or {}
+    if not isinstance(template, dict):
+        raise InvalidRequestError("Request must have a 'template' object or a 'template_body' string.")
+    if not isinstance(parameters, dict):
+        raise InvalidRequestError("'parameters' must be an object.")
+    return template, parameters
+
+
+class TranslationRequestHandler(BaseHTTPRequestHandler):
+    server_version = "SamTranslateServer/1.0"
+    protocol_version = "HTTP/1.1"
+    service: TranslationService
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            self._send_json(200, self.service.stats())
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"message": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/translate":
+            self._send_json(404, {"message": f"Unknown path {self.path}"})
+            return
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            template, parameters = _parse_request(json.loads(body))
+            self._send_json(200, {"template": self.service.translate(template, parameters)})
+        except InvalidDocumentException as e:
+            self._send_json(400, {"message": e.message, "errors": [cause.message for cause in e.causes]})
+        except QueueFullError as e:
+            self._send_json(503, {"message": str(e)})
+        except (InvalidRequestError, ValueError, yaml.YAMLError) as e:
+            # ValueError covers invalid JSON request bodies
+            self._send_json(400, {"message": str(e), "errors": []})
+        except Exception as e:
+            LOG.exception("Failed to translate template")
+            self._send_json(500, {"message": f"{type(e).__name__}: {e}", "errors": []})
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # client_address is an empty string for UNIX sockets
+        return str(self.client_address[0]) if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        LOG.debug("%s %s", self.address_string(), format % args)
+
+
+class UnixThreadingHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(
+    service: TranslationService,
+    socket_path: Optional[Path] = None,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+) -> socketserver.BaseServer:
+    """Creates a threading HTTP server on the UNIX socket if given, on host:port otherwise."""
+    handler = type("BoundTranslationRequestHandler", (TranslationRequestHandler,), {"service": service})
+    if socket_path is not None:
+        # Left behind by a server which did not shut down cleanly
+        if _is_socket(socket_path):
+            socket_path.unlink()
+        elif socket_path.exists():
+            raise ValueError(f"{socket_path} exists and is not a UNIX socket.")
+        return UnixThreadingHTTPServer(str(socket_path), handler)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def _is_socket(path: Path) -> bool:
+    return path.exists() and stat.S_ISSOCK(path.stat().st_mode)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: Path, timeout: float) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(str(self.socket_path))
+
+
+class TranslationClient:
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        timeout: float = 120,
+    ) -> None:
+        self.socket_path = socket_path
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.socket_path is not None:
+            return UnixHTTPConnection(self.socket_path, self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, Any]]:
+        connection = self._connect()
+        try:
+            data = json.dumps(body).encode("utf-8") if body is not None else None
+            connection.request(method, path, body=data, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            result: Dict[str, Any] = json.loads(response.read())
+            return response.status, result
+        finally:
+            connection.close()
+
+    def translate(self, template_body: str, parameters: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, Any]]:
+        return self._request("POST", "/translate", {"template_body": template_body, "parameters": parameters or {}})
+
+    def stats(self) -> Dict[str, Any]:
+        return self._request("GET", "/stats")[1]
+
+
+def _load_managed_policy_map(managed_policies_file: Optional[Path]) -> Callable[[], Dict[str, str]]:
+    if managed_policies_file is not None:
+        policy_map: Dict[str, str] = json.loads(managed_policies_file.read_text(encoding="utf-8"))
+        return lambda: policy_map
+    return ManagedPolicyLoader(boto3.client("iam")).load
+
+
+def _serve(args: argparse.Namespace) -> None:
+    boto_session = boto3.session.Session(region_name=args.region)
+    metrics_publisher = (
+        BackgroundMetricsPublisher(boto_session.client("cloudwatch")) if args.cloudwatch_metrics else None
+    )
+    service = TranslationService(
+        _load_managed_policy_map(args.managed_policies_file),
+        boto_session=boto_session,
+        max_concurrency=args.max_concurrency,
+        max_queue=args.max_queue,
+        metrics_publisher=metrics_publisher,
+    )
+    try:
+        server = make_server(service, args.socket, args.host, args.port)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+    service.warm_up()
+    address = args.socket or f"http://{args.host}:{args.port}"
+    print(f"Translating SAM templates on {address} (max concurrency {args.max_concurrency})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket is not None and _is_socket(args.socket):
+            args.socket.unlink()
+        if metrics_publisher is not None:
+            metrics_publisher.shutdown()
+
+
+def _translate(args: argparse.Namespace) -> None:
+    parameters = {}
+    for parameter in args.parameter:
+        key, _, value = parameter.partition("=")
+        parameters[key] = value
+
+    client = TranslationClient(args.socket, args.host, args.port)
+    status, response = client.translate(args.template_file.read_text(encoding="utf-8"), parameters)
+    if status != 200:  # noqa: PLR2004
+        LOG.error(" ".join([response.get("message", ""), *response.get("errors", [])]))
+        sys.exit(1)
+
+    cloud_formation_template_prettified = json.dumps(response["template"], indent=1)
+    if args.stdout:
+        print(cloud_formation_template_prettified)
+        return
+    args.output_template.write_text(cloud_formation_template_prettified, encoding="utf-8")
+    print("Wrote transformed CloudFormation template to: ", args.output_template)
+
+
+def _add_address_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--socket", type=Path, help="UNIX socket of the server, instead of --host and --port")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Host of the server [default: {DEFAULT_HOST}]")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port of the server [default: {DEFAULT_PORT}]")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", help="Enables verbose logging", action="store_true")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="Run the translation server")
+    serve.set_defaults(func=_serve)
+    _add_address_arguments(serve)
+    serve.add_argument("--region", help="Region to translate for [default: region of the boto3 session]")
+    serve.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f"Maximum number of concurrent translations [default: {DEFAULT_MAX_CONCURRENCY}]",
+    )
+    serve.add_argument(
+        "--max-queue",
+        type=int,
+        default=DEFAULT_MAX_QUEUE,
+        help=f"Maximum number of translations waiting, further requests get a 503 [default: {DEFAULT_MAX_QUEUE}]",
+    )
+    serve.add_argument(
+        "--managed-policies-file",
+        type=Path,
+        help="JSON map of managed policy names to ARNs, used instead of listing the policies with IAM",
+    )
+    serve.add_argument(
+        "--cloudwatch-metrics",
+        action="store_true",
+        help="Publish the metrics of the translations to CloudWatch, from a background thread",
+    )
+
+    translate = subparsers.add_parser("translate", help="Translate a template with a running server")
+    translate.set_defaults(func=_translate)
+    _add_address_arguments(translate)
+    translate.add_argument(
+        "--template-file",
+        help="Location of SAM template to transform [default: template.yaml].",
+        type=Path,
+        default=Path("template.yaml"),
+    )
+    translate.add_argument(
+        "--output-template",
+        help="Location to store resulting CloudFormation template [default: transformed-template.json].",
+        type=Path,
+        default=Path("transformed-template.json"),
+    )
+    translate.add_argument(
+        "--stdout", help="Write transformed template to stdout instead of a file", action="store_true"
+    )
+    translate.add_argument("--parameter", action="append", default=[], help="Template parameter value, as Key=Value")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
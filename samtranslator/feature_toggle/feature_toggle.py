@@ -1,8 +1,10 @@
 import json
 import logging
+import os
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, Optional, cast
+from typing import Any, Dict, Optional, Tuple, Union, cast
 
 import boto3
 from botocore.config import Config
@@ -12,7 +14,8 @@ from samtranslator.feature_toggle.dialup import (
     SimpleAccountPercentileDialup,
     ToggleDialup,
 )
-from samtranslator.metrics.method_decorator import cw_timer
+from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton, cw_timer
+from samtranslator.metrics.metrics import DummyMetricsPublisher, Metrics
 from samtranslator.utils.constants import BOTO3_CONNECT_TIMEOUT
 
 LOG = logging.getLogger(__name__)
@@ -36,10 +39,13 @@ class FeatureToggle:
         account_id: Optional[str],
         region: Optional[str],
     ) -> None:
+        self.config_provider = config_provider
         self.feature_config = config_provider.config
         self.stage = stage
         self.account_id = account_id
         self.region = region
+        # Results of is_enabled() for self.feature_config, by feature name, stage, region and account id
+        self._evaluations: Dict[Tuple[str, Optional[str], Optional[str], Optional[str]], bool] = {}
 
     def _get_dialup(self, region_config, feature_name):  # type: ignore[no-untyped-def]
         """
@@ -63,8 +69,22 @@ class FeatureToggle:
         """
         To check if feature is available
 
+        The result is cached until the config of the config provider changes.
+
         :param feature_name: name of feature
         """
+        config = self.config_provider.config
+        if config is not self.feature_config:
+            self.feature_config = config
+            self._evaluations = {}
+
+        key = (feature_name, self.stage, self.region, self.account_id)
+        is_enabled = self._evaluations.get(key)
+        if is_enabled is None:
+            is_enabled = self._evaluations[key] = self._is_enabled(feature_name)
+        return is_enabled
+
+    def _is_enabled(self, feature_name: str) -> bool:
         if feature_name not in self.feature_config:
             LOG.warning(f"Feature '{feature_name}' not available in Feature Toggle Config.")
             return False
@@ -164,3 +184,131 @@ class FeatureToggleAppConfigConfigProvider(FeatureToggleConfigProvider):
     @property
     def config(self) -> Dict[str, Any]:
         return self.feature_toggle_config
+
+
+class FeatureToggleRefreshingAppConfigConfigProvider(FeatureToggleConfigProvider):
+    """
+    Feature toggle config provider which serves the last known config from memory, and refreshes it from AppConfig
+    in a background thread. Unlike FeatureToggleAppConfigConfigProvider, it is meant to be created once and shared
+    by the translations of a long running process, which never wait for AppConfig.
+
+    Until the first refresh succeeds, the config of the snapshot file is used (empty config without snapshot file).
+    Every new config is written to the snapshot file, so that a restarted process starts with the last known config.
+    The snapshot file has the format of the file of FeatureToggleLocalConfigProvider.
+
+    The latency of every refresh is recorded to the metrics of the provider, not to the ones of a translation.
+    """
+
+    CLIENT_ID = "FeatureToggleRefreshingAppConfigConfigProvider"
+
+    def __init__(  # noqa: PLR0913
+        self,
+        application_id: str,
+        environment_id: str,
+        configuration_profile_id: str,
+        app_config_client: Any = None,
+        snapshot_path: Optional[Union[str, Path]] = None,
+        refresh_interval: float = 60.0,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        """
+        :param application_id: AppConfig application
+        :param environment_id: AppConfig environment
+        :param configuration_profile_id: AppConfig configuration profile
+        :param app_config_client: Optional AppConfig client, a client with short timeouts is created when not given
+        :param snapshot_path: Optional file to load the config from on start, and to save every new config to
+        :param refresh_interval: number of seconds between two refreshes
+        :param metrics: Optional metrics to record the latency of the refreshes to, for the owner of the provider to
+            publish. Defaults to metrics which are never published.
+        """
+        FeatureToggleConfigProvider.__init__(self)
+        self.application_id = application_id
+        self.environment_id = environment_id
+        self.configuration_profile_id = configuration_profile_id
+        self.app_config_client = (
+            app_config_client
+            if app_config_client
+            else boto3.client(
+                "appconfig",
+                config=Config(connect_timeout=BOTO3_CONNECT_TIMEOUT, read_timeout=5, retries={"total_max_attempts": 2}),
+            )
+        )
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.refresh_interval = refresh_interval
+        self.metrics = metrics if metrics else Metrics("ServerlessTransform", DummyMetricsPublisher())
+        self.config_version: Optional[str] = None
+        self._config = self._load_snapshot()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=self.CLIENT_ID, daemon=True)
+        self._thread.start()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self._config
+
+    def close(self) -> None:
+        """Stops refreshing the config"""
+        self._stopped.set()
+
+    def refresh(self) -> bool:
+        """
+        Loads the config from AppConfig, when it has changed since the last refresh.
+
+        :returns: whether the config was loaded
+        """
+        # The refreshes run on their own thread, they are not part of the translation whose metrics are set for the
+        # whole process
+        with MetricsMethodWrapperSingleton.instance_for_context(self.metrics):
+            return self._refresh()
+
+    @cw_timer(prefix="External", name="AppConfig")
+    def _refresh(self) -> bool:
+        kwargs = {"ClientConfigurationVersion": self.config_version} if self.config_version else {}
+        try:
+            response = self.app_config_client.get_configuration(
+                Application=self.application_id,
+                Environment=self.environment_id,
+                Configuration=self.configuration_profile_id,
+                ClientId=self.CLIENT_ID,
+                **kwargs,
+            )
+            binary_config_string = response["Content"].read()
+            # AppConfig returns no content when the config is still the one of ClientConfigurationVersion
+            if not binary_config_string:
+                return False
+            config = cast(Dict[str, Any], json.loads(binary_config_string.decode("utf-8")))
+        except Exception:
+            LOG.exception("Failed to refresh config from AppConfig. Using last known config.")
+            return False
+
+        if config != self._config:
+            self._save_snapshot(config)
+            # A new object, so that the results cached by FeatureToggle for the old one are not used
+            self._config = config
+        self.config_version = response.get("ConfigurationVersion")
+        return True
+
+    def _run(self) -> None:
+        self.refresh()
+        while not self._stopped.wait(self.refresh_interval):
+            self.refresh()
+
+    def _load_snapshot(self) -> Dict[str, Any]:
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return {}
+        try:
+            return cast(Dict[str, Any], json.loads(self.snapshot_path.read_text(encoding="utf-8")))
+        except Exception:
+            LOG.exception("Failed to load feature toggle config snapshot. Using empty config.")
+            return {}
+
+    def _save_snapshot(self, config: Dict[str, Any]) -> None:
+        if not self.snapshot_path:
+            return
+        try:
+            # Replaced at once, so that the snapshot is never partially written
+            temporary_path = self.snapshot_path.with_name(f".{self.snapshot_path.name}.{os.getpid()}.tmp")
+            temporary_path.write_text(json.dumps(config), encoding="utf-8")
+            temporary_path.replace(self.snapshot_path)
+        except Exception:
+            LOG.exception("Failed to save feature toggle config snapshot.")
@@ -0,0 +1,161 @@
+"""
+Static evaluation of the template conditions which only depend on known parameter values
+"""
+
+import copy
+from typing import Any, Dict, List, Optional, Set
+
+from samtranslator.intrinsics.resolver import IntrinsicsResolver
+from samtranslator.model.intrinsics import is_intrinsic_if, is_intrinsic_no_value
+
+_NUM_ARGUMENTS_IN_EQUALS = 2
+_NUM_ARGUMENTS_IN_IF = 3
+
+# Marks a value collapsed to AWS::NoValue, which is removed from its parent
+_NO_VALUE = object()
+
+
+class StaticConditionEvaluator:
+    """
+    Evaluates the conditions of a template (Fn::Equals, Fn::And, Fn::Or, Fn::Not and Condition) whose inputs are
+    all known parameter values, and prunes the template accordingly: resources and outputs whose condition is false
+    are removed, and Fn::If are replaced by their branch.
+
+    Conditions depending on unknown values, e.g. on AWS::AccountId or on parameters without value, are left as they
+    are for CloudFormation to evaluate.
+    """
+
+    def __init__(self, conditions: Any, parameters: Dict[str, Any]) -> None:
+        """
+        :param conditions: Conditions section of the template
+        :param parameters: Map of parameter names (including the pseudo parameters) to their values known before
+            the deployment, not the default values of the template which the stack can override
+        """
+        self.conditions: Dict[str, Any] = conditions if isinstance(conditions, dict) else {}
+        self._resolver = IntrinsicsResolver(parameters)
+        self._values: Dict[str, Optional[bool]] = {}
+
+    def evaluate(self, condition_name: Any) -> Optional[bool]:
+        """
+        Returns the value of a condition of the template.
+
+        :param condition_name: name of the condition
+        :return: value of the condition, None when it is not known statically
+        """
+        if not isinstance(condition_name, str) or condition_name not in self.conditions:
+            return None
+        if condition_name not in self._values:
+            # Set first, so that conditions referencing each other are not evaluated forever
+            self._values[condition_name] = None
+            self._values[condition_name] = self._evaluate_expression(self.conditions[condition_name])
+        return self._values[condition_name]
+
+    def get_static_conditions(self) -> Dict[str, bool]:
+        """Returns the values of the conditions known statically"""
+        values = {name: self.evaluate(name) for name in self.conditions}
+        return {name: value for name, value in values.items() if value is not None}
+
+    def prune_template(self, template: Dict[str, Any]) -> List[str]:
+        """
+        Removes the resources and outputs whose condition is statically false, and the Condition attribute of the
+        ones whose condition is statically true. Fn::If with a statically known condition are replaced by their
+        branch, or removed when the branch is AWS::NoValue. The Conditions section itself is kept as it is.
+
+        :param template: template to prune, modified in place
+        :return: logical ids of the removed resources
+        """
+        if not self.get_static_conditions():
+            return []
+
+        removed: List[str] = []
+        for section in ("Resources", "Outputs"):
+            entries = template.get(section)
+            if not isinstance(entries, dict):
+                continue
+            for logical_id, entry in list(entries.items()):
+                if not isinstance(entry, dict):
+                    continue
+                value = self.evaluate(entry.get("Condition"))
+                if value is False:
+                    del entries[logical_id]
+                    if section == "Resources":
+                        removed.append(logical_id)
+                    continue
+                if value:
+                    del entry["Condition"]
+                self._collapse_ifs(entry)
+
+        resources = template.get("Resources")
+        if removed and isinstance(resources, dict):
+            self._remove_depends_on(resources, set(removed))
+        return removed
+
+    def _evaluate_expression(self, expression: Any) -> Optional[bool]:  # noqa: PLR0911
+        if not isinstance(expression, dict) or len(expression) != 1:
+            return None
+        ((function, arguments),) = expression.items()
+
+        if function == "Condition":
+            return self.evaluate(arguments)
+        if not isinstance(arguments, list):
+            return None
+        if function == "Fn::Not":
+            value = self._evaluate_expression(arguments[0]) if len(arguments) == 1 else None
+            return None if value is None else not value
+        if function in ("Fn::And", "Fn::Or"):
+            values = [self._evaluate_expression(argument) for argument in arguments]
+            # The value is known as soon as one argument decides it, even if the others are unknown
+            decisive = bool(function == "Fn::Or")
+            if decisive in values:
+                return decisive
+            return None if not values or None in values else not decisive
+        if function == "Fn::Equals" and len(arguments) == _NUM_ARGUMENTS_IN_EQUALS:
+            first, second = (self._resolve_scalar(argument) for argument in arguments)
+            return None if first is None or second is None else first == second
+        return None
+
+    def _resolve_scalar(self, value: Any) -> Optional[str]:
+        """Returns the string CloudFormation compares in Fn::Equals, None when the value is not known"""
+        resolved = self._resolver.resolve_parameter_refs(copy.deepcopy(value))
+        if isinstance(resolved, bool):
+            return "true" if resolved else "false"
+        if isinstance(resolved, (str, int, float)):
+            return str(resolved)
+        return None
+
+    def _collapse_ifs(self, value: Any) -> Any:
+        """
+        Replaces, in place, the Fn::If with a statically known condition by their branch.
+
+        :return: value to replace the given value with, _NO_VALUE when it has to be removed
+        """
+        if is_intrinsic_if(value):
+            arguments = value["Fn::If"]
+            valid = isinstance(arguments, list) and len(arguments) == _NUM_ARGUMENTS_IN_IF
+            condition = self.evaluate(arguments[0]) if valid else None
+            if condition is not None:
+                branch = self._collapse_ifs(arguments[1] if condition else arguments[2])
+                return _NO_VALUE if is_intrinsic_no_value(branch) else branch
+        if isinstance(value, dict):
+            for key in list(value):
+                collapsed = self._collapse_ifs(value[key])
+                if collapsed is _NO_VALUE:
+                    del value[key]
+                else:
+                    value[key] = collapsed
+        elif isinstance(value, list):
+            value[:] = [item for item in map(self._collapse_ifs, value) if item is not _NO_VALUE]
+        return value
+
+    @staticmethod
+    def _remove_depends_on(resources: Dict[str, Any], removed: Set[str]) -> None:
+        for resource in resources.values():
+            depends_on = resource.get("DependsOn") if isinstance(resource, dict) else None
+            if isinstance(depends_on, str) and depends_on in removed:
+                del resource["DependsOn"]
+            elif isinstance(depends_on, list) and removed.intersection(depends_on):
+                remaining = [logical_id for logical_id in depends_on if logical_id not in removed]
+                if remaining:
+                    resource["DependsOn"] = remaining
+                else:
+                    del resource["DependsOn"]
@@ -4,12 +4,15 @@ Method decorator for execution latency collection
 
 import functools
 import logging
-from datetime import datetime
-from typing import Callable, Optional, TypeVar, Union, overload
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar, Union, overload
 
 from typing_extensions import ParamSpec
 
 from samtranslator.metrics.metrics import DummyMetricsPublisher, Metrics
+from samtranslator.metrics.tracing import get_tracer
 from samtranslator.model import Resource
 
 LOG = logging.getLogger(__name__)
@@ -17,6 +20,10 @@ LOG = logging.getLogger(__name__)
 _PT = ParamSpec("_PT")  # parameters
 _RT = TypeVar("_RT")  # return value
 
+# Metrics of the running translation. Every thread (and asyncio task) has its own value,
+# so that concurrent translations record their metrics to their own instance.
+_context_metrics: ContextVar[Optional[Metrics]] = ContextVar("metrics", default=None)
+
 
 class MetricsMethodWrapperSingleton:
     """
@@ -31,12 +38,27 @@ class MetricsMethodWrapperSingleton:
     def set_instance(metrics: Metrics) -> None:
         MetricsMethodWrapperSingleton._METRICS_INSTANCE = metrics
 
+    @staticmethod
+    @contextmanager
+    def instance_for_context(metrics: Metrics) -> Iterator[None]:
+        """
+        Context manager making get_instance() return the given instance in the current context only,
+        instead of the instance set for the whole process.
+        """
+        token = _context_metrics.set(metrics)
+        try:
+            yield
+        finally:
+            _context_metrics.reset(token)
+
     @staticmethod
     def get_instance() -> Metrics:
         """
-        Return the instance, if nothing is set return a dummy one
+        Return the instance of the current context, otherwise the one set for the process,
+        if nothing is set return a dummy one
         """
-        return MetricsMethodWrapperSingleton._METRICS_INSTANCE
+        metrics = _context_metrics.get()
+        return metrics if metrics is not None else MetricsMethodWrapperSingleton._METRICS_INSTANCE
 
 
 def _get_metric_name(prefix, name, func, args):  # type: ignore[no-untyped-def]
@@ -69,6 +91,16 @@ def _get_metric_name(prefix, name, func, args):  # type: ignore[no-untyped-def]
     return metric_name
 
 
+def _get_span_attributes(args: Tuple[Any, ...]) -> Dict[str, Any]:
+    """
+    Returns the attributes of the span of a timed method, the logical id and type of the resource when the caller is
+    an instance of Resource object.
+    """
+    if args and isinstance(args[0], Resource):
+        return {"logical_id": args[0].logical_id, "resource_type": args[0].resource_type}
+    return {}
+
+
 def _send_cw_metric(prefix, name, execution_time_ms, func, args):  # type: ignore[no-untyped-def]
     """
     Gets metric name from 'prefix', 'name', 'func' and 'args' parameters, then calls metrics instance from its
@@ -107,17 +139,24 @@ def cw_timer(
     - If 'name' is not provided and caller is not instance of 'Resource' then it will be the name of the function
 
     If prefix is defined, it will be added in the beginning of what is been generated above
+
+    When a tracer is set (see samtranslator.metrics.tracing), the method also runs in a span named like the metric.
     """
 
     def cw_timer_decorator(func: Callable[_PT, _RT]) -> Callable[_PT, _RT]:
         @functools.wraps(func)
         def wrapper_cw_timer(*args, **kwargs) -> _RT:  # type: ignore[no-untyped-def]
-            start_time = datetime.now()
+            start_time = perf_counter_ns()
 
-            exec_result = func(*args, **kwargs)
+            tracer = get_tracer()
+            if tracer is None:
+                exec_result = func(*args, **kwargs)
+            else:
+                span_name = _get_metric_name(prefix, name, func, args)  # type: ignore[no-untyped-call]
+                with tracer.start_as_current_span(span_name, attributes=_get_span_attributes(args)):
+                    exec_result = func(*args, **kwargs)
 
-            execution_time = datetime.now() - start_time
-            execution_time_ms = execution_time.total_seconds() * 1000
+            execution_time_ms = (perf_counter_ns() - start_time) / 1_000_000
             _send_cw_metric(prefix, name, execution_time_ms, func, args)  # type: ignore[no-untyped-call]
 
             return exec_result
@@ -2,10 +2,17 @@
 Helper classes to publish metrics
 """
 
+import json
 import logging
+import math
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, TypedDict, Union
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple, TypedDict, Union
 
 from samtranslator.internal.deprecation_control import deprecated
 
@@ -66,6 +73,263 @@ class CWMetricsPublisher(MetricsPublisher):
             LOG.exception(f"Failed to report {len(metric_data)} metrics")
 
 
+class BackgroundMetricsPublisher(MetricsPublisher):
+    """
+    Publishes metrics to CloudWatch from a background thread, so that publishing does not add latency to the caller.
+
+    publish() only queues the metric data. The background thread sends it with PutMetricData once batch_size
+    metrics are queued, every flush_interval seconds, on flush() and on shutdown(). When max_queue_size metrics
+    are already queued, new metrics are dropped and counted in dropped_metrics.
+    """
+
+    # Limits of a PutMetricData request
+    MAX_BATCH_SIZE = 1000
+    MAX_REQUEST_SIZE = 1_000_000
+
+    def __init__(
+        self,
+        cloudwatch_client: Any,
+        batch_size: int = MAX_BATCH_SIZE,
+        flush_interval: float = 10.0,
+        max_queue_size: int = 10_000,
+    ) -> None:
+        """
+        Constructor
+
+        :param cloudwatch_client: cloudwatch client required to publish metrics to cloudwatch
+        :param batch_size: maximum number of metrics sent in one request
+        :param flush_interval: maximum number of seconds a metric waits in the queue
+        :param max_queue_size: maximum number of metrics waiting to be sent
+        """
+        if not 1 <= batch_size <= self.MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {self.MAX_BATCH_SIZE}.")
+        MetricsPublisher.__init__(self)
+        self.cloudwatch_client = cloudwatch_client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.published_metrics = 0
+        self.failed_metrics = 0
+        self.dropped_metrics = 0
+
+        self._queue: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._in_flight = 0
+        self._flush_requested = False
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="BackgroundMetricsPublisher", daemon=True)
+        self._thread.start()
+
+    def publish(self, namespace: str, metrics: List["MetricDatum"]) -> None:
+        """
+        Queues the metrics to be published by the background thread.
+
+        :param namespace: namespace applied to all metrics published.
+        :param metrics: list of metrics to be published
+        """
+        # The metric data is taken now, the metrics can change after they are published
+        metric_data = [m.get_metric_data() for m in metrics]
+        with self._condition:
+            free = 0 if self._stopped else self.max_queue_size - len(self._queue)
+            dropped = max(len(metric_data) - free, 0)
+            self._queue.extend((namespace, data) for data in metric_data[: len(metric_data) - dropped])
+            self.dropped_metrics += dropped
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify_all()
+        if dropped:
+            LOG.warning(f"Dropped {dropped} metrics, the metrics publisher queue is full or shut down")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sends the queued metrics now and waits until they are sent.
+
+        :param timeout: maximum number of seconds to wait, no limit when not given
+        :returns: whether all metrics were sent before the timeout
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self._queue and not self._in_flight, timeout)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        Sends the queued metrics and stops the background thread. Metrics published afterwards are dropped.
+
+        :param timeout: maximum number of seconds to wait for the metrics to be sent, no limit when not given
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval
+                while not (self._stopped or self._flush_requested or len(self._queue) >= self.batch_size):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.batch_size))]
+                self._in_flight = len(batch)
+                if not self._queue:
+                    self._flush_requested = False
+                done = self._stopped and not self._queue
+
+            self._send(batch)
+
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+            if done:
+                return
+
+    def _send(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        metric_data_by_namespace: Dict[str, List[Dict[str, Any]]] = {}
+        for namespace, data in batch:
+            metric_data_by_namespace.setdefault(namespace, []).append(data)
+        for namespace, metric_data in metric_data_by_namespace.items():
+            for request in self._split_by_size(metric_data):
+                try:
+                    self.cloudwatch_client.put_metric_data(Namespace=namespace, MetricData=request)
+                    self.published_metrics += len(request)
+                except Exception:
+                    self.failed_metrics += len(request)
+                    LOG.exception(f"Failed to report {len(request)} metrics")
+
+    def _split_by_size(self, metric_data: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        # Histograms with many values can make a batch larger than a request can be
+        request: List[Dict[str, Any]] = []
+        size = 0
+        for data in metric_data:
+            data_size = len(json.dumps(data, default=str))
+            if request and size + data_size > self.MAX_REQUEST_SIZE:
+                yield request
+                request, size = [], 0
+            request.append(data)
+            size += data_size
+        if request:
+            yield request
+
+
+class EMFMetricsPublisher(MetricsPublisher):
+    """
+    Publishes metrics by writing them in CloudWatch Embedded Metric Format (EMF) to a stream, e.g. the stdout of a
+    Lambda function or a log file read by the CloudWatch agent. CloudWatch extracts the metrics from the log lines,
+    so publishing costs a buffered write instead of a PutMetricData request.
+
+    Metrics with the same dimensions are written to the same line, the values of a metric as an array. EMF has no
+    statistic sets, so MetricStatistics are written as their average, with the statistic set in the "Statistics"
+    property of the line.
+
+    Metric and dimension values are properties of the line too, so metrics named like a reserved property or like one
+    of their dimensions, and dimensions named like a reserved property, are not published.
+    """
+
+    # Limits of EMF
+    MAX_METRICS_PER_LINE = 100
+    MAX_VALUES_PER_METRIC = 100
+    MAX_DIMENSIONS = 30
+
+    STATISTICS_PROPERTY = "Statistics"
+    RESERVED_PROPERTIES = frozenset(["_aws", STATISTICS_PROPERTY])
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        """
+        Constructor
+
+        :param stream: stream the log lines are written to, sys.stdout when not given
+        """
+        MetricsPublisher.__init__(self)
+        self.stream = stream if stream else sys.stdout
+        self._lock = threading.Lock()
+
+    def publish(self, namespace: str, metrics: List["MetricDatum"]) -> None:
+        """
+        Method to write all metrics to the stream.
+
+        :param namespace: namespace applied to all metrics published.
+        :param metrics: list of metrics to be published
+        """
+        lines = "".join(json.dumps(line, default=str) + "\n" for line in self.get_log_lines(namespace, metrics))
+        if lines:
+            # A single write, so that the lines of concurrent translations are not mixed up
+            with self._lock:
+                self.stream.write(lines)
+
+    def get_log_lines(self, namespace: str, metrics: List["MetricDatum"]) -> Iterator[Dict[str, Any]]:
+        """
+        Returns the EMF log lines of the metrics.
+
+        :param namespace: namespace applied to all metrics published.
+        :param metrics: list of metrics to be published
+        """
+        metrics_by_dimensions: Dict[Tuple[Tuple[str, Any], ...], List[MetricDatum]] = {}
+        for metric in metrics:
+            dimension_values = {dimension["Name"]: dimension["Value"] for dimension in metric.dimensions}
+            if len(dimension_values) > self.MAX_DIMENSIONS:
+                LOG.warning(f"Not publishing metric {metric.name}, it has more than {self.MAX_DIMENSIONS} dimensions")
+                continue
+            if metric.name in self.RESERVED_PROPERTIES or metric.name in dimension_values:
+                LOG.warning(f"Not publishing metric {metric.name}, its name is reserved or used by its dimensions")
+                continue
+            if not self.RESERVED_PROPERTIES.isdisjoint(dimension_values):
+                LOG.warning(f"Not publishing metric {metric.name}, one of its dimensions has a reserved name")
+                continue
+            metrics_by_dimensions.setdefault(tuple(dimension_values.items()), []).append(metric)
+
+        for dimensions, dimension_metrics in metrics_by_dimensions.items():
+            line_metrics: List[MetricDatum] = []
+            value_counts: Dict[str, int] = {}
+            for metric in dimension_metrics:
+                value_count = value_counts.get(metric.name, 0)
+                if (not value_count and len(value_counts) == self.MAX_METRICS_PER_LINE) or (
+                    value_count == self.MAX_VALUES_PER_METRIC
+                ):
+                    yield self._get_log_line(namespace, dict(dimensions), line_metrics)
+                    line_metrics, value_counts = [], {}
+                line_metrics.append(metric)
+                value_counts[metric.name] = value_counts.get(metric.name, 0) + 1
+            yield self._get_log_line(namespace, dict(dimensions), line_metrics)
+
+    @staticmethod
+    def _get_log_line(namespace: str, dimensions: Dict[str, Any], metrics: List["MetricDatum"]) -> Dict[str, Any]:
+        units: Dict[str, str] = {}
+        values: Dict[str, List[Union[int, float]]] = {}
+        statistics: Dict[str, Dict[str, Any]] = {}
+        for metric in metrics:
+            units.setdefault(metric.name, metric.unit)
+            if isinstance(metric, MetricStatistics):
+                values.setdefault(metric.name, []).append(metric.sum / metric.sample_count)
+                metric_data = metric.get_metric_data()
+                statistics[metric.name] = metric_data.get("StatisticValues") or {
+                    "Values": metric_data["Values"],
+                    "Counts": metric_data["Counts"],
+                }
+            else:
+                values.setdefault(metric.name, []).append(metric.value)
+
+        line: Dict[str, Any] = {
+            "_aws": {
+                "Timestamp": int(min(metric.timestamp for metric in metrics).timestamp() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": namespace,
+                        "Dimensions": [list(dimensions)],
+                        "Metrics": [{"Name": name, "Unit": unit} for name, unit in units.items()],
+                    }
+                ],
+            },
+            **dimensions,
+        }
+        for name, metric_values in values.items():
+            line[name] = metric_values[0] if len(metric_values) == 1 else metric_values
+        if statistics:
+            line[EMFMetricsPublisher.STATISTICS_PROPERTY] = statistics
+        return line
+
+
 class DummyMetricsPublisher(MetricsPublisher):
     def __init__(self) -> None:
         MetricsPublisher.__init__(self)
@@ -132,22 +396,112 @@ class MetricDimension(TypedDict):
     Value: Any
 
 
+class MetricStatistics(MetricDatum):
+    """
+    Aggregates the values recorded for a metric into a statistic set (sample count, sum, minimum and maximum)
+    and, when buckets are given, a histogram. Its size does not depend on the number of recorded values.
+
+    It is published as StatisticValues, or as Values and Counts when it has a histogram. Every bucket is
+    published with its upper bound as value, the values above the last bucket with the maximum.
+    """
+
+    # CloudWatch accepts up to 150 values in a datum, one of them is used for the values above the last bucket
+    MAX_HISTOGRAM_BUCKETS = 149
+
+    def __init__(
+        self,
+        name: str,
+        unit: str,
+        dimensions: Optional[List["MetricDimension"]] = None,
+        buckets: Optional[Sequence[float]] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """
+        Constructor
+
+        :param name: metric name
+        :param unit: unit of metric (try using values from Unit class)
+        :param dimensions: array of dimensions applied to the metric
+        :param buckets: upper bounds of the buckets of the histogram, no histogram when not given
+        :param timestamp: timestamp of metric (datetime.datetime object)
+        """
+        if buckets and len(buckets) > self.MAX_HISTOGRAM_BUCKETS:
+            raise ValueError(f"A histogram can have at most {self.MAX_HISTOGRAM_BUCKETS} buckets.")
+        super().__init__(name, 0, unit, dimensions, timestamp)
+        self.sample_count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.buckets = sorted(buckets) if buckets else []
+        # The last count is for the values above the last bucket
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+
+    @property
+    def sum(self) -> Union[int, float]:
+        return self.value
+
+    def add(self, value: Union[int, float]) -> None:
+        """
+        Adds a value to the statistics.
+
+        :param value: value of metric
+        """
+        self.sample_count += 1
+        self.value += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if self.buckets:
+            self.bucket_counts[bisect_left(self.buckets, value)] += 1
+
+    def get_metric_data(self) -> Dict[str, Any]:
+        metric_data: Dict[str, Any] = {
+            "MetricName": self.name,
+            "Unit": self.unit,
+            "Dimensions": self.dimensions,
+            "Timestamp": self.timestamp,
+        }
+        if self.buckets:
+            bucket_values = [*self.buckets, self.maximum]
+            metric_data["Values"] = [bucket_values[i] for i, count in enumerate(self.bucket_counts) if count]
+            metric_data["Counts"] = [count for count in self.bucket_counts if count]
+        else:
+            metric_data["StatisticValues"] = {
+                "SampleCount": self.sample_count,
+                "Sum": self.sum,
+                "Minimum": self.minimum,
+                "Maximum": self.maximum,
+            }
+        return metric_data
+
+
 class Metrics:
     def __init__(
-        self, namespace: str = "ServerlessTransform", metrics_publisher: Optional[MetricsPublisher] = None
+        self,
+        namespace: str = "ServerlessTransform",
+        metrics_publisher: Optional[MetricsPublisher] = None,
+        histogram_buckets: Optional[Sequence[float]] = None,
+        aggregate_latencies: bool = False,
     ) -> None:
         """
         Constructor
 
         :param namespace: namespace under which all metrics will be published
         :param metrics_publisher: publisher to publish all metrics
+        :param histogram_buckets: upper bounds of the histogram buckets of the statistics, see MetricStatistics
+        :param aggregate_latencies: Whether record_latency(), used by cw_timer, adds the values to the statistics of
+            the metric, see record_latency_statistic(). Defaults to saving a metric object for every value, returned
+            by get_metric().
         """
         self.metrics_publisher = metrics_publisher if metrics_publisher else DummyMetricsPublisher()
         self.metrics_cache: Dict[str, List[MetricDatum]] = {}
+        self.metric_statistics: Dict[Tuple[str, str, Tuple[Tuple[str, Any], ...]], MetricStatistics] = {}
+        self.histogram_buckets = histogram_buckets
+        self.aggregate_latencies = aggregate_latencies
         self.namespace = namespace
+        # Statistics can be recorded from multiple threads, e.g. by the executor of translate_async()
+        self._statistics_lock = threading.Lock()
 
     def __del__(self) -> None:
-        if len(self.metrics_cache) > 0:
+        if len(self.metrics_cache) > 0 or len(self.metric_statistics) > 0:
             # attempting to publish if user forgot to call publish in code
             LOG.warning(
                 "There are unpublished metrics. Please make sure you call publish after you record all metrics."
@@ -199,23 +553,67 @@ class Metrics:
         timestamp: Optional[datetime] = None,
     ) -> None:
         """
-        Create metric with unit Milliseconds.
+        Create metric with unit Milliseconds, or add the value to its statistics if aggregate_latencies is set.
 
         :param name: metric name
         :param value: value of metric
         :param unit: unit of metric (try using values from Unit class)
         :param dimensions: array of dimensions applied to the metric
-        :param timestamp: timestamp of metric (datetime.datetime object)
+        :param timestamp: timestamp of metric (datetime.datetime object), not used by the statistics
         """
+        if self.aggregate_latencies:
+            self.record_latency_statistic(name, value, dimensions)
+            return
         self._record_metric(name, value, Unit.Milliseconds, dimensions, timestamp)
 
+    def record_statistic(
+        self,
+        name: str,
+        value: Union[int, float],
+        unit: str,
+        dimensions: Optional[List["MetricDimension"]] = None,
+    ) -> None:
+        """
+        Add the value to the statistics of the metric, instead of saving a metric object for every value.
+
+        :param name: metric name
+        :param value: value of metric
+        :param unit: unit of metric (try using values from Unit class)
+        :param dimensions: array of dimensions applied to the metric
+        """
+        key = (name, unit, tuple((dimension["Name"], dimension["Value"]) for dimension in dimensions or []))
+        with self._statistics_lock:
+            statistics = self.metric_statistics.get(key)
+            if statistics is None:
+                statistics = MetricStatistics(name, unit, dimensions, self.histogram_buckets)
+                self.metric_statistics[key] = statistics
+            statistics.add(value)
+
+    def record_latency_statistic(
+        self,
+        name: str,
+        value: Union[int, float],
+        dimensions: Optional[List["MetricDimension"]] = None,
+    ) -> None:
+        """
+        Add the value to the statistics of the metric, with unit Milliseconds.
+
+        :param name: metric name
+        :param value: value of metric
+        :param dimensions: array of dimensions applied to the metric
+        """
+        self.record_statistic(name, value, Unit.Milliseconds, dimensions)
+
     def publish(self) -> None:
         """Calls publish method from the configured metrics publisher to publish metrics"""
         # flatten the key->list dict into a flat list; we don't care about the key as it's
         # the metric name which is also in the MetricDatum object
-        all_metrics = []
+        all_metrics: List[MetricDatum] = []
         for m in self.metrics_cache.values():
             all_metrics.extend(m)
+        with self._statistics_lock:
+            all_metrics.extend(self.metric_statistics.values())
+            self.metric_statistics = {}
         self.metrics_publisher.publish(self.namespace, all_metrics)
         self.metrics_cache = {}
 
@@ -227,3 +625,17 @@ class Metrics:
         :returns: List (possibly empty) of MetricDatum objects
         """
         return self.metrics_cache.get(name, [])
+
+    def get_statistics(
+        self, name: str, unit: str, dimensions: Optional[List["MetricDimension"]] = None
+    ) -> Optional[MetricStatistics]:
+        """
+        Returns the statistics of a metric from the internal cache
+
+        :param name: metric name
+        :param unit: unit of metric
+        :param dimensions: array of dimensions applied to the metric
+        :returns: MetricStatistics object, None if no value has been recorded
+        """
+        key = (name, unit, tuple((dimension["Name"], dimension["Value"]) for dimension in dimensions or []))
+        return self.metric_statistics.get(key)
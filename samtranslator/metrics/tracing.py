@@ -0,0 +1,209 @@
+"""
+Lightweight tracing of the translation
+
+Spans are opened around the steps of the translation (parsing, plugin hooks, resources, reference resolution and
+the methods timed with cw_timer), so that nested steps can be told apart, e.g. a SAR call made by a plugin hook.
+
+Nothing is traced unless a tracer is set with use_tracer(). The tracer can be the Tracer of this module, or any
+tracer with an OpenTelemetry compatible start_as_current_span(), e.g. opentelemetry.trace.get_tracer(__name__).
+"""
+
+import itertools
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, ContextManager, Dict, Iterator, List, Mapping, Optional, Protocol, Union
+
+
+class SpanTracer(Protocol):
+    """Interface of the tracers, a subset of the one of OpenTelemetry tracers"""
+
+    def start_as_current_span(self, name: str, attributes: Optional[Mapping[str, Any]] = None) -> ContextManager[Any]:
+        """
+        Returns a context manager opening a span, which is the parent of the spans opened in its context.
+
+        :param name: name of the span
+        :param attributes: attributes of the span
+        """
+
+
+# Tracer of the running translation, like the metrics every thread (and asyncio task) has its own value
+_context_tracer: ContextVar[Optional[SpanTracer]] = ContextVar("tracer", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("span", default=None)
+
+_NO_SPAN: ContextManager[None] = nullcontext()
+
+
+@contextmanager
+def use_tracer(tracer: Optional[SpanTracer]) -> Iterator[None]:
+    """
+    Context manager tracing the translations run in the current context with the given tracer.
+
+    :param tracer: tracer opening the spans, None to not trace
+    """
+    token = _context_tracer.set(tracer)
+    try:
+        yield
+    finally:
+        _context_tracer.reset(token)
+
+
+def get_tracer() -> Optional[SpanTracer]:
+    """Returns the tracer of the current context, None when nothing is traced"""
+    return _context_tracer.get()
+
+
+def start_span(name: str, attributes: Optional[Mapping[str, Any]] = None) -> ContextManager[Any]:
+    """
+    Returns a context manager opening a span with the tracer of the current context. It does nothing when no
+    tracer is set.
+
+    :param name: name of the span
+    :param attributes: attributes of the span, the ones with None values are omitted since OpenTelemetry does not
+        accept them
+    """
+    tracer = _context_tracer.get()
+    if tracer is None:
+        return _NO_SPAN
+    if attributes is not None:
+        attributes = {key: value for key, value in attributes.items() if value is not None}
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+class Span:
+    """A timed step of the translation"""
+
+    __slots__ = ["name", "span_id", "parent_id", "attributes", "thread_id", "start_ns", "end_ns"]
+
+    def __init__(
+        self, name: str, span_id: int, parent_id: Optional[int], attributes: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        """
+        Constructor
+
+        :param name: name of the span
+        :param span_id: id of the span, unique in its tracer
+        :param parent_id: id of the span it is nested in, None for a root span
+        :param attributes: attributes of the span
+        """
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.thread_id = threading.get_ident()
+        self.start_ns = perf_counter_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ns(self) -> Optional[int]:
+        return None if self.end_ns is None else self.end_ns - self.start_ns
+
+
+class SpanExporter(ABC):
+    """Interface for all span exporters"""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """
+        Exports a span once it is ended
+
+        :param span: ended span
+        """
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the ended spans in memory, e.g. to inspect them in tests"""
+
+    def __init__(self) -> None:
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self) -> List[Span]:
+        """Returns the ended spans, in the order they ended"""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans = []
+
+
+class ChromeTraceSpanExporter(InMemorySpanExporter):
+    """
+    Keeps the ended spans in memory and writes them in the Chrome trace event format, which can be opened with
+    chrome://tracing or https://ui.perfetto.dev
+    """
+
+    def get_trace(self) -> Dict[str, Any]:
+        """Returns the spans as Chrome trace, every span is a complete event"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": "samtranslator",
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": (span.duration_ns or 0) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.attributes,
+            }
+            for span in self.get_finished_spans()
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Union[str, Path]) -> None:
+        """
+        Writes the Chrome trace of the spans to a file
+
+        :param path: path of the file
+        """
+        Path(path).write_text(json.dumps(self.get_trace(), default=str), encoding="utf-8")
+
+
+class Tracer:
+    """Opens spans and passes them to its exporters once they end"""
+
+    def __init__(self, exporters: List[SpanExporter]) -> None:
+        """
+        Constructor
+
+        :param exporters: exporters of the ended spans
+        """
+        self.exporters = exporters
+        self._span_ids = itertools.count(1)
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Optional[Mapping[str, Any]] = None) -> Iterator[Span]:
+        """
+        Context manager opening a span, which is the parent of the spans opened in its context.
+        When an exception is raised in the span, its type is set as "exception.type" attribute.
+
+        :param name: name of the span
+        :param attributes: attributes of the span
+        """
+        parent = _current_span.get()
+        span = Span(name, next(self._span_ids), parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_attribute("exception.type", type(e).__name__)
+            raise
+        finally:
+            span.end_ns = perf_counter_ns()
+            _current_span.reset(token)
+            for exporter in self.exporters:
+                exporter.export(span)
@@ -30,6 +30,7 @@ from samtranslator.model.route53 import Route53RecordSetGroup
 from samtranslator.model.s3_utils.uri_parser import parse_s3_uri
 from samtranslator.model.tags.resource_tagging import get_tag_list
 from samtranslator.model.types import PassThrough
+from samtranslator.open_api.base_editor import SecurityRule
 from samtranslator.region_configuration import RegionConfiguration
 from samtranslator.swagger.swagger import SwaggerEditor
 from samtranslator.translator.arn_generator import ArnGenerator
@@ -836,18 +837,28 @@ class ApiGenerator:
         auth_properties = AuthProperties(**self.auth)
         authorizers = self._get_authorizers(auth_properties.Authorizers, auth_properties.DefaultAuthorizer)  # type: ignore[no-untyped-call]
 
+        # The default authorizer and the default ApiKey requirement are set in a single walk over the methods
+        security_rules: List[SecurityRule] = []
         if authorizers:
             swagger_editor.add_authorizers_security_definitions(authorizers)  # type: ignore[no-untyped-call]
-            self._set_default_authorizer(
+            default_authorizer_rule = self._get_default_authorizer_rule(
                 swagger_editor,
                 authorizers,
                 auth_properties.DefaultAuthorizer,
                 auth_properties.AddDefaultAuthorizerToCorsPreflight,
             )
+            if default_authorizer_rule:
+                security_rules.append(default_authorizer_rule)
 
+        if auth_properties.ApiKeyRequired:
+            security_rules.append(
+                swagger_editor.get_default_apikey_required_rule(auth_properties.AddApiKeyRequiredToCorsPreflight)
+            )
+        swagger_editor.apply_security_rules(security_rules)
+
+        # Added after the walk, which adds the AWS_IAM security definition, to keep the order of the definitions
         if auth_properties.ApiKeyRequired:
             swagger_editor.add_apikey_security_definition()
-            self._set_default_apikey_required(swagger_editor, auth_properties.AddApiKeyRequiredToCorsPreflight)
 
         if auth_properties.ResourcePolicy:
             SwaggerEditor.validate_is_dict(
@@ -1289,15 +1300,15 @@ class ApiGenerator:
 
         return permissions
 
-    def _set_default_authorizer(
+    def _get_default_authorizer_rule(
         self,
         swagger_editor: SwaggerEditor,
         authorizers: Dict[str, ApiGatewayAuthorizer],
         default_authorizer: str,
         add_default_auth_to_preflight: bool = True,
-    ) -> None:
+    ) -> Optional[SecurityRule]:
         if not default_authorizer:
-            return
+            return None
 
         if not isinstance(default_authorizer, str):
             raise InvalidResourceException(
@@ -1313,17 +1324,9 @@ class ApiGenerator:
                 + "' was not defined in 'Authorizers'.",
             )
 
-        for path in swagger_editor.iter_on_path():
-            swagger_editor.set_path_default_authorizer(
-                path,
-                default_authorizer,
-                authorizers=authorizers,
-                add_default_auth_to_preflight=add_default_auth_to_preflight,
-            )
-
-    def _set_default_apikey_required(self, swagger_editor: SwaggerEditor, required_options_api_key: bool) -> None:
-        for path in swagger_editor.iter_on_path():
-            swagger_editor.set_path_default_apikey_required(path, required_options_api_key)
+        return swagger_editor.get_default_authorizer_rule(
+            default_authorizer, authorizers=authorizers, add_default_auth_to_preflight=add_default_auth_to_preflight
+        )
 
     def _set_endpoint_configuration(self, rest_api: ApiGatewayRestApi, value: Union[str, Dict[str, Any]]) -> None:
         """
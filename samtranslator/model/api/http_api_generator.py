@@ -606,8 +606,9 @@ class HttpApiGenerator:
                 + "' was not defined in 'Authorizers'.",
             )
 
-        for path in open_api_editor.iter_on_path():
-            open_api_editor.set_path_default_authorizer(path, default_authorizer, authorizers)
+        open_api_editor.apply_security_rules(
+            [open_api_editor.get_default_authorizer_rule(default_authorizer, authorizers)]
+        )
 
     def _get_authorizers(
         self, authorizers_config: Any, enable_iam_authorizer: bool = False
@@ -1,8 +1,9 @@
 import copy
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 ConnectorProfile = Dict[str, Any]
 
@@ -10,6 +11,10 @@ _PROFILE_FILE = Path(__file__).absolute().parent / "profiles.json"
 with _PROFILE_FILE.open(encoding="utf-8") as f:
     PROFILE: ConnectorProfile = json.load(f)
 
+# Profile variables, e.g. %{Source.Arn}
+_VARIABLE_REGEX = re.compile(r"%{([\w\.]+)}")
+_SUB_REGEX = re.compile(r"\${.+}")
+
 
 def get_profile(source_type: str, dest_type: str):  # type: ignore[no-untyped-def]
     profile = PROFILE["Permissions"].get(source_type, {}).get(dest_type)
@@ -17,10 +22,121 @@ def get_profile(source_type: str, dest_type: str):  # type: ignore[no-untyped-de
     return copy.deepcopy(profile)
 
 
+@lru_cache(maxsize=None)
+def get_profile_template(source_type: str, dest_type: str) -> Optional["ProfileTemplate"]:
+    """
+    Returns the profile of the connectors from source_type to dest_type, compiled at first use, or None if there
+    is no such profile.
+    """
+    profile = PROFILE["Permissions"].get(source_type, {}).get(dest_type)
+    return ProfileTemplate(profile) if profile else None
+
+
+@lru_cache(maxsize=None)
+def _get_cfn_resource_properties_template(resource_type: str) -> "ProfileTemplate":
+    return ProfileTemplate(PROFILE["CfnResourceProperties"].get(resource_type, {}))
+
+
 def replace_cfn_resource_properties(resource_type: str, logical_id: str) -> Any:
-    properties = copy.deepcopy(PROFILE["CfnResourceProperties"].get(resource_type, {}))
+    return _get_cfn_resource_properties_template(resource_type).render({"logicalId": logical_id})
 
-    return profile_replace(properties, {"logicalId": logical_id})
+
+class ProfileTemplate:
+    """
+    Profile, or any part of a profile, compiled to be rendered with different replacements of its variables, see
+    profile_replace(). The strings are split into their text and their variables once, so that rendering the
+    template only fills the slots of its variables.
+    """
+
+    def __init__(self, obj: Any) -> None:
+        """
+        :param obj: compiled profile, must not be modified afterwards
+        """
+        self.obj = obj
+        # Variables, in the order verify_profile_variables_replaced() reports them, and whether they are in a key,
+        # as keys are never replaced
+        self._variables: List[Tuple[str, bool]] = []
+        self._render = self._compile(obj)
+
+    def render(self, replacements: Dict[str, Any]) -> Any:
+        """
+        Returns a copy of the compiled profile, in which the variables are replaced, see profile_replace().
+
+        Raises ValueError if a profile variable being replaced is None.
+        """
+        return self._render(replacements)
+
+    def verify_variables_replaced(self, replaced_variables: Iterable[str]) -> None:
+        """
+        Verifies that the given variables are all the variables of the profile, like
+        verify_profile_variables_replaced() verifies the rendered profile; throws ValueError if not.
+        """
+        replaced_variables = set(replaced_variables)
+        matches = ["%{" + name + "}" for name, in_key in self._variables if in_key or name not in replaced_variables]
+        if matches:
+            raise ValueError(f"The following variables have not been replaced: {matches}")
+
+    def _compile(self, obj: Any) -> Callable[[Dict[str, Any]], Any]:
+        if isinstance(obj, dict):
+            items = []
+            for key, value in obj.items():
+                self._variables.extend((name, True) for name in _VARIABLE_REGEX.findall(key))
+                items.append((key, self._compile(value)))
+            return lambda replacements: {key: render(replacements) for key, render in items}
+        if isinstance(obj, list):
+            renders = [self._compile(item) for item in obj]
+            return lambda replacements: [render(replacements) for render in renders]
+        if not isinstance(obj, str):
+            return lambda _: obj
+        if _VARIABLE_REGEX.search(obj):
+            string_template = _StringTemplate(obj)
+            self._variables.extend((name, False) for name in string_template.parts[1::2])
+            return string_template.render
+        if _SUB_REGEX.search(obj):
+            return lambda _: {"Fn::Sub": obj}
+        return lambda _: obj
+
+
+class _StringTemplate:
+    """String with profile variables"""
+
+    def __init__(self, s: str) -> None:
+        self.s = s
+        # Text and names of the variables, alternately
+        self.parts: List[str] = _VARIABLE_REGEX.split(s)
+        self.sub_var_names = {name: _sanitize(name) for name in self.parts[1::2]}
+
+    def render(self, replacements: Dict[str, Any]) -> Any:
+        """
+        Returns the replacement of the string if it is a single variable, or the string with its variables replaced,
+        wrapped in a Fn::Sub if it contains ${..}.
+        """
+        res = {}
+        for k, v in replacements.items():
+            sub_var_name = self.sub_var_names.get(k)
+            if sub_var_name is None:
+                continue
+            if v is None:
+                raise ValueError(f"{k} is missing.")
+            if self.s == "%{" + k + "}":
+                # s and pattern match exactly, simply return replacement string
+                return v
+            res[sub_var_name] = v
+
+        s = "".join(
+            (
+                part
+                if i % 2 == 0
+                else ("${" + self.sub_var_names[part] + "}" if part in replacements else "%{" + part + "}")
+            )
+            for i, part in enumerate(self.parts)
+        )
+        if _SUB_REGEX.search(s):
+            # As long as the string has a ${..}, it needs sub.
+            if res:
+                return {"Fn::Sub": [s, res]}
+            return {"Fn::Sub": s}
+        return s
 
 
 def verify_profile_variables_replaced(obj: Any) -> None:
@@ -41,43 +157,9 @@ def profile_replace(obj: Any, replacements: Dict[str, Any]):  # type: ignore[no-
 
     Raises ValueError if a profile variable being replaced is None.
     """
-    return _map_nested(obj, lambda v: _profile_replace_str(v, replacements))
-
-
-def _map_nested(obj: Any, fn):  # type: ignore[no-untyped-def, no-untyped-def]
-    if isinstance(obj, dict):
-        return {k: _map_nested(v, fn) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_map_nested(v, fn) for v in obj]
-    return fn(obj)
+    return ProfileTemplate(obj).render(replacements)
 
 
 def _sanitize(s: str) -> str:
     """Remove everything but alphanumeric characters."""
     return "".join(c for c in s if c.isalnum())
-
-
-def _profile_replace_str(s: Any, replacements: Dict[str, Any]):  # type: ignore[no-untyped-def]
-    if not isinstance(s, str):
-        return s
-    res = {}
-    for k, v in replacements.items():
-        pattern = "%{" + k + "}"
-        # !Sub doesn't allow special characters in variable names
-        sub_var_name = _sanitize(k)
-        replaced_pattern = "${" + sub_var_name + "}"
-        if pattern in s and v is None:
-            raise ValueError(f"{k} is missing.")
-        if pattern == s:
-            # s and pattern match exactly, simply return replacement string
-            return v
-        if pattern in s:
-            # pattern is substring of s, use Fn::Sub to replace part of s
-            s = s.replace(pattern, replaced_pattern)
-            res[sub_var_name] = v
-    if re.search(r"\${.+}", s):
-        # As long as the string has a ${..}, it needs sub.
-        if res:
-            return {"Fn::Sub": [s, res]}
-        return {"Fn::Sub": s}
-    return s
@@ -1,9 +1,44 @@
-from typing import Any, Dict
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
 from samtranslator.model import GeneratedProperty, Resource
 from samtranslator.model.intrinsics import fnGetAtt, ref
 
 
+def _canonical(value: Any) -> str:
+    """Returns a string equal for equal values, whatever the order of the keys of their dictionaries"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class _CanonicalIndex:
+    """
+    Set of the canonical keys of the items of a list, so that the list can be searched without comparing all of its
+    items. The keys of the items appended to the list since the last search are added to the set on the next one,
+    the set is rebuilt when the list is replaced.
+    """
+
+    def __init__(self, get_keys: Callable[[Any], Iterable[str]]) -> None:
+        self._get_keys = get_keys
+        self._items: Optional[List[Any]] = None
+        self._indexed_count = 0
+        self._keys: Set[str] = set()
+
+    def get_keys(self, items: List[Any]) -> Set[str]:
+        if items is not self._items or len(items) < self._indexed_count:
+            self._items, self._indexed_count, self._keys = items, 0, set()
+        for item in items[self._indexed_count :]:
+            self._keys.update(self._get_keys(item))
+        self._indexed_count = len(items)
+        return self._keys
+
+
+def _policy_keys(policy: Any) -> List[str]:
+    keys = ["policy:" + _canonical(policy)]
+    if isinstance(policy, dict) and policy.get("PolicyDocument") is not None:
+        keys.append("document:" + _canonical(policy["PolicyDocument"]))
+    return keys
+
+
 class IAMRole(Resource):
     resource_type = "AWS::IAM::Role"
     property_types = {
@@ -17,6 +52,53 @@ class IAMRole(Resource):
 
     runtime_attrs = {"name": lambda self: ref(self.logical_id), "arn": lambda self: fnGetAtt(self.logical_id, "Arn")}
 
+    ManagedPolicyArns: Optional[List[Any]]
+    Policies: Optional[List[Any]]
+
+    _keywords = {*Resource._keywords, "_managed_policy_arns_index", "_policies_index"}
+
+    def __init__(
+        self,
+        logical_id: Optional[Any],
+        relative_id: Optional[str] = None,
+        depends_on: Optional[List[str]] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(logical_id, relative_id, depends_on, attributes)
+        self._managed_policy_arns_index = _CanonicalIndex(lambda arn: ["arn:" + _canonical(arn)])
+        self._policies_index = _CanonicalIndex(_policy_keys)
+
+    def add_managed_policy_arn(self, policy_arn: Any) -> bool:
+        """
+        Appends a managed policy ARN to the role, unless it is already attached to it.
+
+        :param policy_arn: ARN of the managed policy, or intrinsic function resolving to it
+        :return: whether the ARN was appended
+        """
+        if self.ManagedPolicyArns is None:
+            self.ManagedPolicyArns = []
+        keys = self._managed_policy_arns_index.get_keys(self.ManagedPolicyArns)
+        key = "arn:" + _canonical(policy_arn)
+        if key in keys:
+            return False
+        self.ManagedPolicyArns.append(policy_arn)
+        return True
+
+    def add_policy(self, policy: Dict[str, Any]) -> bool:
+        """
+        Appends an inline policy to the role, unless the role already has it, or a policy with the same document.
+
+        :param policy: inline policy, with its PolicyName and PolicyDocument
+        :return: whether the policy was appended
+        """
+        if self.Policies is None:
+            self.Policies = []
+        keys = self._policies_index.get_keys(self.Policies)
+        if any(key in keys for key in _policy_keys(policy)):
+            return False
+        self.Policies.append(policy)
+        return True
+
 
 class IAMManagedPolicy(Resource):
     resource_type = "AWS::IAM::ManagedPolicy"
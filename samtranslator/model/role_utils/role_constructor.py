@@ -93,8 +93,7 @@ def construct_role_for_resource(  # type: ignore[no-untyped-def] # noqa: PLR0913
     execution_role = IAMRole(logical_id=role_logical_id, attributes=attributes)
     execution_role.AssumeRolePolicyDocument = assume_role_policy_document
 
-    if not managed_policy_arns:
-        managed_policy_arns = []
+    execution_role.ManagedPolicyArns = list(managed_policy_arns or [])
 
     if not policy_documents:
         policy_documents = []
@@ -136,7 +135,7 @@ def construct_role_for_resource(  # type: ignore[no-untyped-def] # noqa: PLR0913
             #   Managed Policy Arn (string): Insert it directly into the list
             #   Intrinsic Function (dict): Insert it directly into the list
             #
-            # When you insert into managed_policy_arns list, de-dupe to prevent same ARN from showing up twice
+            # When you insert into the managed policy ARNs, de-dupe to prevent same ARN from showing up twice
             #
 
             policy_arn = policy_entry.data
@@ -150,8 +149,7 @@ def construct_role_for_resource(  # type: ignore[no-untyped-def] # noqa: PLR0913
             # De-Duplicate managed policy arns before inserting. Mainly useful
             # when customer specifies a managed policy which is already inserted
             # by SAM, such as AWSLambdaBasicExecutionRole
-            if policy_arn not in managed_policy_arns:
-                managed_policy_arns.append(policy_arn)
+            execution_role.add_managed_policy_arn(policy_arn)
         else:
             # Policy Templates are not supported here in the "core"
             raise InvalidResourceException(
@@ -159,7 +157,6 @@ def construct_role_for_resource(  # type: ignore[no-untyped-def] # noqa: PLR0913
                 f"Policy at index {index} in the '{resource_policies.POLICIES_PROPERTY_NAME}' property is not valid",
             )
 
-    execution_role.ManagedPolicyArns = list(managed_policy_arns)
     execution_role.Policies = policy_documents or None
     execution_role.Path = role_path
     execution_role.PermissionsBoundary = permissions_boundary
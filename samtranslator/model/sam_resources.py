@@ -71,9 +71,7 @@ from samtranslator.model.connector.connector import (
 )
 from samtranslator.model.connector_profiles.profile import (
     ConnectorProfile,
-    get_profile,
-    profile_replace,
-    verify_profile_variables_replaced,
+    get_profile_template,
 )
 from samtranslator.model.dynamodb import DynamoDBTable
 from samtranslator.model.exceptions import InvalidEventException, InvalidResourceException
@@ -1928,8 +1926,8 @@ class SamConnector(SamResourceMacro):
         multi_dest: bool,
         resource_resolver: ResourceResolver,
     ) -> List[Resource]:
-        profile = get_profile(source.resource_type, destination.resource_type)
-        if not profile:
+        profile_template = get_profile_template(source.resource_type, destination.resource_type)
+        if not profile_template:
             raise InvalidResourceException(
                 self.logical_id,
                 f"Unable to create connector from {source.resource_type} to {destination.resource_type}; it's not supported or the template is invalid.",
@@ -1938,7 +1936,8 @@ class SamConnector(SamResourceMacro):
 
         # removing duplicate permissions
         self.Permissions = list(set(self.Permissions))
-        profile_type, profile_properties = profile["Type"], profile["Properties"]
+        # Compiled profile, only read to validate the permissions
+        profile_type, profile_properties = profile_template.obj["Type"], profile_template.obj["Properties"]
         profile_permissions = profile_properties["AccessCategories"]
         valid_permissions_combinations = profile_properties.get("ValidAccessCategories")
 
@@ -1978,11 +1977,11 @@ class SamConnector(SamResourceMacro):
             "Destination.Qualifier": destination.qualifier,
         }
         try:
-            profile_properties = profile_replace(profile_properties, replacement)
+            profile_properties = profile_template.render(replacement)["Properties"]
         except ValueError as e:
             raise InvalidResourceException(self.logical_id, str(e)) from e
 
-        verify_profile_variables_replaced(profile_properties)
+        profile_template.verify_variables_replaced(replacement)
 
         generated_resources: List[Resource] = []
         if profile_type == "AWS_IAM_ROLE_MANAGED_POLICY":
@@ -1,6 +1,6 @@
 import json
 from copy import deepcopy
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 
 from samtranslator.metrics.method_decorator import cw_timer
 from samtranslator.model.exceptions import InvalidEventException, InvalidResourceException
@@ -363,46 +363,41 @@ class StateMachineGenerator:
         """
         Replaces the CloudFormation instrinsic functions and dynamic references within the input with substitutions.
 
+        The input is traversed once, depth first with the keys of the dictionaries and the indices of the lists in
+        sorted order, and the dynamic values are replaced as they are found, so that the substitutions are numbered
+        in this order.
+
         :param _input: Input dictionary in which the dynamic values need to be replaced with substitutions
 
         :returns: List of substitution to dynamic value mappings
         :rtype: dict
         """
         substitution_map = {}
-        for path in self._get_paths_to_intrinsics(_input):  # type: ignore[no-untyped-call]
-            location = _input
-            for step in path[:-1]:
-                location = location[step]
-            sub_name, sub_key = self._generate_substitution()
-            substitution_map[sub_name] = location[path[-1]]
-            location[path[-1]] = sub_key
+        # Containers being traversed, with the iterator over their remaining keys. The nested containers are
+        # traversed when they are found, before the next keys of their parent.
+        stack = [(_input, self._iterate_sorted_keys(_input))]
+        while stack:
+            container, keys = stack[-1]
+            for key in keys:
+                value = container[key]
+                if is_intrinsic(value) or is_dynamic_reference(value):
+                    sub_name, sub_key = self._generate_substitution()
+                    substitution_map[sub_name] = value
+                    container[key] = sub_key
+                elif isinstance(value, (dict, list)):
+                    stack.append((value, self._iterate_sorted_keys(value)))
+                    break
+            else:
+                stack.pop()
         return substitution_map
 
-    def _get_paths_to_intrinsics(self, _input, path=None):  # type: ignore[no-untyped-def]
-        """
-        Returns all paths to dynamic values within a dictionary
-
-        :param _input: Input dictionary to find paths to dynamic values in
-        :param path: Optional list to keep track of the path to the input dictionary
-        :returns list: List of keys that defines the path to a dynamic value within the input dictionary
-        """
-        if path is None:
-            path = []
-        dynamic_value_paths = []  # type: ignore[var-annotated]
-        if isinstance(_input, dict):
-            iterator = _input.items()
-        elif isinstance(_input, list):
-            iterator = enumerate(_input)  # type: ignore[assignment]
-        else:
-            return dynamic_value_paths
-
-        for key, value in sorted(iterator, key=lambda item: item[0]):  # type: ignore[no-any-return]
-            if is_intrinsic(value) or is_dynamic_reference(value):
-                dynamic_value_paths.append([*path, key])
-            elif isinstance(value, (dict, list)):
-                dynamic_value_paths.extend(self._get_paths_to_intrinsics(value, [*path, key]))  # type: ignore[no-untyped-call]
-
-        return dynamic_value_paths
+    @staticmethod
+    def _iterate_sorted_keys(container: Any) -> Iterator[Any]:
+        if isinstance(container, dict):
+            return iter(sorted(container))
+        if isinstance(container, list):
+            return iter(range(len(container)))
+        return iter(())
 
     def _generate_substitution(self) -> Tuple[str, str]:
         """
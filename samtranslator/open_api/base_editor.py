@@ -1,7 +1,8 @@
 """Base class for OpenApiEditor and SwaggerEditor."""
 
 import re
-from typing import Any, Dict, Iterator, List, Optional, Union
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from samtranslator.model.apigateway import ApiGatewayAuthorizer
 from samtranslator.model.apigatewayv2 import ApiGatewayV2Authorizer
@@ -9,6 +10,52 @@ from samtranslator.model.exceptions import InvalidDocumentException, InvalidTemp
 from samtranslator.model.intrinsics import is_intrinsic_no_value, make_conditional
 from samtranslator.utils.py27hash_fix import Py27Dict
 
+# Rule setting the security of a method, called with the path, the normalized method name and the method definition
+SecurityRule = Callable[[str, str, Dict[str, Any]], None]
+
+
+class _IndexedMethod:
+    """
+    Method of a path item in the path index of an editor. Only refers to the method value of the document,
+    its conditional contents are computed the first time they are needed.
+    """
+
+    def __init__(self, name: str, value: Any) -> None:
+        self.name = name
+        self.normalized_name = BaseEditor._normalize_method_name(name)
+        self.value = value
+
+    @cached_property
+    def definitions(self) -> List[Any]:
+        return BaseEditor.get_conditional_contents(self.value)
+
+
+class _IndexedPath:
+    """
+    Entry of the path index of an editor. Only refers to the value of the path in the document, which stays the
+    single source of truth: the entry is discarded when the value of the path is replaced, and the editor discards it
+    when it adds or replaces methods of the path.
+    """
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+        self.path_items = BaseEditor.get_conditional_contents(value)
+
+    @cached_property
+    def methods(self) -> List[Tuple[Any, Dict[str, _IndexedMethod]]]:
+        """Path items with their methods by name, path items which are not dictionaries have no methods"""
+        return [
+            (
+                path_item,
+                (
+                    {name: _IndexedMethod(name, value) for name, value in path_item.items()}
+                    if isinstance(path_item, dict)
+                    else {}
+                ),
+            )
+            for path_item in self.path_items
+        ]
+
 
 class BaseEditor:
     # constants:
@@ -23,6 +70,9 @@ class BaseEditor:
     # attributes:
     _doc: Dict[str, Any]
     paths: Dict[str, Any]
+    _path_index: Dict[str, _IndexedPath]
+    # Fields of the path items which are not methods
+    _EXCLUDED_PATHS_FIELDS: List[str] = []
 
     @staticmethod
     def get_conditional_contents(item: Any) -> List[Any]:
@@ -91,6 +141,29 @@ class BaseEditor:
         for path, _ in self.paths.items():
             yield path
 
+    def _get_indexed_path(self, path: str) -> _IndexedPath:
+        """
+        Returns the entry of the path index for the given path, indexing it if it was not yet, or if its value has
+        been replaced since.
+
+        :param path: path name
+        :return: entry of the path index
+        """
+        value = self.paths.get(path)
+        indexed_path = self._path_index.get(path)
+        if indexed_path is None or indexed_path.value is not value:
+            indexed_path = self._path_index[path] = _IndexedPath(value)
+        return indexed_path
+
+    def _invalidate_indexed_path(self, path: str) -> None:
+        """
+        Discards the entry of the path index for the given path. Must be called after adding or replacing methods of
+        the path items of the path.
+
+        :param path: path name
+        """
+        self._path_index.pop(path, None)
+
     @staticmethod
     def _normalize_method_name(method: Any) -> Any:
         """
@@ -124,7 +197,7 @@ class BaseEditor:
 
         method = self._normalize_method_name(method)
         if method:
-            for path_item in self.get_conditional_contents(self.paths.get(path)):
+            for path_item in self._get_indexed_path(path).path_items:
                 if not isinstance(path_item, dict) or method not in path_item:
                     return False
         return True
@@ -143,11 +216,13 @@ class BaseEditor:
         if not self.has_path(path, method):
             return False
 
-        for path_item in self.get_conditional_contents(self.paths.get(path)):
+        for path_item, methods in self._get_indexed_path(path).methods:
             BaseEditor.validate_path_item_is_dict(path_item, path)
-            method_definition = path_item.get(method)
+            indexed_method = methods.get(method)
             if not (
-                isinstance(method_definition, dict) and self.method_has_integration(method_definition, path, method)
+                indexed_method
+                and isinstance(indexed_method.value, dict)
+                and self.method_has_integration(indexed_method.value, path, method)
             ):
                 return False
         # Integration present and non-empty
@@ -162,6 +237,8 @@ class BaseEditor:
         :raises InvalidDocumentException: If the value of `path` in Swagger is not a dictionary
         """
         method = self._normalize_method_name(method)
+        if method and self.has_path(path, method):
+            return
 
         path_dict = self.paths.setdefault(path, Py27Dict())
 
@@ -173,6 +250,7 @@ class BaseEditor:
 
         for path_item in self.get_conditional_contents(path_dict):
             path_item.setdefault(method, Py27Dict())
+        self._invalidate_indexed_path(path)
 
     def add_timeout_to_method(self, api: Dict[str, Any], path: str, method_name: str, timeout: int) -> None:
         """
@@ -215,9 +293,10 @@ class BaseEditor:
         """
         normalized_method_name = self._normalize_method_name(method_name)
 
-        for path_item in self.get_conditional_contents(self.paths.get(path_name)):
+        for path_item, methods in self._get_indexed_path(path_name).methods:
             BaseEditor.validate_path_item_is_dict(path_item, path_name)
-            for method_definition in self.get_conditional_contents(path_item.get(normalized_method_name)):
+            indexed_method = methods.get(normalized_method_name)
+            for method_definition in indexed_method.definitions if indexed_method else [None]:
                 BaseEditor.validate_method_definition_is_dict(method_definition, path_name, method_name)
                 if skip_methods_without_apigw_integration and not self.method_definition_has_integration(
                     method_definition
@@ -225,6 +304,55 @@ class BaseEditor:
                     continue
                 yield method_definition
 
+    def iter_on_all_methods_for_path(
+        self, path_name: str, skip_methods_without_apigw_integration: bool = True
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yields all the (method name, method definition) tuples for the path, including those inside conditionals.
+
+        :param path_name: path name
+        :param skip_methods_without_apigw_integration: if True, skips method definitions without apigw integration
+        :yields list of (method name, method definition) tuples
+        """
+        for path_item, methods in self._get_indexed_path(path_name).methods:
+            BaseEditor.validate_path_item_is_dict(path_item, path_name)
+            for indexed_method in methods.values():
+                # Excluding non-method sections
+                if indexed_method.name in self._EXCLUDED_PATHS_FIELDS:
+                    continue
+
+                for method_definition in indexed_method.definitions:
+                    BaseEditor.validate_method_definition_is_dict(method_definition, path_name, indexed_method.name)
+                    if skip_methods_without_apigw_integration and not self.method_definition_has_integration(
+                        method_definition
+                    ):
+                        continue
+                    yield indexed_method.normalized_name, method_definition
+
+    def _iter_on_methods_for_security(self, path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yields the (method name, method definition) tuples of the path whose security is set by security rules.
+
+        :param path: path name
+        """
+        yield from self.iter_on_all_methods_for_path(path)
+
+    def apply_security_rules(self, rules: Sequence[SecurityRule], paths: Optional[Iterable[str]] = None) -> None:
+        """
+        Applies the rules setting the security of the API, e.g. its default authorizer, to the methods of the given
+        paths, in a single walk over the document. The rules are called in order for each method, so that each of them
+        sees the security set by the previous ones.
+
+        :param rules: rules to apply
+        :param paths: names of the paths to apply the rules to, all the paths by default
+        """
+        if not rules:
+            return
+        for path in self.iter_on_path() if paths is None else paths:
+            for method_name, method_definition in self._iter_on_methods_for_security(path):
+                for rule in rules:
+                    rule(path, method_name, method_definition)
+
     @staticmethod
     def validate_is_dict(obj: Any, exception_message: str) -> None:
         """
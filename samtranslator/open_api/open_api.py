@@ -1,13 +1,13 @@
 import copy
 import json
 import re
-from typing import Any, Callable, Dict, Optional, TypeVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
 
 from samtranslator.metrics.method_decorator import cw_timer
 from samtranslator.model.apigatewayv2 import ApiGatewayV2Authorizer
 from samtranslator.model.exceptions import InvalidDocumentException, InvalidTemplateException
 from samtranslator.model.intrinsics import is_intrinsic, make_conditional, ref
-from samtranslator.open_api.base_editor import BaseEditor
+from samtranslator.open_api.base_editor import BaseEditor, SecurityRule
 from samtranslator.utils.py27hash_fix import Py27Dict, Py27UniStr
 from samtranslator.utils.types import Intrinsicable
 from samtranslator.utils.utils import InvalidValueType, dict_deep_get
@@ -61,6 +61,7 @@ class OpenApiEditor(BaseEditor):
 
         self._doc = _deepcopy(doc)
         self.paths = self._doc["paths"]
+        self._path_index = {}
         try:
             self.security_schemes = dict_deep_get(self._doc, "components.securitySchemes") or Py27Dict()
             self.definitions = dict_deep_get(self._doc, "definitions") or Py27Dict()
@@ -136,7 +137,7 @@ class OpenApiEditor(BaseEditor):
         if condition:
             integration_uri = make_conditional(condition, integration_uri)
 
-        for path_item in self.get_conditional_contents(self.paths.get(path)):
+        for path_item in self._get_indexed_path(path).path_items:
             BaseEditor.validate_path_item_is_dict(path_item, path)
             # create as Py27Dict and insert key one by one to preserve input order
             if path_item[method] is None:
@@ -156,26 +157,7 @@ class OpenApiEditor(BaseEditor):
             # If a condition is present, wrap all method contents up into the condition
             if condition:
                 path_item[method] = make_conditional(condition, path_item[method])
-
-    def iter_on_all_methods_for_path(self, path_name, skip_methods_without_apigw_integration=True):  # type: ignore[no-untyped-def]
-        """
-        Yields all the (method name, method definition) tuples for the path, including those inside conditionals.
-
-        :param path_name: path name
-        :param skip_methods_without_apigw_integration: if True, skips method definitions without apigw integration
-        :yields list of (method name, method definition) tuples
-        """
-        for path_item in self.get_conditional_contents(self.paths.get(path_name)):
-            BaseEditor.validate_path_item_is_dict(path_item, path_name)
-            for method_name, method in path_item.items():
-                for method_definition in self.get_conditional_contents(method):
-                    BaseEditor.validate_method_definition_is_dict(method_definition, path_name, method_name)
-                    if skip_methods_without_apigw_integration and not self.method_definition_has_integration(
-                        method_definition
-                    ):
-                        continue
-                    normalized_method_name = self._normalize_method_name(method_name)
-                    yield normalized_method_name, method_definition
+        self._invalidate_indexed_path(path)
 
     def add_path_parameters_to_method(self, api, path, method_name, path_parameters):  # type: ignore[no-untyped-def]
         """
@@ -252,43 +234,50 @@ class OpenApiEditor(BaseEditor):
             authorizers param.
         :param dict authorizers: Dict of Authorizer configurations defined on the related Api.
         """
-        for path_item in self.get_conditional_contents(self.paths.get(path)):
+        self.apply_security_rules([self.get_default_authorizer_rule(default_authorizer, authorizers)], [path])
+
+    def get_default_authorizer_rule(
+        self, default_authorizer: str, authorizers: Dict[str, ApiGatewayV2Authorizer]
+    ) -> SecurityRule:
+        """
+        Returns the security rule adding the default_authorizer to the security block of a method unless an
+        Authorizer was defined at the Function/Path/Method level, see set_path_default_authorizer().
+
+        :param string default_authorizer: Name of the authorizer to use as the default. Must be a key in the
+            authorizers param.
+        :param dict authorizers: Dict of Authorizer configurations defined on the related Api.
+        """
+        # Shared by all the methods using the default authorizer
+        default_security_dict = {default_authorizer: self._get_authorization_scopes(authorizers, default_authorizer)}
+
+        def set_default_authorizer(path: str, method_name: str, method_definition: Dict[str, Any]) -> None:
+            if not method_definition.get("security"):
+                method_definition["security"] = [default_security_dict]
+
+        return set_default_authorizer
+
+    def _iter_on_methods_for_security(self, path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for path_item in self._get_indexed_path(path).path_items:
             BaseEditor.validate_path_item_is_dict(path_item, path)
             for method_name, method in path_item.items():
                 normalized_method_name = self._normalize_method_name(method_name)
-                # Excluding parameters section
-                if normalized_method_name == "parameters":
+                # Excluding parameters section, the security of the preflight requests is never set
+                if normalized_method_name in ("parameters", "options"):
                     continue
-                if normalized_method_name != "options":
-                    normalized_method_name = self._normalize_method_name(method_name)
-                    # It is possible that the method could have two definitions in a Fn::If block.
-                    if normalized_method_name not in path_item:
-                        raise InvalidDocumentException(
-                            [
-                                InvalidTemplateException(
-                                    f"Could not find {normalized_method_name} in {path} within DefinitionBody."
-                                )
-                            ]
-                        )
-                    for method_definition in self.get_conditional_contents(method):
-                        # If no integration given, then we don't need to process this definition (could be AWS::NoValue)
-                        BaseEditor.validate_method_definition_is_dict(method_definition, path, method_name)
-                        if not self.method_definition_has_integration(method_definition):
-                            continue
-                        existing_security = method_definition.get("security")
-                        if existing_security:
-                            continue
-
-                        security_dict = {}
-                        security_dict[default_authorizer] = self._get_authorization_scopes(
-                            authorizers, default_authorizer
-                        )
-                        authorizer_security = [security_dict]
-
-                        security = authorizer_security
-
-                        if security:
-                            method_definition["security"] = security
+                # It is possible that the method could have two definitions in a Fn::If block.
+                if normalized_method_name not in path_item:
+                    raise InvalidDocumentException(
+                        [
+                            InvalidTemplateException(
+                                f"Could not find {normalized_method_name} in {path} within DefinitionBody."
+                            )
+                        ]
+                    )
+                for method_definition in self.get_conditional_contents(method):
+                    # If no integration given, then we don't need to process this definition (could be AWS::NoValue)
+                    BaseEditor.validate_method_definition_is_dict(method_definition, path, method_name)
+                    if self.method_definition_has_integration(method_definition):
+                        yield method_name, method_definition
 
     def add_auth_to_method(self, path, method_name, auth, api):  # type: ignore[no-untyped-def]
         """
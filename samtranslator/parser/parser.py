@@ -1,6 +1,7 @@
 import logging
 from typing import Any, Dict
 
+from samtranslator.metrics.tracing import start_span
 from samtranslator.model.exceptions import (
     InvalidDocumentException,
     InvalidResourceAttributeTypeException,
@@ -19,8 +20,9 @@ class Parser:
         pass
 
     def parse(self, sam_template: Dict[str, Any], parameter_values: Dict[str, Any], sam_plugins: SamPlugins) -> None:
-        self._validate(sam_template, parameter_values)  # type: ignore[no-untyped-call]
-        sam_plugins.act(LifeCycleEvents.before_transform_template, sam_template)
+        with start_span("Parser.parse"):
+            self._validate(sam_template, parameter_values)  # type: ignore[no-untyped-call]
+            sam_plugins.act(LifeCycleEvents.before_transform_template, sam_template)
 
     @staticmethod
     def validate_datatypes(sam_template):  # type: ignore[no-untyped-def]
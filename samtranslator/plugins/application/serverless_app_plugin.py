@@ -1,7 +1,10 @@
+import asyncio
 import copy
 import json
 import logging
 import re
+import threading
+from concurrent.futures import Executor
 from time import sleep
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
@@ -19,6 +22,7 @@ from samtranslator.plugins.exceptions import InvalidPluginException
 from samtranslator.public.sdk.resource import SamResourceType
 from samtranslator.public.sdk.template import SamTemplate
 from samtranslator.region_configuration import RegionConfiguration
+from samtranslator.utils.concurrency import run_in_executor
 from samtranslator.utils.constants import BOTO3_CONNECT_TIMEOUT
 from samtranslator.validator.value_validator import sam_expect
 
@@ -75,12 +79,15 @@ class ServerlessAppPlugin(BasePlugin):
             parameters = {}
         self._applications: Dict[Tuple[str, str], Any] = {}
         self._in_progress_templates: List[Tuple[str, str]] = []
+        self._prefetch_errors: Dict[Tuple[str, str], Exception] = {}
         self.__sar_client = sar_client
         self._sar_client_creator = sar_client_creator
         self._wait_for_template_active_status = wait_for_template_active_status
         self._validate_only = validate_only
         self._parameters = parameters
         self._total_wait_time = 0
+        # The service calls can be made concurrently by prefetch_applications(), they share the wait time
+        self._total_wait_time_lock = threading.Lock()
 
         # make sure the flag combination makes sense
         if self._validate_only is True and self._wait_for_template_active_status is True:
@@ -113,15 +120,54 @@ class ServerlessAppPlugin(BasePlugin):
         This plugin needs to run as soon as possible to allow some time for templates to become available.
         This verifies that the user has access to all specified applications.
 
+        :param dict template_dict: Dictionary of the SAM template
+        """
+        for app_id, semver, key, logical_id in self._get_application_requests(template_dict):
+            if key in self._prefetch_errors:
+                raise self._prefetch_errors[key]
+            self._request_application(app_id, semver, key, logical_id)
+
+    async def prefetch_applications(self, template_dict: Dict[str, Any], executor: Optional[Executor] = None) -> None:
+        """
+        Makes the service calls of on_before_transform_template concurrently, ahead of the transform.
+        on_before_transform_template then only makes the calls that were not made, and raises the error
+        of the first failed call, so that errors are raised at the same point as without prefetching.
+
+        :param dict template_dict: Dictionary of the SAM template, which is not modified
+        :param executor: Executor to make the blocking service calls on, defaults to the one of the event loop
+        """
+        try:
+            # The template has not been validated yet, resolving the application locations must not modify it
+            requests = await run_in_executor(executor, self._get_application_requests, copy.deepcopy(template_dict))
+            if requests:
+                # Create the client once, before the calls are made concurrently
+                await run_in_executor(executor, lambda: self._sar_client)
+        except Exception:
+            # on_before_transform_template handles the template again, after it has been validated
+            LOG.debug("Failed to prefetch applications, they are requested during the transform.", exc_info=True)
+            return
+
+        results = await asyncio.gather(
+            *(run_in_executor(executor, self._request_application, *request) for request in requests),
+            return_exceptions=True,
+        )
+        for (_, _, key, _), result in zip(requests, results):
+            if isinstance(result, Exception):
+                self._prefetch_errors[key] = result
+
+    def _get_application_requests(self, template_dict: Dict[str, Any]) -> List[Tuple[Any, Any, Tuple[str, str], str]]:
+        """
+        Resolves the locations of the applications of the template and returns the applications to request,
+        as (ApplicationId, SemanticVersion, key, logical id) tuples. Invalid locations are saved as errors of the
+        application, to be raised in on_before_transform_resource.
+
         :param dict template_dict: Dictionary of the SAM template
         """
         template = SamTemplate(template_dict)
         intrinsic_resolvers = self._get_intrinsic_resolvers(template_dict.get("Mappings", {}))  # type: ignore[no-untyped-call]
 
-        service_call = None
-        service_call = (
-            self._handle_get_application_request if self._validate_only else self._handle_create_cfn_template_request
-        )
+        requests = []
+        requested_keys = set()
         for logical_id, app in template.iterate({SamResourceType.Application.value}):
             if not self._can_process_application(app):  # type: ignore[no-untyped-call]
                 # Handle these cases in the on_before_transform_resource event
@@ -141,7 +187,7 @@ class ServerlessAppPlugin(BasePlugin):
                 self._applications[key] = False
                 continue
 
-            if key not in self._applications:
+            if key not in self._applications and key not in requested_keys:
                 try:
                     # Examine the type of ApplicationId and SemanticVersion
                     # before calling SAR API.
@@ -159,11 +205,24 @@ class ServerlessAppPlugin(BasePlugin):
                             "Serverless Application Repostiory does not support dynamic reference in 'ApplicationId' property.",
                         )
 
-                    self._make_service_call_with_retry(service_call, app_id, semver, key, logical_id)  # type: ignore[no-untyped-call]
+                    requested_keys.add(key)
+                    requests.append((app_id, semver, key, logical_id))
                 except InvalidResourceException as e:
                     # Catch all InvalidResourceExceptions, raise those in the before_resource_transform target.
                     self._applications[key] = e
 
+        return requests
+
+    def _request_application(self, app_id: Any, semver: Any, key: Tuple[str, str], logical_id: str) -> None:
+        service_call = (
+            self._handle_get_application_request if self._validate_only else self._handle_create_cfn_template_request
+        )
+        try:
+            self._make_service_call_with_retry(service_call, app_id, semver, key, logical_id)  # type: ignore[no-untyped-call]
+        except InvalidResourceException as e:
+            # Catch all InvalidResourceExceptions, raise those in the before_resource_transform target.
+            self._applications[key] = e
+
     def _make_service_call_with_retry(self, service_call, app_id, semver, key, logical_id):  # type: ignore[no-untyped-def]
         call_succeeded = False
         while self._total_wait_time < self.TEMPLATE_WAIT_TIMEOUT_SECONDS:
@@ -175,7 +234,8 @@ class ServerlessAppPlugin(BasePlugin):
                     LOG.debug(f"SAR call timed out for application id {app_id}")
                     sleep_time = self._get_sleep_time_sec()
                     sleep(sleep_time)
-                    self._total_wait_time += sleep_time
+                    with self._total_wait_time_lock:
+                        self._total_wait_time += sleep_time
                     continue
                 raise e
             call_succeeded = True
@@ -1,5 +1,6 @@
 import copy
-from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, List, Optional, Union
 
 from samtranslator.model.exceptions import ExceptionWithMessage, InvalidResourceAttributeTypeException
 from samtranslator.public.intrinsics import is_intrinsics
@@ -138,17 +139,12 @@ class Globals:
             return GlobalProperties({})
 
         if isinstance(ignore_globals, list):
-            global_props: GlobalProperties = copy.deepcopy(self.template_globals[resource_type])
-            for key in ignore_globals:
-                if key not in global_props.global_properties:
-                    raise InvalidResourceAttributeTypeException(
-                        logical_id,
-                        "IgnoreGlobals",
-                        None,
-                        f"Resource {logical_id} has invalid resource attribute 'IgnoreGlobals' on item '{key}'.",
-                    )
-                del global_props.global_properties[key]
-            return global_props
+            global_props = self.template_globals[resource_type]
+            ignored_keys = self._get_ignored_keys(logical_id, global_props, ignore_globals)
+            global_properties = copy.deepcopy(global_props.global_properties)
+            for key in ignored_keys:
+                del global_properties[key]
+            return GlobalProperties(global_properties)
 
         # We raise exception for any non "*" or non-list input
         raise InvalidResourceAttributeTypeException(
@@ -178,9 +174,28 @@ class Globals:
             # Nothing to do. Return the template unmodified
             return resource_properties
 
+        if isinstance(ignore_globals, list) and ignore_globals:
+            # The ignored properties are skipped by the merge, the compiled global properties are shared
+            global_props = self.template_globals[resource_type]
+            ignored_keys = self._get_ignored_keys(logical_id, global_props, ignore_globals)
+            return global_props.merge(resource_properties, ignored_keys)
+
         global_props = self.get_template_globals(logical_id, str(resource_type), ignore_globals)
 
-        return global_props.merge(resource_properties)  # type: ignore[no-untyped-call]
+        return global_props.merge(resource_properties)
+
+    @staticmethod
+    def _get_ignored_keys(logical_id: str, global_props: "GlobalProperties", ignore_globals: List[str]) -> List[str]:
+        for i, key in enumerate(ignore_globals):
+            # A property can only be ignored once
+            if key not in global_props.global_properties or key in ignore_globals[:i]:
+                raise InvalidResourceAttributeTypeException(
+                    logical_id,
+                    "IgnoreGlobals",
+                    None,
+                    f"Resource {logical_id} has invalid resource attribute 'IgnoreGlobals' on item '{key}'.",
+                )
+        return ignore_globals
 
     @classmethod
     def del_section(cls, template: Dict[str, Any]) -> None:
@@ -399,14 +414,20 @@ class GlobalProperties:
 
     def __init__(self, global_properties) -> None:  # type: ignore[no-untyped-def]
         self.global_properties = global_properties
+        self._merge_plan: Optional[_MergePlan] = None
 
-    def merge(self, local_properties):  # type: ignore[no-untyped-def]
+    def merge(self, local_properties, ignored_keys: Collection[str] = ()):  # type: ignore[no-untyped-def]
         """
-        Merge Global & local level properties according to the above rules
+        Merge Global & local level properties according to the above rules. The global properties are compiled once,
+        on the first merge, and must not be modified after it.
 
+        :param ignored_keys: Global properties not to merge, see IgnoreGlobals. The global values of the result are
+            then deep copies, like the global properties copied for the resources with IgnoreGlobals used to be.
         :return local_properties: Dictionary of local properties
         """
-        return self._do_merge(self.global_properties, local_properties)  # type: ignore[no-untyped-call]
+        if self._merge_plan is None or self._merge_plan.value is not self.global_properties:
+            self._merge_plan = self._compile(self.global_properties)
+        return self._merge_with_plan(self._merge_plan, local_properties, ignored_keys, bool(ignored_keys))
 
     def _do_merge(self, global_value, local_value):  # type: ignore[no-untyped-def]
         """
@@ -417,24 +438,65 @@ class GlobalProperties:
         :param local_value: Local value to be merged
         :return: Merged result
         """
+        return self._merge_with_plan(self._compile(global_value), local_value)
 
-        token_global = self._token_of(global_value)
-        token_local = self._token_of(local_value)
+    def _compile(self, global_value: Any) -> "_MergePlan":
+        """
+        Derives the tokens of the global value and of its items once, instead of on every merge.
 
-        # The following statements codify the rules explained in the doctring above
-        if token_global != token_local:
-            return self._prefer_local(global_value, local_value)  # type: ignore[no-untyped-call]
+        :param global_value: Global value to be merged
+        :return: Merge plan of the global value
+        """
+        token = self._token_of(global_value)
+        items = None
+        if token == self.TOKEN.DICT:
+            items = {key: self._compile(value) for key, value in global_value.items()}
+        return _MergePlan(global_value, token, items)
+
+    def _merge_with_plan(
+        self, plan: "_MergePlan", local_value: Any, ignored_keys: Collection[str] = (), copy_globals: bool = False
+    ) -> Any:
+        """
+        Merges the local value with the compiled global value. The merged dictionaries are new dictionaries, the values
+        which are not merged are shared with the global and local values, like they were shallow copied.
 
-        if self.TOKEN.PRIMITIVE == token_global == token_local:
-            return self._prefer_local(global_value, local_value)  # type: ignore[no-untyped-call]
+        :param plan: Merge plan of the global value
+        :param local_value: Local value to be merged
+        :param ignored_keys: Keys of the global dictionary not to merge
+        :param copy_globals: Whether the global values of the result are deep copied instead of shared
+        :return: Merged result
+        """
+        token_local = self._token_of(local_value)
 
-        if self.TOKEN.DICT == token_global == token_local:
-            return self._merge_dict(global_value, local_value)  # type: ignore[no-untyped-call]
+        # The following statements codify the rules explained in the doctring above
+        if plan.token != token_local:
+            return self._prefer_local(plan.value, local_value)  # type: ignore[no-untyped-call]
+
+        if token_local == self.TOKEN.PRIMITIVE:
+            return self._prefer_local(plan.value, local_value)  # type: ignore[no-untyped-call]
+
+        if token_local == self.TOKEN.DICT and plan.items is not None:
+            # Local has higher priority than global. So iterate over local dict and merge into global if keys are
+            # overridden
+            merged = plan.value.copy()
+            for key in ignored_keys:
+                del merged[key]
+            for key, value in local_value.items():
+                item_plan = plan.items.get(key) if key not in ignored_keys else None
+                # Both local & global contains the same key: merge them. Otherwise copy the local value over
+                merged[key] = (
+                    value if item_plan is None else self._merge_with_plan(item_plan, value, copy_globals=copy_globals)
+                )
+            if copy_globals:
+                for key in [key for key in merged if key not in local_value]:
+                    merged[key] = copy.deepcopy(merged[key])
+            return merged
 
-        if self.TOKEN.LIST == token_global == token_local:
-            return self._merge_lists(global_value, local_value)  # type: ignore[no-untyped-call]
+        if token_local == self.TOKEN.LIST:
+            global_list = copy.deepcopy(plan.value) if copy_globals else plan.value
+            return self._merge_lists(global_list, local_value)  # type: ignore[no-untyped-call]
 
-        raise TypeError(f"Unsupported type of objects. GlobalType={token_global}, LocalType={token_local}")
+        raise TypeError(f"Unsupported type of objects. GlobalType={plan.token}, LocalType={token_local}")
 
     def _merge_lists(self, global_list, local_list):  # type: ignore[no-untyped-def]
         """
@@ -447,29 +509,6 @@ class GlobalProperties:
 
         return global_list + local_list
 
-    def _merge_dict(self, global_dict, local_dict):  # type: ignore[no-untyped-def]
-        """
-        Merges the two dictionaries together
-
-        :param global_dict: Global dictionary to be merged
-        :param local_dict: Local dictionary to be merged
-        :return: New merged dictionary with values shallow copied
-        """
-
-        # Local has higher priority than global. So iterate over local dict and merge into global if keys are overridden
-        global_dict = global_dict.copy()
-
-        for key in local_dict:
-            if key in global_dict:
-                # Both local & global contains the same key. Let's do a merge.
-                global_dict[key] = self._do_merge(global_dict[key], local_dict[key])  # type: ignore[no-untyped-call]
-
-            else:
-                # Key is not in globals, just in local. Copy it over
-                global_dict[key] = local_dict[key]
-
-        return global_dict
-
     def _prefer_local(self, global_value, local_value):  # type: ignore[no-untyped-def]
         """
         Literally returns the local value whatever it may be. This method is useful to provide a unified implementation
@@ -512,6 +551,15 @@ class GlobalProperties:
         LIST = "list"
 
 
+@dataclass(frozen=True)
+class _MergePlan:
+    """Global value compiled for the merges: its token, and the plans of its items when it is a dictionary"""
+
+    value: Any
+    token: str
+    items: Optional[Dict[str, "_MergePlan"]]
+
+
 class InvalidGlobalsSectionException(ExceptionWithMessage):
     """Exception raised when a Globals section is invalid.
 
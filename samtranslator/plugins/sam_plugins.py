@@ -1,6 +1,9 @@
 import logging
-from typing import Any, List, Optional, Union
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional, Union
 
+from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton
+from samtranslator.metrics.tracing import start_span
 from samtranslator.model.exceptions import InvalidDocumentException, InvalidResourceException, InvalidTemplateException
 from samtranslator.plugins import BasePlugin, LifeCycleEvents
 
@@ -45,8 +48,15 @@ class SamPlugins:
     Plugins must raise an `samtranslator.model.exception.InvalidResourceException` when the input SAM template does
     not conform to the expectation
     set by the plugin. SAM translator will convert this into a nice error message and display to the user.
+
+    ### Dispatch and timing
+    The hook methods of a plugin are looked up when it is registered, the hooks it inherits from `BasePlugin` without
+    overriding them are not invoked. The time spent in every hook of every plugin is recorded as the statistics of
+    the `PluginHookLatency` metric, with the plugin and hook names as dimensions.
     """
 
+    HOOK_LATENCY_METRIC = "PluginHookLatency"
+
     def __init__(self, initial_plugins: Optional[Union[BasePlugin, List[BasePlugin]]] = None) -> None:
         """
         Initialize the plugins class with an optional list of plugins
@@ -54,6 +64,8 @@ class SamPlugins:
         :param BasePlugin or list initial_plugins: Single plugin or a List of plugins to initialize with
         """
         self._plugins: List[BasePlugin] = []
+        # Plugins overriding the hook method of every life cycle event, by method name
+        self._subscribers: Dict[str, List[BasePlugin]] = {"on_" + event.name: [] for event in LifeCycleEvents}
 
         if initial_plugins is None:
             initial_plugins = []
@@ -81,6 +93,19 @@ class SamPlugins:
             raise ValueError(f"Plugin with name {plugin.name} is already registered")
 
         self._plugins.append(plugin)
+        for method_name, subscribers in self._subscribers.items():
+            if self._overrides_hook(plugin, method_name):
+                subscribers.append(plugin)
+
+    @staticmethod
+    def _overrides_hook(plugin: BasePlugin, method_name: str) -> bool:
+        """
+        Checks if the plugin implements the hook method, instead of inheriting the no-op one of BasePlugin. Plugins
+        missing the method are considered to implement it, so that act() raises the error.
+        """
+        if method_name in vars(plugin):
+            return True
+        return getattr(type(plugin), method_name, None) is not getattr(BasePlugin, method_name)
 
     def is_registered(self, plugin_name: str) -> bool:
         """
@@ -121,19 +146,28 @@ class SamPlugins:
             raise ValueError("'event' must be an instance of LifeCycleEvents class")
 
         method_name = "on_" + event.name
+        metrics = MetricsMethodWrapperSingleton.get_instance()
 
-        for plugin in self._plugins:
+        for plugin in self._subscribers.get(method_name, self._plugins):
             if not hasattr(plugin, method_name):
                 raise NameError(f"'{method_name}' method is not found in the plugin with name '{plugin.name}'")
 
+            start = perf_counter_ns()
             try:
-                getattr(plugin, method_name)(*args, **kwargs)
+                with start_span(f"{plugin.name}.{method_name}", {"plugin": plugin.name, "event": event.name}):
+                    getattr(plugin, method_name)(*args, **kwargs)
             except (InvalidResourceException, InvalidDocumentException, InvalidTemplateException) as ex:
                 # Don't need to log these because they don't result in crashes
                 raise ex
             except Exception as ex:
                 LOG.exception("Plugin '%s' raised an exception: %s", plugin.name, ex)
                 raise ex
+            finally:
+                metrics.record_latency_statistic(
+                    self.HOOK_LATENCY_METRIC,
+                    (perf_counter_ns() - start) / 1e6,
+                    [{"Name": "Plugin", "Value": plugin.name}, {"Name": "Hook", "Value": method_name}],
+                )
 
     def __len__(self) -> int:
         """
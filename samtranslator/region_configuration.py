@@ -44,9 +44,8 @@ class RegionConfiguration:
 
             # need to handle when region is None so that it won't break
             if region is None:
-                if ArnGenerator.BOTO_SESSION_REGION_NAME is not None:
-                    region = ArnGenerator.BOTO_SESSION_REGION_NAME
-                else:
+                region = ArnGenerator.get_boto_session_region_name()
+                if region is None:
                     raise NoRegionFound("AWS Region cannot be found")
 
         # check if the service is available in region
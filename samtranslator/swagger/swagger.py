@@ -1,13 +1,16 @@
 import copy
+import json
 import re
-from typing import Any, Callable, Dict, Optional, TypeVar
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
 
 from samtranslator.metrics.method_decorator import cw_timer
 from samtranslator.model.apigateway import ApiGatewayAuthorizer
 from samtranslator.model.exceptions import InvalidDocumentException, InvalidTemplateException
 from samtranslator.model.intrinsics import fnSub, make_conditional, ref
 from samtranslator.model.types import PassThrough
-from samtranslator.open_api.base_editor import BaseEditor
+from samtranslator.open_api.base_editor import BaseEditor, SecurityRule
 from samtranslator.translator.arn_generator import ArnGenerator
 from samtranslator.utils.py27hash_fix import Py27Dict, Py27UniStr
 from samtranslator.utils.utils import InvalidValueType, dict_deep_set
@@ -18,6 +21,42 @@ T = TypeVar("T")
 # Wrap around copy.deepcopy to isolate time cost to deepcopy the doc.
 _deepcopy: Callable[[T], T] = cw_timer(prefix="SwaggerEditor")(copy.deepcopy)
 
+# Whether the resource policies built in this context aggregate their statements, see
+# SwaggerEditor.aggregate_resource_policies(). Every thread (and asyncio task) has its own value.
+_aggregate_resource_policies: ContextVar[bool] = ContextVar("aggregate_resource_policies", default=False)
+
+# Keys of the statements generated for resource policies, statements with other keys are never aggregated
+_AGGREGATABLE_STATEMENT_KEYS = {"Effect", "Action", "Resource", "Principal", "Condition"}
+
+# OPTIONS methods answering the CORS preflight requests, by CORS headers, see
+# SwaggerEditor._options_method_response_for_cors(). Shared by all the APIs.
+_cors_options_methods: Dict[Tuple[bool, bool, bool, bool], Py27Dict] = {}
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+class _AggregatedStatement:
+    """Statement of a resource policy, which the statements only differing from it by their resources are merged into"""
+
+    def __init__(self, statement: Dict[str, Any], owns_resources: bool) -> None:
+        self.statement = statement
+        self.resource_keys = {_canonical(resource) for resource in statement["Resource"]}
+        # The resources of the statements read from the document may be shared with other statements
+        self.owns_resources = owns_resources
+
+    def add_resources(self, resources: List[Any]) -> None:
+        for resource in resources:
+            key = _canonical(resource)
+            if key in self.resource_keys:
+                continue
+            if not self.owns_resources:
+                self.statement["Resource"] = list(self.statement["Resource"])
+                self.owns_resources = True
+            self.resource_keys.add(key)
+            self.statement["Resource"].append(resource)
+
 
 class SwaggerEditor(BaseEditor):
     """
@@ -72,9 +111,14 @@ class SwaggerEditor(BaseEditor):
 
         self._doc = _deepcopy(doc)
         self.paths = self._doc["paths"]
+        self._path_index = {}
         self.security_definitions = self._doc.get(self._SECURITY_DEFINITIONS) or Py27Dict()
         self.gateway_responses = self._doc.get(self._X_APIGW_GATEWAY_RESPONSES) or Py27Dict()
         self.resource_policy = self._doc.get(self._X_APIGW_POLICY) or Py27Dict()
+        # Statements of the resource policy by everything but their resources, when they are aggregated
+        self._aggregated_statements: Dict[str, _AggregatedStatement] = {}
+        self._indexed_statements: Optional[List[Any]] = None
+        self._indexed_statement_count = 0
         self.definitions = self._doc.get("definitions", Py27Dict())
 
         # https://swagger.io/specification/#path-item-object
@@ -83,7 +127,7 @@ class SwaggerEditor(BaseEditor):
         # We can do an early path validation on path item objects,
         # so we don't need to validate wherever we use them.
         for path in self.iter_on_path():
-            for path_item in self.get_conditional_contents(self.paths.get(path)):
+            for path_item in self._get_indexed_path(path).path_items:
                 SwaggerEditor.validate_path_item_is_dict(path_item, path)
 
     def add_disable_execute_api_endpoint_extension(self, disable_execute_api_endpoint: PassThrough) -> None:
@@ -142,7 +186,7 @@ class SwaggerEditor(BaseEditor):
         # This is necessary so CFN doesn't try to resolve the integration reference.
         _integration_uri = make_conditional(condition, integration_uri) if condition else integration_uri
 
-        for path_item in self.get_conditional_contents(self.paths.get(path)):
+        for path_item in self._get_indexed_path(path).path_items:
             BaseEditor.validate_path_item_is_dict(path_item, path)
             path_item[method][self._X_APIGW_INTEGRATION] = Py27Dict()
             # insert key one by one to preserce input order
@@ -173,6 +217,7 @@ class SwaggerEditor(BaseEditor):
             # If a condition is present, wrap all method contents up into the condition
             if condition:
                 path_item[method] = make_conditional(condition, path_item[method])
+        self._invalidate_indexed_path(path)
 
     def add_state_machine_integration(  # type: ignore[no-untyped-def] # noqa: PLR0913
         self,
@@ -207,7 +252,7 @@ class SwaggerEditor(BaseEditor):
         if condition:
             integration_uri = make_conditional(condition, integration_uri)
 
-        for path_item in self.get_conditional_contents(self.paths.get(path)):
+        for path_item in self._get_indexed_path(path).path_items:
             BaseEditor.validate_path_item_is_dict(path_item, path)
             # Responses
             integration_responses = Py27Dict()
@@ -237,6 +282,7 @@ class SwaggerEditor(BaseEditor):
             # If a condition is present, wrap all method contents up into the condition
             if condition:
                 path_item[method] = make_conditional(condition, path_item[method])
+        self._invalidate_indexed_path(path)
 
     def _generate_integration_credentials(self, method_invoke_role=None, api_invoke_role=None):  # type: ignore[no-untyped-def]
         return self._get_invoke_role(method_invoke_role or api_invoke_role)  # type: ignore[no-untyped-call]
@@ -246,30 +292,6 @@ class SwaggerEditor(BaseEditor):
         CALLER_CREDENTIALS_ARN = f"arn:{ArnGenerator.get_partition_name()}:iam::*:user/*"
         return invoke_role if invoke_role and invoke_role != "CALLER_CREDENTIALS" else CALLER_CREDENTIALS_ARN
 
-    def iter_on_all_methods_for_path(self, path_name, skip_methods_without_apigw_integration=True):  # type: ignore[no-untyped-def]
-        """
-        Yields all the (method name, method definition) tuples for the path, including those inside conditionals.
-
-        :param path_name: path name
-        :param skip_methods_without_apigw_integration: if True, skips method definitions without apigw integration
-        :yields list of (method name, method definition) tuples
-        """
-        for path_item in self.get_conditional_contents(self.paths.get(path_name)):
-            BaseEditor.validate_path_item_is_dict(path_item, path_name)
-            for method_name, method in path_item.items():
-                # Excluding non-method sections
-                if method_name in SwaggerEditor._EXCLUDED_PATHS_FIELDS:
-                    continue
-
-                for method_definition in self.get_conditional_contents(method):
-                    BaseEditor.validate_method_definition_is_dict(method_definition, path_name, method_name)
-                    if skip_methods_without_apigw_integration and not self.method_definition_has_integration(
-                        method_definition
-                    ):
-                        continue
-                    normalized_method_name = self._normalize_method_name(method_name)
-                    yield normalized_method_name, method_definition
-
     def add_cors(  # type: ignore[no-untyped-def] # noqa: PLR0913
         self, path, allowed_origins, allowed_headers=None, allowed_methods=None, max_age=None, allow_credentials=None
     ):
@@ -297,7 +319,7 @@ class SwaggerEditor(BaseEditor):
         :raises InvalidTemplateException: When values for one of the allowed_* variables is empty
         """
 
-        for path_item in self.get_conditional_contents(self.paths.get(path)):
+        for path_item in self._get_indexed_path(path).path_items:
             BaseEditor.validate_path_item_is_dict(path_item, path)
             # Skip if Options is already present
             method = self._normalize_method_name(self._OPTIONS_METHOD)
@@ -321,6 +343,7 @@ class SwaggerEditor(BaseEditor):
             path_item[self._OPTIONS_METHOD] = self._options_method_response_for_cors(  # type: ignore[no-untyped-call]
                 allowed_origins, allowed_headers, allowed_methods, max_age, allow_credentials
             )
+        self._invalidate_indexed_path(path)
 
     def add_binary_media_types(self, binary_media_types):  # type: ignore[no-untyped-def]
         """
@@ -354,6 +377,46 @@ class SwaggerEditor(BaseEditor):
         """
         Returns a Swagger snippet containing configuration for OPTIONS HTTP Method to configure CORS.
 
+        The snippet is built once per set of CORS headers, and cloned for every path: only the values of the headers
+        are set. The values are not cached, as their types (e.g. Py27UniStr) are part of the deployment hash.
+
+        :param string/dict allowed_origins: Comma separate list of allowed origins.
+            Value can also be an intrinsic function dict.
+        :param string/dict allowed_headers: Comma separated list of allowed headers.
+            Value can also be an intrinsic function dict.
+        :param string/dict allowed_methods: Comma separated list of allowed methods.
+            Value can also be an intrinsic function dict.
+        :param integer/dict max_age: Maximum duration to cache the CORS Preflight request. Value is set on
+            Access-Control-Max-Age header. Value can also be an intrinsic function dict.
+        :param bool allow_credentials: Flags whether request is allowed to contain credentials.
+
+        :return dict: Dictionary containing Options method configuration for CORS
+        """
+        key = (bool(allowed_headers), bool(allowed_methods), max_age is not None, allow_credentials is True)
+        options_method = _cors_options_methods.get(key)
+        if options_method is None:
+            options_method = _cors_options_methods[key] = self._build_options_method_response_for_cors(  # type: ignore[no-untyped-call]
+                allowed_origins, allowed_headers, allowed_methods, max_age, allow_credentials
+            )
+
+        options_method = options_method.clone()
+        response_parameters = options_method[self._X_APIGW_INTEGRATION]["responses"]["default"]["responseParameters"]
+        # The headers are already in the snippet, setting their values does not change the order of the keys
+        response_parameters[self._make_response_header_key("Access-Control-Allow-Origin")] = allowed_origins
+        if allowed_headers:
+            response_parameters[self._make_response_header_key("Access-Control-Allow-Headers")] = allowed_headers
+        if allowed_methods:
+            response_parameters[self._make_response_header_key("Access-Control-Allow-Methods")] = allowed_methods
+        if max_age is not None:
+            response_parameters[self._make_response_header_key("Access-Control-Max-Age")] = max_age
+        return options_method
+
+    def _build_options_method_response_for_cors(  # type: ignore[no-untyped-def]
+        self, allowed_origins, allowed_headers=None, allowed_methods=None, max_age=None, allow_credentials=None
+    ):
+        """
+        Builds the Swagger snippet containing configuration for OPTIONS HTTP Method to configure CORS.
+
         This snippet is taken from public documentation:
         https://docs.aws.amazon.com/apigateway/latest/developerguide/how-to-cors.html#enable-cors-for-resource-using-swagger-importer-tool
 
@@ -520,7 +583,7 @@ class SwaggerEditor(BaseEditor):
         if "api_key" not in self.security_definitions:
             self.security_definitions.update(api_key_security_definition)
 
-    def set_path_default_authorizer(  # noqa: PLR0912
+    def set_path_default_authorizer(
         self,
         path: str,
         default_authorizer: str,
@@ -540,31 +603,45 @@ class SwaggerEditor(BaseEditor):
         :param bool add_default_auth_to_preflight: Bool of whether to add the default
             authorizer to OPTIONS preflight requests.
         """
+        rule = self.get_default_authorizer_rule(default_authorizer, authorizers, add_default_auth_to_preflight)
+        self.apply_security_rules([rule], [path])
 
-        for method_name, method_definition in self.iter_on_all_methods_for_path(path):  # type: ignore[no-untyped-call]
+    def get_default_authorizer_rule(
+        self,
+        default_authorizer: str,
+        authorizers: Dict[str, ApiGatewayAuthorizer],
+        add_default_auth_to_preflight: bool = True,
+    ) -> SecurityRule:
+        """
+        Returns the security rule adding the default_authorizer to the security block of a method unless an
+        Authorizer was defined at the Function/Path/Method level, see set_path_default_authorizer().
+
+        :param string default_authorizer: Name of the authorizer to use as the default. Must be a key in the
+            authorizers param.
+        :param list authorizers: List of Authorizer configurations defined on the related Api.
+        :param bool add_default_auth_to_preflight: Bool of whether to add the default
+            authorizer to OPTIONS preflight requests.
+        """
+        authorizer_list = ["AWS_IAM"]
+        if authorizers:
+            authorizer_list.extend(authorizers.keys())
+        authorizer_names = set(authorizer_list)
+
+        # Shared by all the methods using the default authorizer
+        default_security_dict = Py27Dict()
+        default_security_dict[default_authorizer] = self._get_authorization_scopes(authorizers, default_authorizer)
+
+        def set_default_authorizer(path: str, method_name: str, method_definition: Dict[str, Any]) -> None:
             if not (add_default_auth_to_preflight or method_name != "options"):
-                continue
+                return
 
-            authorizer_list = ["AWS_IAM"]
-            if authorizers:
-                authorizer_list.extend(authorizers.keys())
-            authorizer_names = set(authorizer_list)
             existing_non_authorizer_security = []
             existing_authorizer_security = []
 
             # Split existing security into Authorizers and everything else
             # (e.g. sigv4 (AWS_IAM), api_key (API Key/Usage Plans), NONE (marker for ignoring default))
             # We want to ensure only a single Authorizer security entry exists while keeping everything else
-            existing_security = method_definition.get("security", [])
-            if not isinstance(existing_security, list):
-                raise InvalidDocumentException(
-                    [InvalidTemplateException(f"Type of security for path {path} method {method_name} must be a list")]
-                )
-            for security in existing_security:
-                SwaggerEditor.validate_is_dict(
-                    security,
-                    f"{security} in Security for path {path} method {method_name} is not a valid dictionary.",
-                )
+            for security in self._get_existing_security(path, method_name, method_definition):
                 if authorizer_names.isdisjoint(security.keys()):
                     existing_non_authorizer_security.append(security)
                 else:
@@ -595,9 +672,7 @@ class SwaggerEditor(BaseEditor):
 
             # No existing Authorizer found; use default
             else:
-                security_dict = Py27Dict()
-                security_dict[default_authorizer] = self._get_authorization_scopes(authorizers, default_authorizer)
-                authorizer_security = [security_dict]
+                authorizer_security = [default_security_dict]
 
             security = existing_non_authorizer_security + authorizer_security
 
@@ -609,6 +684,8 @@ class SwaggerEditor(BaseEditor):
                 if "AWS_IAM" in method_definition["security"][0]:
                     self.add_awsiam_security_definition()
 
+        return set_default_authorizer
+
     def set_path_default_apikey_required(self, path: str, required_options_api_key: bool = True) -> None:
         """
         Add the ApiKey security as required for each method on this path unless ApiKeyRequired
@@ -620,9 +697,23 @@ class SwaggerEditor(BaseEditor):
         :param bool required_options_api_key: Bool of whether to add the ApiKeyRequired
          to OPTIONS preflight requests.
         """
+        self.apply_security_rules([self.get_default_apikey_required_rule(required_options_api_key)], [path])
+
+    def get_default_apikey_required_rule(self, required_options_api_key: bool = True) -> SecurityRule:
+        """
+        Returns the security rule adding the ApiKey security as required to a method unless ApiKeyRequired was
+        defined at the Function/Path/Method level, see set_path_default_apikey_required().
 
-        for method_name, method_definition in self.iter_on_all_methods_for_path(path):  # type: ignore[no-untyped-call]
-            apikey_security_names = {"api_key", "api_key_false"}
+        :param bool required_options_api_key: Bool of whether to add the ApiKeyRequired
+         to OPTIONS preflight requests.
+        """
+        apikey_security_names = {"api_key", "api_key_false"}
+
+        # Shared by all the methods requiring the ApiKey by default
+        default_security_dict = Py27Dict()
+        default_security_dict["api_key"] = []
+
+        def set_default_apikey_required(path: str, method_name: str, method_definition: Dict[str, Any]) -> None:
             existing_non_apikey_security = []
             existing_apikey_security = []
             apikey_security = []
@@ -630,16 +721,8 @@ class SwaggerEditor(BaseEditor):
             # Split existing security into ApiKey and everything else
             # (e.g. sigv4 (AWS_IAM), authorizers, NONE (marker for ignoring default authorizer))
             # We want to ensure only a single ApiKey security entry exists while keeping everything else
-            existing_security = method_definition.get("security", [])
-            if not isinstance(existing_security, list):
-                raise InvalidDocumentException(
-                    [InvalidTemplateException(f"Type of security for path {path} method {method_name} must be a list")]
-                )
+            existing_security = self._get_existing_security(path, method_name, method_definition)
             for security in existing_security:
-                SwaggerEditor.validate_is_dict(
-                    security,
-                    f"{security} in Security for path {path} method {method_name} is not a valid dictionary.",
-                )
                 if apikey_security_names.isdisjoint(security.keys()):
                     existing_non_apikey_security.append(security)
                 else:
@@ -664,9 +747,7 @@ class SwaggerEditor(BaseEditor):
 
             # No existing ApiKey setting found or it's already set to the default
             else:
-                security_dict = Py27Dict()
-                security_dict["api_key"] = []
-                apikey_security = [security_dict]
+                apikey_security = [default_security_dict]
 
             security = existing_non_apikey_security + apikey_security
 
@@ -676,6 +757,29 @@ class SwaggerEditor(BaseEditor):
             if security != existing_security:
                 method_definition["security"] = security
 
+        return set_default_apikey_required
+
+    @staticmethod
+    def _get_existing_security(path: str, method_name: str, method_definition: Dict[str, Any]) -> List[Any]:
+        """
+        Returns the security of a method, validating that it is a list of dictionaries
+
+        :param path: Path name
+        :param method_name: Method name
+        :param method_definition: Method definition
+        """
+        existing_security = method_definition.get("security", [])
+        if not isinstance(existing_security, list):
+            raise InvalidDocumentException(
+                [InvalidTemplateException(f"Type of security for path {path} method {method_name} must be a list")]
+            )
+        for security in existing_security:
+            SwaggerEditor.validate_is_dict(
+                security,
+                f"{security} in Security for path {path} method {method_name} is not a valid dictionary.",
+            )
+        return existing_security
+
     def add_auth_to_method(self, path: str, method_name: str, auth: Dict[str, Any], api: Dict[str, Any]) -> None:
         """
         Adds auth settings for this path/method. Auth settings currently consist of Authorizers and ApiKeyRequired
@@ -880,11 +984,30 @@ class SwaggerEditor(BaseEditor):
 
             self.definitions[model_name.lower()] = schema
 
+    @staticmethod
+    @contextmanager
+    def aggregate_resource_policies(aggregate: bool = True) -> Iterator[None]:
+        """
+        Context manager making the resource policies added in this context aggregate their statements. Instead of
+        having statements for every path, the statements generated for a path are merged into the statement of the
+        resource policy which only differs from them by its resources, so that the resource policy has a single
+        statement per effect, principal and condition.
+
+        :param aggregate: Whether to aggregate the statements of the resource policies
+        """
+        token = _aggregate_resource_policies.set(aggregate)
+        try:
+            yield
+        finally:
+            _aggregate_resource_policies.reset(token)
+
     def add_resource_policy(self, resource_policy: Optional[Dict[str, Any]], path: str, stage: PassThrough) -> None:
         """
         Add resource policy definition to Swagger.
 
         :param dict resource_policy: Dictionary of resource_policy statements which gets translated
+        :param path: Path whose methods the statements apply to
+        :param stage: Stage of the API
         """
         if resource_policy is None:
             return
@@ -989,7 +1112,9 @@ class SwaggerEditor(BaseEditor):
         policy_statement["Resource"] = resource_list
         policy_statement["Principal"] = Py27Dict({"AWS": policy_list})
 
-        if self.resource_policy.get("Statement") is None:
+        if _aggregate_resource_policies.get():
+            self._add_aggregated_statements([policy_statement])
+        elif self.resource_policy.get("Statement") is None:
             self.resource_policy["Statement"] = policy_statement
         else:
             statement = self.resource_policy["Statement"]
@@ -1005,9 +1130,9 @@ class SwaggerEditor(BaseEditor):
         The regex removes the trailing slash to ensure the permission works as intended
         """
         methods = []
-        for path_item in self.get_conditional_contents(self.paths.get(path)):
+        for path_item, path_item_methods in self._get_indexed_path(path).methods:
             BaseEditor.validate_path_item_is_dict(path_item, path)
-            methods += list(path_item.keys())
+            methods += list(path_item_methods)
 
         uri_list = []
         path = SwaggerEditor.get_path_without_trailing_slash(path)  # type: ignore[no-untyped-call]
@@ -1053,7 +1178,9 @@ class SwaggerEditor(BaseEditor):
         deny_statement["Principal"] = "*"
         deny_statement["Condition"] = {conditional: {"aws:SourceIp": ip_list}}
 
-        if self.resource_policy.get("Statement") is None:
+        if _aggregate_resource_policies.get():
+            self._add_aggregated_statements([allow_statement, deny_statement])
+        elif self.resource_policy.get("Statement") is None:
             self.resource_policy["Statement"] = [allow_statement, deny_statement]
         else:
             statement = self.resource_policy["Statement"]
@@ -1121,7 +1248,9 @@ class SwaggerEditor(BaseEditor):
         deny_statement["Principal"] = "*"
         deny_statement["Condition"] = {conditional: condition}
 
-        if self.resource_policy.get("Statement") is None:
+        if _aggregate_resource_policies.get():
+            self._add_aggregated_statements([allow_statement, deny_statement])
+        elif self.resource_policy.get("Statement") is None:
             self.resource_policy["Statement"] = [allow_statement, deny_statement]
         else:
             statement = self.resource_policy["Statement"]
@@ -1133,6 +1262,55 @@ class SwaggerEditor(BaseEditor):
                 statement.extend([deny_statement])
             self.resource_policy["Statement"] = statement
 
+    def _add_aggregated_statements(self, statements: List[Dict[str, Any]]) -> None:
+        """
+        Adds the statements to the resource policy, merging the resources of each statement into the statement of
+        the resource policy which only differs from it by its resources, if there is one.
+
+        :param statements: Statements to add, generated for the methods of a path
+        """
+        policy_statements = self.resource_policy.get("Statement")
+        if not isinstance(policy_statements, list):
+            policy_statements = [] if policy_statements is None else [policy_statements]
+            self.resource_policy["Statement"] = policy_statements
+
+        aggregated_statements = self._get_aggregated_statements(policy_statements)
+        for statement in statements:
+            key = _canonical({name: value for name, value in statement.items() if name != "Resource"})
+            aggregated_statement = aggregated_statements.get(key)
+            if aggregated_statement is None:
+                resources, statement["Resource"] = statement["Resource"], []
+                aggregated_statement = aggregated_statements[key] = _AggregatedStatement(statement, True)
+                policy_statements.append(statement)
+                self._indexed_statement_count += 1
+            else:
+                resources = statement["Resource"]
+            aggregated_statement.add_resources(resources)
+
+    def _get_aggregated_statements(self, policy_statements: List[Any]) -> Dict[str, _AggregatedStatement]:
+        """
+        Returns the statements of the resource policy which statements can be merged into, by everything but their
+        resources. Statements added to the resource policy since the last call are indexed first.
+
+        :param policy_statements: Statements of the resource policy
+        """
+        if policy_statements is not self._indexed_statements:
+            self._aggregated_statements = {}
+            self._indexed_statements = policy_statements
+            self._indexed_statement_count = 0
+
+        for statement in policy_statements[self._indexed_statement_count :]:
+            if (
+                isinstance(statement, dict)
+                and isinstance(statement.get("Resource"), list)
+                and _AGGREGATABLE_STATEMENT_KEYS.issuperset(statement)
+            ):
+                key = _canonical({name: value for name, value in statement.items() if name != "Resource"})
+                if key not in self._aggregated_statements:
+                    self._aggregated_statements[key] = _AggregatedStatement(statement, False)
+        self._indexed_statement_count = len(policy_statements)
+        return self._aggregated_statements
+
     def _add_custom_statement(self, custom_statements):  # type: ignore[no-untyped-def]
         if custom_statements is None:
             return
@@ -1,5 +1,7 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import lru_cache
-from typing import Optional
+from typing import Iterator, Optional
 
 import boto3
 
@@ -13,7 +15,12 @@ def _get_region_from_session() -> str:
     return boto3.session.Session().region_name
 
 
-@lru_cache(maxsize=1)  # Only need to cache one as once deployed, it is not gonna deal with another region.
+# Region of the boto3 session given to the running translation. Every thread (and asyncio task) has its own value,
+# so that translations for different regions can run concurrently in one process.
+_boto_session_region_name: ContextVar[Optional[str]] = ContextVar("boto_session_region_name", default=None)
+
+
+@lru_cache(maxsize=None)  # Translations for different regions can run in the same process, there are few regions.
 def _region_to_partition(region: str) -> str:
     # setting default partition to aws, this will be overwritten by checking the region below
     region_string = region.lower()
@@ -33,8 +40,31 @@ def _region_to_partition(region: str) -> str:
 
 
 class ArnGenerator:
+    # Process wide region, used when the running translation has not been given a boto3 session.
     BOTO_SESSION_REGION_NAME: Optional[str] = None
 
+    @classmethod
+    @contextmanager
+    def boto_session_region(cls, region_name: Optional[str]) -> Iterator[None]:
+        """
+        Context manager setting the region of the boto3 session used by the translation running in this context.
+
+        :param region_name: Name of the region, None to fall back to BOTO_SESSION_REGION_NAME
+        """
+        token = _boto_session_region_name.set(region_name)
+        try:
+            yield
+        finally:
+            _boto_session_region_name.reset(token)
+
+    @classmethod
+    def get_boto_session_region_name(cls) -> Optional[str]:
+        """
+        :return: Region of the boto3 session of the running translation, BOTO_SESSION_REGION_NAME if it has none
+        """
+        region_name = _boto_session_region_name.get()
+        return region_name if region_name is not None else cls.BOTO_SESSION_REGION_NAME
+
     @classmethod
     def generate_arn(
         cls,
@@ -114,11 +144,8 @@ class ArnGenerator:
             # Use Boto3 to get the region where code is running. This uses Boto's regular region resolution
             # mechanism, starting from AWS_DEFAULT_REGION environment variable.
 
-            region = (
-                _get_region_from_session()
-                if ArnGenerator.BOTO_SESSION_REGION_NAME is None
-                else ArnGenerator.BOTO_SESSION_REGION_NAME
-            )
+            boto_session_region_name = ArnGenerator.get_boto_session_region_name()
+            region = _get_region_from_session() if boto_session_region_name is None else boto_session_region_name
 
         # If region is still None, then we could not find the region. This will only happen
         # in the local context. When this is deployed, we will be able to find the region like
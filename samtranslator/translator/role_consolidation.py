@@ -0,0 +1,138 @@
+"""
+Consolidation of the execution roles generated for functions with identical permissions
+"""
+
+import copy
+import json
+import re
+from typing import Any, Collection, Dict, List, Optional, Set
+
+_ROLE_TYPE = "AWS::IAM::Role"
+_FUNCTION_TYPE = "AWS::Lambda::Function"
+# Tag of the roles generated by SAM, the roles of the template itself are never consolidated
+_SAM_ROLE_TAG = {"Key": "lambda:createdBy", "Value": "SAM"}
+# Replaces the logical id of a role in the names of its inline policies, which are named after it
+_ROLE_PLACEHOLDER = "${Role}"
+_NUM_ARGUMENTS_IN_GETATT = 2
+# Variables of a Fn::Sub string, e.g. MyFunction in ${MyFunction.Arn}
+_SUB_VARIABLE = re.compile(r"\$\{([^}!.]+)")
+
+
+def consolidate_function_roles(template: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Replaces the execution roles generated for functions which are identical, once all the event sources have added
+    their policies, by a single role per set of identical roles. The functions are pointed at the shared role, which
+    keeps the logical id of the first of the roles in the template, so that it is not replaced on update, and the
+    logical ids of the functions do not change.
+
+    Only the roles generated by SAM and only referenced by the Role of one function are consolidated, roles
+    referenced by other resources, outputs or DependsOn are left as they are, so that no permission is broadened.
+
+    :param template: translated template, modified in place
+    :return: logical ids of the shared roles, mapped to the logical ids of the roles they replace
+    """
+    resources = template.get("Resources")
+    if not isinstance(resources, dict):
+        return {}
+
+    function_by_role = _get_consolidable_roles(template, resources)
+    shared_role_by_fingerprint: Dict[str, str] = {}
+    replaced_roles: Dict[str, List[str]] = {}
+    for role_id, function_id in function_by_role.items():
+        fingerprint = _fingerprint(role_id, resources[role_id])
+        shared_role_id = shared_role_by_fingerprint.setdefault(fingerprint, role_id)
+        if shared_role_id == role_id:
+            continue
+        resources[function_id]["Properties"]["Role"] = {"Fn::GetAtt": [shared_role_id, "Arn"]}
+        del resources[role_id]
+        replaced_roles.setdefault(shared_role_id, []).append(role_id)
+    return replaced_roles
+
+
+def _get_consolidable_roles(template: Dict[str, Any], resources: Dict[str, Any]) -> Dict[str, str]:
+    """Returns the logical ids of the roles which can be consolidated, mapped to the one of their function"""
+    role_ids = {
+        logical_id
+        for logical_id, resource in resources.items()
+        if isinstance(resource, dict) and resource.get("Type") == _ROLE_TYPE and _is_generated_by_sam(resource)
+    }
+    if not role_ids:
+        return {}
+
+    function_by_role: Dict[str, Optional[str]] = {}
+    for logical_id, resource in resources.items():
+        if not isinstance(resource, dict):
+            continue
+        role_id = _get_role_of_function(resource, role_ids)
+        if role_id is not None:
+            # A role used by several functions is not consolidated
+            function_by_role[role_id] = logical_id if role_id not in function_by_role else None
+            # The other references of the function to its role are looked for below
+            resource = {**resource, "Properties": {**resource["Properties"], "Role": None}}  # noqa: PLW2901
+        for referenced_id in _get_referenced_logical_ids(resource, role_ids) - {logical_id}:
+            function_by_role[referenced_id] = None
+    for referenced_id in _get_referenced_logical_ids(template.get("Outputs"), role_ids):
+        function_by_role[referenced_id] = None
+
+    return {role_id: function_id for role_id, function_id in function_by_role.items() if function_id is not None}
+
+
+def _is_generated_by_sam(role: Dict[str, Any]) -> bool:
+    properties = role.get("Properties")
+    tags = properties.get("Tags") if isinstance(properties, dict) else None
+    return isinstance(tags, list) and _SAM_ROLE_TAG in tags
+
+
+def _get_role_of_function(resource: Dict[str, Any], role_ids: Set[str]) -> Optional[str]:
+    """Returns the logical id of the role of a function, if it is one of the given roles"""
+    properties = resource.get("Properties")
+    if resource.get("Type") != _FUNCTION_TYPE or not isinstance(properties, dict):
+        return None
+    role = properties.get("Role")
+    get_att = role.get("Fn::GetAtt") if isinstance(role, dict) and len(role) == 1 else None
+    if (
+        isinstance(get_att, list)
+        and len(get_att) == _NUM_ARGUMENTS_IN_GETATT
+        and get_att[1] == "Arn"
+        and get_att[0] in role_ids
+    ):
+        return str(get_att[0])
+    return None
+
+
+def _fingerprint(role_id: str, role: Dict[str, Any]) -> str:
+    """
+    Returns the fingerprint of a role: all of its properties and attributes, with the names of its inline policies
+    made independent of its logical id.
+    """
+    role = copy.deepcopy(role)
+    policies = role.get("Properties", {}).get("Policies")
+    for policy in policies if isinstance(policies, list) else []:
+        name = policy.get("PolicyName") if isinstance(policy, dict) else None
+        if isinstance(name, str) and name.startswith(role_id):
+            policy["PolicyName"] = _ROLE_PLACEHOLDER + name[len(role_id) :]
+    return json.dumps(role, sort_keys=True)
+
+
+def _get_referenced_logical_ids(value: Any, logical_ids: Collection[str]) -> Set[str]:
+    """
+    Returns the logical ids referenced in the value: with Ref, Fn::GetAtt, Fn::Sub or DependsOn, and the ones used
+    as plain strings, like the API ids of API events and the resource ids of connectors.
+
+    :param value: resource, or any part of it
+    :param logical_ids: logical ids of the resources of the template
+    """
+    referenced: Set[str] = set()
+    values = [value]
+    while values:
+        current = values.pop()
+        if isinstance(current, dict):
+            values.extend(current.values())
+        elif isinstance(current, list):
+            values.extend(current)
+        elif isinstance(current, str):
+            # A logical id, or the short form of Fn::GetAtt, e.g. MyFunction.Arn
+            referenced.add(current.split(".", 1)[0])
+            if "${" in current:
+                referenced.update(_SUB_VARIABLE.findall(current))
+    return referenced.intersection(logical_ids)
@@ -0,0 +1,557 @@
+"""
+Size analysis of translated templates, and splitting of the templates over the CloudFormation limits into nested stacks
+"""
+
+import copy
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Limits of a CloudFormation template (uploaded to S3)
+MAX_RESOURCES = 500
+MAX_TEMPLATE_BYTES = 1_000_000
+MAX_PARAMETERS = 200
+MAX_OUTPUTS = 200
+
+NESTED_STACK_TYPE = "AWS::CloudFormation::Stack"
+_TEMPLATE_FORMAT_VERSION = "2010-09-09"
+
+# Pseudo parameters whose value is different in a nested stack, their value is passed by the parent stack
+_STACK_PSEUDO_PARAMETERS = {"AWS::StackName": "ParentStackName", "AWS::StackId": "ParentStackId"}
+
+# Variables of a Fn::Sub string, ${!Literal} are not variables
+_SUB_VARIABLE = re.compile(r"\$\{([^!}][^}]*)\}")
+_NON_ALPHANUMERIC = re.compile(r"[^A-Za-z0-9]")
+
+
+def _serialized_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+def analyze_template_size(template: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Measures a translated template against the CloudFormation limits.
+
+    :param template: CloudFormation template
+    :return: resource count, serialized size in bytes (without whitespace), size of every resource (largest first),
+        size by resource type and whether the template exceeds the limits
+    """
+    resources: Dict[str, Any] = template.get("Resources") or {}
+    resource_sizes: List[Dict[str, Any]] = [
+        {"logical_id": logical_id, "type": resource.get("Type"), "bytes": _serialized_size({logical_id: resource})}
+        for logical_id, resource in resources.items()
+    ]
+    resource_sizes.sort(key=lambda size: -int(size["bytes"]))
+    bytes_by_type: Dict[str, int] = {}
+    for size in resource_sizes:
+        bytes_by_type[str(size["type"])] = bytes_by_type.get(str(size["type"]), 0) + size["bytes"]
+    types_by_size = sorted(bytes_by_type, key=lambda resource_type: -bytes_by_type[resource_type])
+    template_bytes = _serialized_size(template)
+    return {
+        "resource_count": len(resources),
+        "template_bytes": template_bytes,
+        "resources": resource_sizes,
+        "bytes_by_type": {resource_type: bytes_by_type[resource_type] for resource_type in types_by_size},
+        "exceeds_resource_limit": len(resources) > MAX_RESOURCES,
+        "exceeds_size_limit": template_bytes > MAX_TEMPLATE_BYTES,
+    }
+
+
+def split_template(
+    template: Dict[str, Any],
+    max_resources: int = MAX_RESOURCES,
+    max_bytes: int = MAX_TEMPLATE_BYTES,
+    template_url: Optional[Callable[[str], str]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Splits the resources of a translated template into nested stacks, see StackSplitter.
+
+    :param template: CloudFormation template, it is not modified
+    :param max_resources: maximum number of resources of every nested stack
+    :param max_bytes: maximum serialized size of the resources of every nested stack
+    :param template_url: function returning the TemplateURL of a nested stack from its logical id, defaults to
+        "<logical id>.json", a local file that `aws cloudformation package` uploads
+    :return: parent template, and template of every nested stack by logical id
+    :raises ValueError: if a nested stack has more parameters or outputs than CloudFormation allows
+    """
+    return StackSplitter(template, max_resources, max_bytes, template_url).split()
+
+
+class StackSplitter:
+    """
+    Splits the resources of a translated template into nested stacks, all of them in the resources of the parent
+    template.
+
+    Resources referencing each other (with Ref, Fn::GetAtt, Fn::Sub or DependsOn) are kept in the same nested stack
+    when they fit in it. Otherwise, they are split in the order of their dependencies, so that nested stacks only
+    reference earlier nested stacks: the referenced values are outputs of the nested stack of the resource, passed
+    as parameters to the nested stacks using them. Every nested stack gets the parameters, mappings and conditions
+    it uses, the parent template keeps the parameters, conditions and outputs of the template.
+
+    The outputs of resources with a condition have the condition too, the parent stack only passes them when the
+    condition is true, otherwise the parameters keep an empty default value.
+    """
+
+    def __init__(
+        self,
+        template: Dict[str, Any],
+        max_resources: int = MAX_RESOURCES,
+        max_bytes: int = MAX_TEMPLATE_BYTES,
+        template_url: Optional[Callable[[str], str]] = None,
+    ) -> None:
+        if max_resources < 1:
+            raise ValueError("Nested stacks need at least one resource.")
+        self.template = copy.deepcopy(template)
+        self.resources: Dict[str, Any] = self.template.get("Resources") or {}
+        self.parameters: Dict[str, Any] = self.template.get("Parameters") or {}
+        self.conditions: Dict[str, Any] = self.template.get("Conditions") or {}
+        self.max_resources = max_resources
+        self.max_bytes = max_bytes
+        self.template_url = template_url or (lambda logical_id: f"{logical_id}.json")
+        # Stack of every resource, and names of the outputs of the values referenced across stacks
+        self._stack_of: Dict[str, str] = {}
+        self._output_names: Dict[Tuple[str, Optional[str]], str] = {}
+
+    def split(self) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        stacks = self._partition()
+        stack_ids = self._stack_logical_ids(len(stacks))
+        for stack_id, logical_ids in zip(stack_ids, stacks):
+            for logical_id in logical_ids:
+                self._stack_of[logical_id] = stack_id
+
+        children: Dict[str, Dict[str, Any]] = {}
+        stack_resources: Dict[str, Any] = {}
+        exported: Dict[str, Dict[str, Any]] = {stack_id: {} for stack_id in stack_ids}
+        for stack_id, logical_ids in zip(stack_ids, stacks):
+            child, parameters, depends_on = self._child_template(stack_id, logical_ids, exported)
+            children[stack_id] = child
+            stack_resource: Dict[str, Any] = {
+                "Type": NESTED_STACK_TYPE,
+                "Properties": {"TemplateURL": self.template_url(stack_id)},
+            }
+            if parameters:
+                stack_resource["Properties"]["Parameters"] = parameters
+            if depends_on:
+                stack_resource["DependsOn"] = sorted(depends_on)
+            stack_resources[stack_id] = stack_resource
+
+        parent = {key: value for key, value in self.template.items() if key != "Resources"}
+        parent["Resources"] = stack_resources
+        if "Outputs" in parent:
+            parent["Outputs"] = self._rewrite(parent["Outputs"], None, exported)
+
+        for stack_id, outputs in exported.items():
+            if outputs:
+                children[stack_id]["Outputs"] = {**outputs, **children[stack_id].get("Outputs", {})}
+        for stack_id, child in children.items():
+            self._check_limits(stack_id, child)
+        return parent, children
+
+    @staticmethod
+    def _check_limits(stack_id: str, child: Dict[str, Any]) -> None:
+        for section, limit in (("Parameters", MAX_PARAMETERS), ("Outputs", MAX_OUTPUTS)):
+            count = len(child.get(section, {}))
+            if count > limit:
+                raise ValueError(
+                    f"Nested stack {stack_id} has {count} {section.lower()}, more than the {limit} CloudFormation "
+                    "allows. The resources referencing each other across nested stacks need larger nested stacks."
+                )
+
+    def _partition(self) -> List[List[str]]:
+        """Returns the logical ids of the resources of every nested stack"""
+        logical_ids = list(self.resources)
+        dependencies = {logical_id: self._dependencies(self.resources[logical_id]) for logical_id in logical_ids}
+
+        # Resources connected by references, in the order of the template
+        component_of = {logical_id: logical_id for logical_id in logical_ids}
+
+        def find(logical_id: str) -> str:
+            while component_of[logical_id] != logical_id:
+                component_of[logical_id] = component_of[component_of[logical_id]]
+                logical_id = component_of[logical_id]
+            return logical_id
+
+        for logical_id, referenced in dependencies.items():
+            for other in referenced:
+                component_of[find(other)] = find(logical_id)
+        components: Dict[str, List[str]] = {}
+        for logical_id in logical_ids:
+            components.setdefault(find(logical_id), []).append(logical_id)
+
+        sizes = {logical_id: _serialized_size({logical_id: self.resources[logical_id]}) for logical_id in logical_ids}
+        stacks: List[List[str]] = []
+        stack_bytes = 0
+
+        def fits(count: int, size: int) -> bool:
+            return (
+                bool(stacks) and len(stacks[-1]) + count <= self.max_resources and stack_bytes + size <= self.max_bytes
+            )
+
+        for component in components.values():
+            component_bytes = sum(sizes[logical_id] for logical_id in component)
+            if not fits(len(component), component_bytes) and (
+                len(component) <= self.max_resources and component_bytes <= self.max_bytes
+            ):
+                stacks.append([])
+                stack_bytes = 0
+            if fits(len(component), component_bytes):
+                stacks[-1].extend(component)
+                stack_bytes += component_bytes
+                continue
+            # Too large for a nested stack, the resources are split after the ones they reference
+            for logical_id in self._dependency_order(component, dependencies):
+                if not fits(1, sizes[logical_id]):
+                    stacks.append([])
+                    stack_bytes = 0
+                stacks[-1].append(logical_id)
+                stack_bytes += sizes[logical_id]
+        return stacks
+
+    @staticmethod
+    def _dependency_order(component: List[str], dependencies: Dict[str, Set[str]]) -> List[str]:
+        """Returns the resources after the resources they reference, otherwise in the order of the template"""
+        ordered: List[str] = []
+        visited: Set[str] = set()
+        for logical_id in component:
+            if logical_id in visited:
+                continue
+            stack = [(logical_id, iter(sorted(dependencies[logical_id])))]
+            visited.add(logical_id)
+            while stack:
+                current, remaining = stack[-1]
+                referenced = next((other for other in remaining if other not in visited), None)
+                if referenced is None:
+                    stack.pop()
+                    ordered.append(current)
+                else:
+                    visited.add(referenced)
+                    stack.append((referenced, iter(sorted(dependencies[referenced]))))
+            # Resources are visited once, whatever the cycles
+        return ordered
+
+    def _stack_logical_ids(self, count: int) -> List[str]:
+        stack_ids: List[str] = []
+        index = 0
+        while len(stack_ids) < count:
+            index += 1
+            stack_id = f"NestedStack{index}"
+            if stack_id not in self.resources and stack_id not in self.parameters:
+                stack_ids.append(stack_id)
+        return stack_ids
+
+    def _dependencies(self, value: Any) -> Set[str]:
+        referenced: Set[str] = set()
+
+        def collect(logical_id: str, attribute: Optional[str]) -> None:
+            referenced.add(logical_id)
+
+        self._visit_references(copy.deepcopy(value), collect)
+        depends_on = value.get("DependsOn") if isinstance(value, dict) else None
+        for logical_id in [depends_on] if isinstance(depends_on, str) else depends_on or []:
+            if logical_id in self.resources:
+                referenced.add(logical_id)
+        return referenced
+
+    def _child_template(
+        self, stack_id: str, logical_ids: List[str], exported: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Set[str]]:
+        """Returns the template of a nested stack, its parameters and the nested stacks it depends on"""
+        stack_parameters: Dict[str, Any] = {}
+        depends_on: Set[str] = set()
+        resources: Dict[str, Any] = {}
+        for logical_id in logical_ids:
+            resource = self._rewrite(self.resources[logical_id], stack_id, exported, stack_parameters)
+            depends_on_value = resource.get("DependsOn")
+            if depends_on_value is not None:
+                local, other_stacks = self._split_depends_on(depends_on_value, stack_id)
+                depends_on.update(other_stacks)
+                if local:
+                    resource["DependsOn"] = local
+                else:
+                    del resource["DependsOn"]
+            resources[logical_id] = resource
+        for parameter in stack_parameters.values():
+            output = self._output_reference(parameter)
+            if output is not None:
+                depends_on.add(output[0])
+
+        # Conditions use the pseudo parameters of the parent stack too
+        conditions = {
+            name: self._rewrite(self.conditions[name], stack_id, exported) for name in self._used_conditions(resources)
+        }
+        child_parameters = self._child_parameters(
+            self._used_parameters([resources, list(conditions.values())]), stack_parameters
+        )
+
+        child: Dict[str, Any] = {"AWSTemplateFormatVersion": _TEMPLATE_FORMAT_VERSION}
+        if child_parameters:
+            child["Parameters"] = child_parameters
+        if "Mappings" in self.template and self._uses_mappings([resources, conditions]):
+            child["Mappings"] = self.template["Mappings"]
+        if conditions:
+            child["Conditions"] = conditions
+        child["Resources"] = resources
+        return child, stack_parameters, depends_on - {stack_id}
+
+    def _child_parameters(self, used_parameters: Set[str], stack_parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the parameters of a nested stack, adding the values of the used parameters to the stack parameters"""
+        child_parameters: Dict[str, Any] = {}
+        for name in sorted(used_parameters):
+            if name in _STACK_PSEUDO_PARAMETERS.values():
+                child_parameters[name] = {"Type": "String"}
+                stack_parameters[name] = {"Ref": next(k for k, v in _STACK_PSEUDO_PARAMETERS.items() if v == name)}
+            elif name in self.parameters:
+                definition, value = self._passed_parameter(name)
+                child_parameters[name] = definition
+                stack_parameters[name] = value
+        for name, value in stack_parameters.items():
+            if "Fn::If" in value:
+                # Not passed when the referenced resource is not created
+                child_parameters.setdefault(name, {"Type": "String", "Default": ""})
+            else:
+                child_parameters.setdefault(name, {"Type": "String"})
+        return child_parameters
+
+    def _split_depends_on(self, depends_on: Any, stack_id: str) -> Tuple[List[str], Set[str]]:
+        local: List[str] = []
+        other_stacks: Set[str] = set()
+        for logical_id in [depends_on] if isinstance(depends_on, str) else depends_on:
+            other_stack = self._stack_of.get(logical_id)
+            if other_stack is None or other_stack == stack_id:
+                local.append(logical_id)
+            else:
+                other_stacks.add(other_stack)
+        return local, other_stacks
+
+    def _passed_parameter(self, name: str) -> Tuple[Dict[str, Any], Any]:
+        """Returns the definition of a parameter of the template in a nested stack, and the value passed to it"""
+        definition = {key: value for key, value in self.parameters[name].items() if key != "Default"}
+        parameter_type = str(definition.get("Type", "String"))
+        # Values of SSM parameters are resolved by the parent stack
+        if parameter_type.startswith("AWS::SSM::Parameter::Value<"):
+            is_list = parameter_type.startswith("AWS::SSM::Parameter::Value<List<") or "CommaDelimitedList" in (
+                parameter_type
+            )
+            parameter_type = "CommaDelimitedList" if is_list else "String"
+            definition["Type"] = parameter_type
+            definition.pop("AllowedValues", None)
+            definition.pop("AllowedPattern", None)
+        # Nested stack parameters are strings, lists are passed joined
+        if parameter_type == "CommaDelimitedList" or parameter_type.startswith("List<"):
+            return definition, {"Fn::Join": [",", {"Ref": name}]}
+        return definition, {"Ref": name}
+
+    def _used_conditions(self, resources: Dict[str, Any]) -> List[str]:
+        used: Set[str] = set()
+        values: List[Any] = [resources]
+        while values:
+            value = values.pop()
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    if key == "Condition" and isinstance(item, str):
+                        used.add(item)
+                    elif key == "Fn::If" and isinstance(item, list) and item and isinstance(item[0], str):
+                        used.add(item[0])
+                    values.append(item)
+            elif isinstance(value, list):
+                values.extend(value)
+        # Conditions referencing other conditions
+        pending = [name for name in used if name in self.conditions]
+        while pending:
+            name = pending.pop()
+            for referenced in self._used_conditions_of(self.conditions[name]):
+                if referenced not in used and referenced in self.conditions:
+                    used.add(referenced)
+                    pending.append(referenced)
+        return [name for name in self.conditions if name in used]
+
+    @staticmethod
+    def _used_conditions_of(condition: Any) -> Set[str]:
+        used: Set[str] = set()
+        values = [condition]
+        while values:
+            value = values.pop()
+            if isinstance(value, dict):
+                if isinstance(value.get("Condition"), str):
+                    used.add(value["Condition"])
+                values.extend(value.values())
+            elif isinstance(value, list):
+                values.extend(value)
+        return used
+
+    def _used_parameters(self, value: Any) -> Set[str]:
+        """Returns the parameters (and pseudo parameters passed by the parent stack) the value references"""
+        known = set(self.parameters) | set(_STACK_PSEUDO_PARAMETERS.values())
+        used: Set[str] = set()
+        values = [value]
+        while values:
+            current = values.pop()
+            if isinstance(current, dict):
+                ref = current.get("Ref")
+                if len(current) == 1 and isinstance(ref, str) and ref in known:
+                    used.add(ref)
+                sub = current.get("Fn::Sub")
+                sub_string = sub[0] if isinstance(sub, list) and sub else sub
+                if len(current) == 1 and isinstance(sub_string, str):
+                    used.update(name for name in _SUB_VARIABLE.findall(sub_string) if name in known)
+                values.extend(current.values())
+            elif isinstance(current, list):
+                values.extend(current)
+        return used
+
+    @staticmethod
+    def _uses_mappings(value: Any) -> bool:
+        return "Fn::FindInMap" in json.dumps(value)
+
+    def _rewrite(
+        self,
+        value: Any,
+        stack_id: Optional[str],
+        exported: Dict[str, Dict[str, Any]],
+        stack_parameters: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Returns a copy of the value, with the references to the resources of other nested stacks replaced by the
+        parameters passed by the parent stack (or, in the parent stack, by the outputs of the nested stacks), and the
+        pseudo parameters of the parent stack replaced by parameters.
+        """
+
+        def replace(logical_id: str, attribute: Optional[str]) -> Optional[Dict[str, Any]]:
+            other_stack = self._stack_of.get(logical_id)
+            if other_stack is None or other_stack == stack_id:
+                return None
+            name = self._output_name(logical_id, attribute)
+            condition = self.resources[logical_id].get("Condition")
+            if name not in exported[other_stack]:
+                output: Dict[str, Any] = {
+                    "Value": {"Ref": logical_id} if attribute is None else {"Fn::GetAtt": [logical_id, attribute]}
+                }
+                if condition is not None:
+                    output["Condition"] = condition
+                exported[other_stack][name] = output
+            value: Dict[str, Any] = {"Fn::GetAtt": [other_stack, f"Outputs.{name}"]}
+            if condition is not None:
+                # The output only exists when the resource is created
+                value = {"Fn::If": [condition, value, {"Ref": "AWS::NoValue"}]}
+            if stack_parameters is None:
+                return value
+            stack_parameters[name] = value
+            return {"Ref": name}
+
+        def replace_pseudo_parameter(name: str) -> Optional[Dict[str, Any]]:
+            if stack_id is None or name not in _STACK_PSEUDO_PARAMETERS:
+                return None
+            return {"Ref": _STACK_PSEUDO_PARAMETERS[name]}
+
+        return self._visit_references(copy.deepcopy(value), replace, replace_pseudo_parameter)
+
+    @staticmethod
+    def _output_reference(value: Any) -> Optional[List[str]]:
+        """Returns the Fn::GetAtt arguments of a reference to the output of a nested stack, None for other values"""
+        if isinstance(value, dict) and "Fn::If" in value:
+            value = value["Fn::If"][1]
+        if isinstance(value, dict) and "Fn::GetAtt" in value:
+            return list(value["Fn::GetAtt"])
+        return None
+
+    def _output_name(self, logical_id: str, attribute: Optional[str]) -> str:
+        key = (logical_id, attribute)
+        if key not in self._output_names:
+            base = logical_id if attribute is None else logical_id + _NON_ALPHANUMERIC.sub("", attribute)
+            name = base
+            # Parameters of the nested stacks, which cannot have the name of a parameter or resource of the template,
+            # except the resource it references
+            taken = set(self.parameters) | set(self.resources) | set(self._output_names.values())
+            taken.update(_STACK_PSEUDO_PARAMETERS.values())
+            if attribute is None:
+                taken.discard(logical_id)
+            index = 1
+            while name in taken:
+                index += 1
+                name = f"{base}{index}"
+            self._output_names[key] = name
+        return self._output_names[key]
+
+    def _visit_references(  # noqa: PLR0911
+        self,
+        value: Any,
+        replace: Callable[[str, Optional[str]], Optional[Dict[str, Any]]],
+        replace_pseudo_parameter: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+    ) -> Any:
+        """
+        Calls replace(logical_id, attribute) for every reference to a resource of the template in the value (Ref,
+        Fn::GetAtt and Fn::Sub variables), and replaces the reference with the returned intrinsic function when it is
+        not None. Same with replace_pseudo_parameter(name) for the Ref to pseudo parameters.
+
+        :return: the value, modified in place
+        """
+        if isinstance(value, list):
+            value[:] = [self._visit_references(item, replace, replace_pseudo_parameter) for item in value]
+            return value
+        if not isinstance(value, dict):
+            return value
+        if len(value) == 1:
+            ((function, arguments),) = value.items()
+            if function == "Ref" and isinstance(arguments, str):
+                if arguments in self.resources:
+                    return replace(arguments, None) or value
+                if replace_pseudo_parameter is not None:
+                    return replace_pseudo_parameter(arguments) or value
+                return value
+            if function == "Fn::GetAtt":
+                target = self._get_att_target(arguments)
+                if target is not None:
+                    return replace(*target) or value
+            if function == "Fn::Sub":
+                return self._visit_sub(arguments, replace, replace_pseudo_parameter)
+        for key in value:
+            value[key] = self._visit_references(value[key], replace, replace_pseudo_parameter)
+        return value
+
+    def _get_att_target(self, arguments: Any) -> Optional[Tuple[str, str]]:
+        if isinstance(arguments, str) and "." in arguments:
+            logical_id, attribute = arguments.split(".", 1)
+        elif isinstance(arguments, list) and len(arguments) == 2:  # noqa: PLR2004
+            logical_id, attribute = arguments
+        else:
+            return None
+        if isinstance(logical_id, str) and isinstance(attribute, str) and logical_id in self.resources:
+            return logical_id, attribute
+        return None
+
+    def _visit_sub(
+        self,
+        arguments: Any,
+        replace: Callable[[str, Optional[str]], Optional[Dict[str, Any]]],
+        replace_pseudo_parameter: Optional[Callable[[str], Optional[Dict[str, Any]]]],
+    ) -> Dict[str, Any]:
+        if isinstance(arguments, list) and len(arguments) == 2 and isinstance(arguments[1], dict):  # noqa: PLR2004
+            string, variables = arguments[0], self._visit_references(arguments[1], replace, replace_pseudo_parameter)
+        else:
+            string, variables = arguments, {}
+        if not isinstance(string, str):
+            return {"Fn::Sub": arguments}
+
+        new_variables: Dict[str, Any] = {}
+
+        def replace_variable(match: "re.Match[str]") -> str:
+            name = match.group(1)
+            if name in variables:
+                return match.group(0)
+            logical_id, _, attribute = name.partition(".")
+            replacement = None
+            if logical_id in self.resources:
+                replacement = replace(logical_id, attribute or None)
+            elif not attribute and replace_pseudo_parameter is not None:
+                replacement = replace_pseudo_parameter(name)
+            if replacement is None:
+                return match.group(0)
+            # Replaced by a variable named like the parameter or output it references
+            output = self._output_reference(replacement)
+            variable = str(replacement["Ref"] if output is None else output[1].split(".", 1)[1])
+            new_variables[variable] = replacement
+            return "${" + variable + "}"
+
+        string = _SUB_VARIABLE.sub(replace_variable, string)
+        variables = {**variables, **new_variables}
+        return {"Fn::Sub": [string, variables] if variables else string}
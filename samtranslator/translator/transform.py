@@ -1,24 +1,37 @@
+from concurrent.futures import Executor
 from functools import lru_cache
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from samtranslator.feature_toggle.feature_toggle import FeatureToggle
 from samtranslator.parser.parser import Parser
+from samtranslator.policy_template_processor.processor import PolicyTemplatesProcessor
 from samtranslator.translator.managed_policy_translator import ManagedPolicyLoader
 from samtranslator.translator.translator import Translator
 from samtranslator.utils.py27hash_fix import to_py27_compatible_template, undo_mark_unicode_str_in_template
 
 
-def transform(
+def transform(  # noqa: PLR0913
     input_fragment: Dict[str, Any],
     parameter_values: Dict[str, Any],
     managed_policy_loader: ManagedPolicyLoader,
     feature_toggle: Optional[FeatureToggle] = None,
     passthrough_metadata: Optional[bool] = False,
+    policy_templates_processor: Optional[PolicyTemplatesProcessor] = None,
+    prune_static_conditions: bool = False,
+    share_function_roles: bool = False,
+    aggregate_resource_policies: bool = False,
 ) -> Dict[str, Any]:
     """Translates the SAM manifest provided in the and returns the translation to CloudFormation.
 
     :param dict input_fragment: the SAM template to transform
     :param dict parameter_values: Parameter values provided by the user
+    :param policy_templates_processor: Optional policy templates processor shared between transforms
+    :param prune_static_conditions: Whether to remove the resources and Fn::If branches disabled by conditions only
+        depending on the given parameter values, see Translator
+    :param share_function_roles: Whether to share a single execution role between the functions whose generated
+        roles are identical, see Translator
+    :param aggregate_resource_policies: Whether to merge the statements of the API resource policies which only differ
+        by their resources, see Translator
     :returns: the transformed CloudFormation template
     :rtype: dict
     """
@@ -28,6 +41,10 @@ def transform(
     translator = Translator(
         None,
         sam_parser,
+        policy_templates_processor=policy_templates_processor,
+        prune_static_conditions=prune_static_conditions,
+        share_function_roles=share_function_roles,
+        aggregate_resource_policies=aggregate_resource_policies,
     )
 
     @lru_cache(maxsize=None)
@@ -42,3 +59,58 @@ def transform(
         get_managed_policy_map=get_managed_policy_map,
     )
     return undo_mark_unicode_str_in_template(transformed)
+
+
+async def transform_async(  # noqa: PLR0913
+    input_fragment: Dict[str, Any],
+    parameter_values: Dict[str, Any],
+    managed_policy_loader: ManagedPolicyLoader,
+    feature_toggle: Optional[FeatureToggle] = None,
+    passthrough_metadata: Optional[bool] = False,
+    policy_templates_processor: Optional[PolicyTemplatesProcessor] = None,
+    create_feature_toggle: Optional[Callable[[], FeatureToggle]] = None,
+    executor: Optional[Executor] = None,
+    prune_static_conditions: bool = False,
+    share_function_roles: bool = False,
+    aggregate_resource_policies: bool = False,
+) -> Dict[str, Any]:
+    """Same as transform(), for asyncio applications. The calls to AWS services made by the transform run
+    concurrently on the executor, see Translator.translate_async().
+
+    :param create_feature_toggle: Optional function creating the feature toggle when feature_toggle is not given
+    :param executor: Executor to run the calls to AWS services on, defaults to the one of the event loop
+    :param prune_static_conditions: Whether to remove the resources and Fn::If branches disabled by conditions only
+        depending on the given parameter values, see Translator
+    :param share_function_roles: Whether to share a single execution role between the functions whose generated
+        roles are identical, see Translator
+    :param aggregate_resource_policies: Whether to merge the statements of the API resource policies which only differ
+        by their resources, see Translator
+    :returns: the transformed CloudFormation template
+    :rtype: dict
+    """
+
+    sam_parser = Parser()
+    to_py27_compatible_template(input_fragment, parameter_values)
+    translator = Translator(
+        None,
+        sam_parser,
+        policy_templates_processor=policy_templates_processor,
+        prune_static_conditions=prune_static_conditions,
+        share_function_roles=share_function_roles,
+        aggregate_resource_policies=aggregate_resource_policies,
+    )
+
+    @lru_cache(maxsize=None)
+    def get_managed_policy_map() -> Dict[str, str]:
+        return managed_policy_loader.load()
+
+    transformed = await translator.translate_async(
+        input_fragment,
+        parameter_values=parameter_values,
+        feature_toggle=feature_toggle,
+        passthrough_metadata=passthrough_metadata,
+        get_managed_policy_map=get_managed_policy_map,
+        create_feature_toggle=create_feature_toggle,
+        executor=executor,
+    )
+    return undo_mark_unicode_str_in_template(transformed)
@@ -1,5 +1,7 @@
+import asyncio
 import copy
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 from boto3 import Session
 
@@ -7,12 +9,15 @@ from samtranslator.feature_toggle.feature_toggle import (
     FeatureToggle,
     FeatureToggleDefaultConfigProvider,
 )
+from samtranslator.internal.managed_policies import get_bundled_managed_policy_map
 from samtranslator.internal.types import GetManagedPolicyMap
 from samtranslator.intrinsics.actions import FindInMapAction
+from samtranslator.intrinsics.conditions import StaticConditionEvaluator
 from samtranslator.intrinsics.resolver import IntrinsicsResolver
 from samtranslator.intrinsics.resource_refs import SupportedResourceReferences
 from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton
 from samtranslator.metrics.metrics import DummyMetricsPublisher, Metrics
+from samtranslator.metrics.tracing import start_span
 from samtranslator.model import Resource, ResourceResolver, ResourceTypeResolver, sam_resources
 from samtranslator.model.api.api_generator import SharedApiUsagePlan
 from samtranslator.model.eventsources.push import Api
@@ -25,7 +30,7 @@ from samtranslator.model.exceptions import (
     InvalidTemplateException,
 )
 from samtranslator.model.preferences.deployment_preference_collection import DeploymentPreferenceCollection
-from samtranslator.model.sam_resources import SamConnector
+from samtranslator.model.sam_resources import SamConnector, SamFunction, SamStateMachine
 from samtranslator.parser.parser import Parser
 from samtranslator.plugins import BasePlugin, LifeCycleEvents
 from samtranslator.plugins.api.default_definition_body_plugin import DefaultDefinitionBodyPlugin
@@ -35,39 +40,69 @@ from samtranslator.plugins.policies.policy_templates_plugin import PolicyTemplat
 from samtranslator.plugins.sam_plugins import SamPlugins
 from samtranslator.policy_template_processor.processor import PolicyTemplatesProcessor
 from samtranslator.sdk.parameter import SamParameterValues
+from samtranslator.swagger.swagger import SwaggerEditor
 from samtranslator.translator.arn_generator import ArnGenerator
+from samtranslator.translator.role_consolidation import consolidate_function_roles
 from samtranslator.translator.verify_logical_id import verify_unique_logical_id
 from samtranslator.utils.actions import ResolveDependsOn
+from samtranslator.utils.concurrency import run_in_executor
 from samtranslator.utils.traverse import traverse
 from samtranslator.validator.value_validator import sam_expect
 
+# Types of the resources with a Policies property, which may have names of managed policies
+POLICIES_RESOURCE_TYPES = (SamFunction.resource_type, SamStateMachine.resource_type)
+
 
 class Translator:
     """Translates SAM templates into CloudFormation templates"""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         managed_policy_map: Optional[Dict[str, str]],
         sam_parser: Parser,
         plugins: Optional[List[BasePlugin]] = None,
         boto_session: Optional[Session] = None,
         metrics: Optional[Metrics] = None,
+        policy_templates_processor: Optional[PolicyTemplatesProcessor] = None,
+        prune_static_conditions: bool = False,
+        share_function_roles: bool = False,
+        aggregate_resource_policies: bool = False,
     ) -> None:
         """
         :param dict managed_policy_map: Map of managed policy names to the ARNs
         :param sam_parser: Instance of a SAM Parser
         :param list of samtranslator.plugins.BasePlugin plugins: List of plugins to be installed in the translator,
             in addition to the default ones.
+        :param policy_templates_processor: Optional processor of the policy templates. Loading and validating the
+            default policy templates is expensive, long running processes can load them once and share the processor
+            between translations. Defaults to a new processor of the default policy templates for every translation.
+        :param prune_static_conditions: Whether to evaluate the conditions only depending on the parameter values
+            given to the translation, and remove the resources and Fn::If branches they disable, before and after
+            translating the resources. The default values of the template parameters and the pseudo parameters of the
+            boto3 session are not used, they can differ from the ones of the stack. Defaults to keeping all of them
+            for CloudFormation to evaluate.
+        :param share_function_roles: Whether to replace the execution roles generated for functions which end up
+            identical by a single role shared by these functions, see consolidate_function_roles(). Defaults to one
+            role per function.
+        :param aggregate_resource_policies: Whether to merge the statements of the resource policies generated for
+            the paths of an API which only differ by their resources, see SwaggerEditor.aggregate_resource_policies().
+            Defaults to statements for every path.
         """
         self.managed_policy_map = managed_policy_map
         self.plugins = plugins
+        self.policy_templates_processor = policy_templates_processor
+        self.prune_static_conditions = prune_static_conditions
+        self.share_function_roles = share_function_roles
+        self.aggregate_resource_policies = aggregate_resource_policies
         self.sam_parser = sam_parser
         self.feature_toggle: Optional[FeatureToggle] = None
         self.boto_session = boto_session
         self.metrics = metrics if metrics else Metrics("ServerlessTransform", DummyMetricsPublisher())
-        MetricsMethodWrapperSingleton.set_instance(self.metrics)
         self.document_errors: List[ExceptionWithMessage] = []
 
+        # Process wide fallbacks for the code using ArnGenerator or cw_timer outside translate(), which sets both
+        # in the context of the translation
+        MetricsMethodWrapperSingleton.set_instance(self.metrics)
         if self.boto_session:
             ArnGenerator.BOTO_SESSION_REGION_NAME = self.boto_session.region_name
 
@@ -102,7 +137,7 @@ class Translator:
                     self.function_names[api_name] += str(resolved_function_name)
         return self.function_names
 
-    def translate(  # noqa: PLR0912, PLR0915
+    def translate(
         self,
         sam_template: Dict[str, Any],
         parameter_values: Dict[str, Any],
@@ -113,6 +148,10 @@ class Translator:
         """Loads the SAM resources from the given SAM manifest, replaces them with their corresponding
         CloudFormation resources, and returns the resulting CloudFormation template.
 
+        The metrics and the region of the boto3 session are kept in the context of the translation, so that
+        translations can run concurrently on multiple threads.
+        When a tracer is set with samtranslator.metrics.tracing.use_tracer(), the steps of the translation are traced.
+
         :param dict sam_template: the SAM manifest, as loaded by json.load() or yaml.load(), or as provided by \
                 CloudFormation transforms.
         :param dict parameter_values: Map of template parameter names to their values. It is a required parameter that
@@ -124,19 +163,164 @@ class Translator:
         :returns: a copy of the template with SAM resources replaced with the corresponding CloudFormation, which may \
                 be dumped into a valid CloudFormation JSON or YAML template
         """
+        region_name = self.boto_session.region_name if self.boto_session else None
+        with MetricsMethodWrapperSingleton.instance_for_context(self.metrics), ArnGenerator.boto_session_region(
+            region_name
+        ), SwaggerEditor.aggregate_resource_policies(self.aggregate_resource_policies), start_span(
+            "Translator.translate", {"region": region_name}
+        ):
+            given_parameter_values = dict(parameter_values)
+            parameter_values = self._get_parameter_values(sam_template, parameter_values, self.boto_session)
+            # Create & Install plugins
+            sam_plugins = prepare_plugins(self.plugins, parameter_values, self.policy_templates_processor)
+            return self._translate(
+                sam_template,
+                parameter_values,
+                sam_plugins,
+                feature_toggle,
+                passthrough_metadata,
+                get_managed_policy_map,
+                given_parameter_values,
+            )
+
+    async def translate_async(  # noqa: PLR0913
+        self,
+        sam_template: Dict[str, Any],
+        parameter_values: Dict[str, Any],
+        feature_toggle: Optional[FeatureToggle] = None,
+        passthrough_metadata: Optional[bool] = False,
+        get_managed_policy_map: Optional[GetManagedPolicyMap] = None,
+        create_feature_toggle: Optional[Callable[[], FeatureToggle]] = None,
+        executor: Optional[Executor] = None,
+    ) -> Dict[str, Any]:
+        """Same as translate(), for asyncio applications.
+
+        The blocking lookups of the translation are started concurrently on the executor, instead of one after the
+        other in the middle of the translation: the boto3 session and region, the feature toggle config (when
+        created with create_feature_toggle), the managed policies of get_managed_policy_map (when the template has
+        managed policy names that are not known without it) and the applications of the Serverless Application
+        Repository. The translation itself runs on the executor too, once their results are available, so that it
+        does not block the event loop. Their errors are raised at the same point of the translation as with
+        translate().
+
+        :param create_feature_toggle: Optional function creating the feature toggle when feature_toggle is not given,
+                for example loading its config from AppConfig. It runs on the executor.
+        :param executor: Executor to run the blocking lookups and the translation on, defaults to the one of the
+                event loop
+
+        See translate() for the other parameters and the return value.
+        """
+        with MetricsMethodWrapperSingleton.instance_for_context(
+            self.metrics
+        ), SwaggerEditor.aggregate_resource_policies(self.aggregate_resource_policies), start_span(
+            "Translator.translate_async"
+        ) as span:
+            boto_session = self.boto_session
+            if boto_session is None:
+                boto_session = await run_in_executor(executor, Session)
+            if span is not None and boto_session.region_name is not None:
+                span.set_attribute("region", boto_session.region_name)
+            with ArnGenerator.boto_session_region(boto_session.region_name):
+                given_parameter_values = dict(parameter_values)
+                parameter_values = self._get_parameter_values(sam_template, parameter_values, boto_session)
+
+                # The applications are requested by the ServerlessAppPlugin that prepare_plugins() would add
+                plugins = list(self.plugins or [])
+                app_plugin = next((plugin for plugin in plugins if isinstance(plugin, ServerlessAppPlugin)), None)
+                if app_plugin is None:
+                    app_plugin = ServerlessAppPlugin(parameters=parameter_values)
+                    plugins.append(app_plugin)
+                sam_plugins = prepare_plugins(plugins, parameter_values, self.policy_templates_processor)
+
+                async def load_feature_toggle() -> Optional[FeatureToggle]:
+                    if feature_toggle is not None or create_feature_toggle is None:
+                        return feature_toggle
+                    return await run_in_executor(executor, create_feature_toggle)
+
+                async def load_managed_policy_map() -> Optional[GetManagedPolicyMap]:
+                    if get_managed_policy_map is None or not self._may_need_managed_policy_map(sam_template):
+                        return get_managed_policy_map
+                    future: asyncio.Future[Dict[str, str]] = asyncio.ensure_future(
+                        run_in_executor(executor, get_managed_policy_map)
+                    )
+                    await asyncio.wait([future])
+                    # Errors are raised by future.result(), when the translation needs the managed policies
+                    return future.result
+
+                loaded_feature_toggle, loaded_get_managed_policy_map, _ = await asyncio.gather(
+                    load_feature_toggle(),
+                    load_managed_policy_map(),
+                    app_plugin.prefetch_applications(sam_template, executor),
+                )
+                return await run_in_executor(
+                    executor,
+                    self._translate,
+                    sam_template,
+                    parameter_values,
+                    sam_plugins,
+                    loaded_feature_toggle,
+                    passthrough_metadata,
+                    loaded_get_managed_policy_map,
+                    given_parameter_values,
+                )
+
+    @staticmethod
+    def _get_parameter_values(
+        sam_template: Dict[str, Any], parameter_values: Dict[str, Any], boto_session: Optional[Session]
+    ) -> Dict[str, Any]:
+        sam_parameter_values = SamParameterValues(parameter_values)
+        sam_parameter_values.add_default_parameter_values(sam_template)
+        sam_parameter_values.add_pseudo_parameter_values(boto_session)
+        return sam_parameter_values.parameter_values
+
+    def _may_need_managed_policy_map(self, sam_template: Dict[str, Any]) -> bool:
+        """
+        Returns whether the template has managed policy names which are neither in the given managed policy map
+        nor in the bundled one, so that get_managed_policy_map() is called to get their ARNs.
+        Names given with intrinsic functions are not checked.
+
+        :param dict sam_template: SAM template
+        """
+        resources = sam_template.get("Resources")
+        if not isinstance(resources, dict):
+            return False
+        known_policies = {
+            **(get_bundled_managed_policy_map(ArnGenerator.get_partition_name()) or {}),
+            **(self.managed_policy_map or {}),
+        }
+        for resource in resources.values():
+            if not isinstance(resource, dict) or resource.get("Type") not in POLICIES_RESOURCE_TYPES:
+                continue
+            properties = resource.get("Properties")
+            policies = properties.get("Policies") if isinstance(properties, dict) else None
+            for policy in policies if isinstance(policies, list) else [policies]:
+                if isinstance(policy, str) and not policy.startswith("arn:") and policy not in known_policies:
+                    return True
+        return False
+
+    def _translate(  # noqa: PLR0912, PLR0913, PLR0915
+        self,
+        sam_template: Dict[str, Any],
+        parameter_values: Dict[str, Any],
+        sam_plugins: SamPlugins,
+        feature_toggle: Optional[FeatureToggle],
+        passthrough_metadata: Optional[bool],
+        get_managed_policy_map: Optional[GetManagedPolicyMap],
+        given_parameter_values: Dict[str, Any],
+    ) -> Dict[str, Any]:
         self.feature_toggle = feature_toggle or FeatureToggle(
             FeatureToggleDefaultConfigProvider(), stage=None, account_id=None, region=None
         )
         self.function_names: Dict[Any, Any] = {}
         self.redeploy_restapi_parameters = {}
-        sam_parameter_values = SamParameterValues(parameter_values)
-        sam_parameter_values.add_default_parameter_values(sam_template)
-        sam_parameter_values.add_pseudo_parameter_values(self.boto_session)
-        parameter_values = sam_parameter_values.parameter_values
-        # Create & Install plugins
-        sam_plugins = prepare_plugins(self.plugins, parameter_values)
 
         self.sam_parser.parse(sam_template=sam_template, parameter_values=parameter_values, sam_plugins=sam_plugins)
+        if self.prune_static_conditions:
+            # Resources whose condition is statically false are not translated at all
+            with start_span("Translator.prune_static_conditions"):
+                StaticConditionEvaluator(sam_template.get("Conditions"), given_parameter_values).prune_template(
+                    sam_template
+                )
 
         # replaces Connectors attributes with serverless Connector resources
         resources = sam_template.get("Resources", {})
@@ -163,10 +347,12 @@ class Translator:
         changed_logical_ids = {}
         route53_record_set_groups: Dict[Any, Any] = {}
         for logical_id, resource_dict in self._get_resources_to_iterate(sam_template, macro_resolver):
+            span_attributes = {"logical_id": logical_id, "resource_type": resource_dict.get("Type")}
             try:
-                macro = macro_resolver.resolve_resource_type(resource_dict).from_dict(
-                    logical_id, resource_dict, sam_plugins=sam_plugins
-                )
+                with start_span("Resource.from_dict", span_attributes):
+                    macro = macro_resolver.resolve_resource_type(resource_dict).from_dict(
+                        logical_id, resource_dict, sam_plugins=sam_plugins
+                    )
 
                 kwargs = macro.resources_to_link(sam_template["Resources"])
                 kwargs["managed_policy_map"] = self.managed_policy_map
@@ -185,7 +371,8 @@ class Translator:
                 kwargs["shared_api_usage_plan"] = shared_api_usage_plan
                 kwargs["feature_toggle"] = self.feature_toggle
                 kwargs["route53_record_set_groups"] = route53_record_set_groups
-                translated = macro.to_cloudformation(**kwargs)
+                with start_span("Resource.to_cloudformation", span_attributes):
+                    translated = macro.to_cloudformation(**kwargs)
                 supported_resource_refs = macro.get_resource_references(translated, supported_resource_refs)
 
                 # Some resources mutate their logical ids. Track those to change all references to them:
@@ -240,10 +427,21 @@ class Translator:
             del template["Transform"]
 
         if len(self.document_errors) == 0:
-            resolveDependsOn = ResolveDependsOn(resolution_data=changed_logical_ids)  # Initializes ResolveDependsOn
-            template = traverse(template, [resolveDependsOn])
-            template = intrinsics_resolver.resolve_sam_resource_id_refs(template, changed_logical_ids)
-            return intrinsics_resolver.resolve_sam_resource_refs(template, supported_resource_refs)
+            with start_span("Translator.resolve_references"):
+                resolveDependsOn = ResolveDependsOn(resolution_data=changed_logical_ids)  # Initializes ResolveDependsOn
+                template = traverse(template, [resolveDependsOn])
+                template = intrinsics_resolver.resolve_sam_resource_id_refs(template, changed_logical_ids)
+                template = intrinsics_resolver.resolve_sam_resource_refs(template, supported_resource_refs)
+            if self.prune_static_conditions:
+                # Conditions added by the translation, e.g. of deployment preferences, are known after it
+                with start_span("Translator.prune_static_conditions"):
+                    StaticConditionEvaluator(template.get("Conditions"), given_parameter_values).prune_template(
+                        template
+                    )
+            if self.share_function_roles:
+                with start_span("Translator.consolidate_function_roles"):
+                    consolidate_function_roles(template)
+            return template
         raise InvalidDocumentException(self.document_errors)
 
     # private methods
@@ -402,13 +600,18 @@ class Translator:
         return SamConnector.from_dict(full_connector_logical_id, connector)
 
 
-def prepare_plugins(plugins: Optional[List[BasePlugin]], parameters: Optional[Dict[str, Any]] = None) -> SamPlugins:
+def prepare_plugins(
+    plugins: Optional[List[BasePlugin]],
+    parameters: Optional[Dict[str, Any]] = None,
+    policy_templates_processor: Optional[PolicyTemplatesProcessor] = None,
+) -> SamPlugins:
     """
     Creates & returns a plugins object with the given list of plugins installed. In addition to the given plugins,
     we will also install a few "required" plugins that are necessary to provide complete support for SAM template spec.
 
     :param plugins: list of samtranslator.plugins.BasePlugin plugins: List of plugins to install
     :param parameters: Dictionary of parameter values
+    :param policy_templates_processor: Optional processor used by the policy templates plugin
     :return samtranslator.plugins.SamPlugins: Instance of `SamPlugins`
     """
 
@@ -419,7 +622,7 @@ def prepare_plugins(plugins: Optional[List[BasePlugin]], parameters: Optional[Di
         make_implicit_rest_api_plugin(),
         make_implicit_http_api_plugin(),
         GlobalsPlugin(),
-        make_policy_template_for_function_plugin(),
+        make_policy_template_for_function_plugin(policy_templates_processor),
     ]
 
     plugins = plugins or []
@@ -452,13 +655,17 @@ def make_implicit_http_api_plugin() -> "ImplicitHttpApiPlugin":
     return ImplicitHttpApiPlugin()
 
 
-def make_policy_template_for_function_plugin() -> PolicyTemplatesForResourcePlugin:
+def make_policy_template_for_function_plugin(
+    policy_templates_processor: Optional[PolicyTemplatesProcessor] = None,
+) -> PolicyTemplatesForResourcePlugin:
     """
     Constructs an instance of policy templates processing plugin using default policy templates JSON data
 
+    :param policy_templates_processor: Optional processor to use instead of one built from the default policy templates
     :return plugins.policies.policy_templates_plugin.PolicyTemplatesForResourcePlugin: Instance of the plugin
     """
 
-    policy_templates = PolicyTemplatesProcessor.get_default_policy_templates_json()
-    processor = PolicyTemplatesProcessor(policy_templates)
-    return PolicyTemplatesForResourcePlugin(processor)
+    if policy_templates_processor is None:
+        policy_templates = PolicyTemplatesProcessor.get_default_policy_templates_json()
+        policy_templates_processor = PolicyTemplatesProcessor(policy_templates)
+    return PolicyTemplatesForResourcePlugin(policy_templates_processor)
@@ -0,0 +1,23 @@
+import asyncio
+import contextvars
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional, TypeVar
+
+_RT = TypeVar("_RT")
+
+
+async def run_in_executor(executor: Optional[Executor], func: Callable[..., _RT], *args: Any) -> _RT:
+    """
+    Runs a blocking function on the executor and waits for its result without blocking the event loop.
+
+    Unlike loop.run_in_executor(), the function runs in a copy of the current context, so that it records its
+    metrics to, and uses the region of, the translation that started it.
+
+    :param executor: Executor to run the function on, None for the default executor of the event loop
+    :param func: Function to run
+    :param args: Arguments of the function
+    :return: Return value of the function
+    """
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, lambda: context.run(func, *args))
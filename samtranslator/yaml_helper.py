@@ -1,3 +1,5 @@
+from typing import IO, Any, Type, Union, cast
+
 import yaml
 from yaml import ScalarNode, SequenceNode
 
@@ -5,10 +7,9 @@ from yaml import ScalarNode, SequenceNode
 # https://github.com/aws/aws-cli/blob/develop/awscli/customizations/cloudformation/yamlhelper.py
 
 
-def yaml_parse(yamlstr):  # type: ignore[no-untyped-def]
+def yaml_parse(yamlstr: Union[str, bytes, IO[str], IO[bytes]]) -> Any:
     """Parse a yaml string"""
-    yaml.SafeLoader.add_multi_constructor("!", intrinsics_multi_constructor)  # type: ignore[no-untyped-call]
-    return yaml.safe_load(yamlstr)
+    return yaml.load(yamlstr, Loader=IntrinsicsSafeLoader)  # noqa: S506
 
 
 def intrinsics_multi_constructor(loader, tag_prefix, node):  # type: ignore[no-untyped-def]
@@ -46,3 +47,32 @@ def intrinsics_multi_constructor(loader, tag_prefix, node):  # type: ignore[no-u
         value = loader.construct_mapping(node)
 
     return {cfntag: value}
+
+
+class PurePythonIntrinsicsSafeLoader(yaml.SafeLoader):
+    """
+    yaml.SafeLoader that also parses CloudFormation intrinsics short forms (ex: !Ref).
+
+    The constructors are registered on this subclass once, instead of for every parse.
+    """
+
+
+PurePythonIntrinsicsSafeLoader.add_multi_constructor("!", intrinsics_multi_constructor)
+
+# yaml_parse used to register the constructors on yaml.SafeLoader, keep registering them for the callers relying on it
+yaml.SafeLoader.add_multi_constructor("!", intrinsics_multi_constructor)
+
+IntrinsicsSafeLoader: Type[yaml.SafeLoader]
+try:
+    # libyaml based loaders are an order of magnitude faster than the pure Python ones,
+    # but they are only available when PyYAML was built with libyaml.
+    from yaml import CSafeLoader
+
+    class LibYamlIntrinsicsSafeLoader(CSafeLoader):
+        """Same as PurePythonIntrinsicsSafeLoader, but parses with libyaml."""
+
+    LibYamlIntrinsicsSafeLoader.add_multi_constructor("!", intrinsics_multi_constructor)
+    # CSafeLoader is not a subclass of SafeLoader, but has the same interface
+    IntrinsicsSafeLoader = cast(Type[yaml.SafeLoader], LibYamlIntrinsicsSafeLoader)
+except ImportError:  # pragma: no cover
+    IntrinsicsSafeLoader = PurePythonIntrinsicsSafeLoader
@@ -0,0 +1,200 @@
+import math
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from samtranslator.translator.transform import transform
+
+from bin._template_generator import TemplateShape, generate_template
+from bin.benchmark_transform import (
+    StubManagedPolicyLoader,
+    benchmark_parse,
+    benchmark_template,
+    compare_results,
+    dominant_resource_type,
+    offline_transform_context,
+    parse_shape,
+    percentile,
+    run_benchmark,
+    run_scaling,
+    scaling_exponent,
+)
+
+
+def _result(p50_ms, peak, resource_type="AWS::Serverless::Function"):
+    return {
+        "summary": {"p50_ms": p50_ms},
+        "tracemalloc_peak_bytes": peak,
+        "dominant_resource_type": resource_type,
+    }
+
+
+class TestBenchmarkHelpers(TestCase):
+    def test_percentile(self):
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.assertEqual(percentile(values, 0), 1.0)
+        self.assertEqual(percentile(values, 50), 3.0)
+        self.assertEqual(percentile(values, 100), 5.0)
+        self.assertAlmostEqual(percentile(values, 90), 4.6)
+        self.assertEqual(percentile([7.0], 99), 7.0)
+        with self.assertRaises(ValueError):
+            percentile([], 50)
+
+    def test_dominant_resource_type(self):
+        template = {
+            "Resources": {
+                "A": {"Type": "AWS::Serverless::Api"},
+                "B": {"Type": "AWS::Serverless::Function"},
+                "C": {"Type": "AWS::Serverless::Function"},
+                "D": "invalid",
+            }
+        }
+        self.assertEqual(dominant_resource_type(template), "AWS::Serverless::Function")
+        self.assertEqual(dominant_resource_type({"Resources": {}}), "None")
+        self.assertEqual(dominant_resource_type([]), "None")
+
+    def test_benchmark_template_collects_every_run(self):
+        calls = []
+
+        def translate(manifest):
+            calls.append(manifest)
+            return "ok"
+
+        result = benchmark_template({"Resources": {}}, runs=3, warmup=2, translate=translate)
+
+        # warmup + timed + traced
+        self.assertEqual(len(calls), 6)
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(len(result["timings_ms"]), 3)
+        self.assertLessEqual(result["summary"]["min_ms"], result["summary"]["p50_ms"])
+        self.assertLessEqual(result["summary"]["p50_ms"], result["summary"]["max_ms"])
+        self.assertGreaterEqual(result["tracemalloc_peak_bytes"], 0)
+
+    def test_benchmark_template_translates_offline(self):
+        template = {
+            "Resources": {
+                "Function": {
+                    "Type": "AWS::Serverless::Function",
+                    "Properties": {"CodeUri": "s3://bucket/key", "Handler": "index.handler", "Runtime": "python3.9"},
+                }
+            }
+        }
+        with offline_transform_context("us-east-1"):
+            result = benchmark_template(template, runs=1, warmup=0)
+        self.assertEqual(result["status"], "ok")
+
+        with offline_transform_context("us-east-1"):
+            result = benchmark_template({"Resources": {"Function": {"Type": "AWS::Serverless::Function"}}}, 1, 0)
+        self.assertEqual(result["status"], "invalid")
+
+    def test_run_benchmark_reports_unparsable_templates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            valid = Path(directory, "valid.yaml")
+            valid.write_text("Resources:\n  Topic:\n    Type: AWS::SNS::Topic\n", encoding="utf-8")
+            unparsable = Path(directory, "unparsable.yaml")
+            unparsable.write_text("Resources: [", encoding="utf-8")
+            missing = Path(directory, "missing.yaml")
+
+            results = run_benchmark([unparsable, missing, valid], runs=1, warmup=0, region="us-east-1")["templates"]
+
+        self.assertEqual(results["unparsable"]["status"], "crash")
+        self.assertEqual(results["unparsable"]["dominant_resource_type"], "None")
+        self.assertTrue(results["missing"]["error"].startswith("FileNotFoundError"))
+        self.assertEqual(results["valid"]["status"], "ok")
+        self.assertEqual(results["valid"]["dominant_resource_type"], "AWS::SNS::Topic")
+
+    def test_stub_policy_loader_does_not_call_iam(self):
+        self.assertEqual(StubManagedPolicyLoader({"Policy": "arn"}).load(), {"Policy": "arn"})
+
+
+class TestCompareResults(TestCase):
+    def test_flags_regressions_above_threshold(self):
+        baseline = {"templates": {"a": _result(10.0, 1000), "b": _result(10.0, 1000, "AWS::Serverless::Api")}}
+        current = {"templates": {"a": _result(10.5, 1000), "b": _result(20.0, 2000, "AWS::Serverless::Api")}}
+
+        comparison = compare_results(baseline, current, threshold_percent=10)
+
+        self.assertEqual(
+            [(r["template"], r["metric"]) for r in comparison["regressions"]],
+            [("b", "p50_ms"), ("b", "tracemalloc_peak_bytes")],
+        )
+        self.assertEqual(list(comparison["groups"]), ["AWS::Serverless::Api", "AWS::Serverless::Function"])
+        self.assertAlmostEqual(comparison["groups"]["AWS::Serverless::Api"]["change_percent"], 100.0)
+        self.assertAlmostEqual(comparison["groups"]["AWS::Serverless::Function"]["change_percent"], 5.0)
+
+    def test_reports_missing_and_added_templates(self):
+        baseline = {"templates": {"a": _result(1.0, 1), "crashed": {"status": "crash"}}}
+        current = {"templates": {"b": _result(1.0, 1), "crashed": {"status": "crash"}}}
+
+        comparison = compare_results(baseline, current, threshold_percent=10)
+
+        self.assertEqual(comparison["regressions"], [])
+        self.assertEqual(comparison["missing"], ["a"])
+        self.assertEqual(comparison["added"], ["b"])
+        self.assertEqual(comparison["groups"], {})
+
+
+class TestScaling(TestCase):
+    def test_parse_shape(self):
+        self.assertEqual(parse_shape(["functions=10", "api_events=2"]), TemplateShape(functions=10, api_events=2))
+        with self.assertRaises(ValueError):
+            parse_shape(["unknown=1"])
+        with self.assertRaises(ValueError):
+            parse_shape(["functions"])
+
+    def test_scaling_exponent(self):
+        self.assertAlmostEqual(scaling_exponent([(1, 2), (10, 20), (100, 200)]), 1.0)
+        self.assertAlmostEqual(scaling_exponent([(1, 1), (10, 100), (100, 10000)]), 2.0)
+        self.assertTrue(math.isnan(scaling_exponent([(1, 1)])))
+        self.assertTrue(math.isnan(scaling_exponent([(10, 1), (10, 2)])))
+
+    def test_generated_template_translates(self):
+        shape = TemplateShape(
+            functions=3,
+            api_events=2,
+            http_api_events=1,
+            sqs_events=1,
+            kinesis_events=1,
+            schedule_events=1,
+            policy_templates=5,
+            connectors=2,
+            state_machines=2,
+            layers=6,
+            applications=1,
+            globals_variables=3,
+        )
+        template = generate_template(shape)
+
+        self.assertEqual(len(template["Resources"]), 3 + 2 * 2 + 2 + 6 + 1)
+        self.assertEqual(len(template["Resources"]["Function0"]["Properties"]["Layers"]), 5)
+
+        with offline_transform_context("us-east-1"):
+            output = transform(template, {}, StubManagedPolicyLoader())
+        self.assertIn("ServerlessRestApi", output["Resources"])
+        self.assertIn("ServerlessHttpApi", output["Resources"])
+        self.assertIn("Connector0Policy", output["Resources"])
+
+    def test_generate_template_requires_a_function(self):
+        with self.assertRaises(ValueError):
+            generate_template(TemplateShape(functions=0))
+
+    def test_run_scaling(self):
+        scaling = run_scaling("api_events", [1, 2], TemplateShape(functions=2), runs=1, warmup=0, region="us-east-1")
+
+        self.assertEqual([point["value"] for point in scaling["points"]], [1, 2])
+        self.assertEqual([point["input_resources"] for point in scaling["points"]], [2, 2])
+        self.assertLess(scaling["points"][0]["output_resources"], scaling["points"][1]["output_resources"])
+        self.assertIn("time_exponent", scaling)
+
+        with self.assertRaises(ValueError):
+            run_scaling("unknown", [1], TemplateShape(), runs=1, warmup=0, region="us-east-1")
+
+
+class TestParseBenchmark(TestCase):
+    def test_benchmark_parse(self):
+        parsing = benchmark_parse({"a": "A: !Ref B", "b": "C: !GetAtt D.Arn"}, runs=2)
+
+        self.assertEqual(parsing["documents"], 2)
+        self.assertEqual(parsing["bytes"], 25)
+        self.assertEqual(set(parsing["pure_python"]), set(parsing["yaml_parse"]))
+        self.assertGreater(parsing["speedup"], 0)
@@ -0,0 +1,164 @@
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+import boto3
+
+from bin.benchmark_transform import STUB_MANAGED_POLICIES, offline_transform_context
+from bin.translate_server import (
+    InvalidRequestError,
+    QueueFullError,
+    TranslationClient,
+    TranslationService,
+    _parse_request,
+    make_server,
+)
+
+TEMPLATE_BODY = """
+Parameters:
+  Alias:
+    Type: String
+Resources:
+  Function:
+    Type: AWS::Serverless::Function
+    Properties:
+      CodeUri: s3://bucket/key
+      Handler: index.handler
+      AutoPublishAlias: !Ref Alias
+      Runtime: python3.11
+      Policies:
+        - AmazonS3ReadOnlyAccess
+        - SQSPollerPolicy:
+            QueueName: queue
+"""
+
+
+def _service(**kwargs):
+    return TranslationService(
+        lambda: STUB_MANAGED_POLICIES, boto_session=boto3.session.Session(region_name="us-east-1"), **kwargs
+    )
+
+
+class TestTranslationService(TestCase):
+    def setUp(self):
+        self.offline = offline_transform_context("us-east-1")
+        self.offline.__enter__()
+
+    def tearDown(self):
+        self.offline.__exit__(None, None, None)
+
+    def test_translate_and_stats(self):
+        service = _service()
+        service.warm_up()
+
+        template, parameters = _parse_request({"template_body": TEMPLATE_BODY, "parameters": {"Alias": "live"}})
+        output = service.translate(template, parameters)
+
+        self.assertIn("FunctionAliaslive", output["Resources"])
+        self.assertIn("FunctionRole", output["Resources"])
+
+        stats = service.stats()
+        self.assertEqual(stats["succeeded"], 1)
+        self.assertEqual(stats["failed"], 0)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertIsNotNone(stats["latency_ms"]["p50"])
+
+    def test_rejects_when_queue_is_full(self):
+        service = _service(max_concurrency=1, max_queue=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_translate(template, parameters):
+            started.set()
+            release.wait(10)
+            return template
+
+        with patch.object(service, "_translate", side_effect=blocking_translate):
+            running = threading.Thread(target=service.translate, args=({}, {}))
+            running.start()
+            started.wait(10)
+            waiting = threading.Thread(target=service.translate, args=({}, {}))
+            waiting.start()
+            while service.stats()["queue_depth"] < 1:
+                pass
+
+            with self.assertRaises(QueueFullError):
+                service.translate({}, {})
+
+            release.set()
+            running.join()
+            waiting.join()
+
+        stats = service.stats()
+        self.assertEqual(stats["succeeded"], 2)
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["max_queue_depth"], 1)
+
+    def test_parse_request_rejects_invalid_payloads(self):
+        for payload in [[], {}, {"template_body": 1}, {"template": {}, "parameters": ["a"]}]:
+            with self.assertRaises(InvalidRequestError):
+                _parse_request(payload)
+
+
+class TestTranslationServer(TestCase):
+    def setUp(self):
+        self.offline = offline_transform_context("us-east-1")
+        self.offline.__enter__()
+        self.service = _service()
+
+    def tearDown(self):
+        self.offline.__exit__(None, None, None)
+
+    def _serve(self, server):
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+    def test_translates_over_tcp(self):
+        server = make_server(self.service, host="127.0.0.1", port=0)
+        self._serve(server)
+        client = TranslationClient(host="127.0.0.1", port=server.server_address[1])
+
+        status, response = client.translate(TEMPLATE_BODY, {"Alias": "live"})
+        self.assertEqual(status, 200)
+        self.assertIn("FunctionRole", response["template"]["Resources"])
+
+        status, response = client.translate("Resources:\n  Function:\n    Type: AWS::Serverless::Function\n")
+        self.assertEqual(status, 400)
+        self.assertTrue(response["errors"])
+
+        status, response = client.translate("Resources: [")
+        self.assertEqual(status, 400)
+
+        stats = client.stats()
+        self.assertEqual(stats["succeeded"], 1)
+        self.assertEqual(stats["failed"], 1)
+
+    def test_translates_over_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            socket_path = Path(directory, "server.sock")
+            server = make_server(self.service, socket_path=socket_path)
+            self._serve(server)
+
+            status, response = TranslationClient(socket_path=socket_path).translate(TEMPLATE_BODY, {"Alias": "prod"})
+            self.assertEqual(status, 200)
+            self.assertIn("FunctionAliasprod", response["template"]["Resources"])
+
+    def test_replaces_only_stale_unix_sockets(self):
+        with tempfile.TemporaryDirectory() as directory:
+            socket_path = Path(directory, "server.sock")
+            make_server(self.service, socket_path=socket_path).server_close()
+            self.assertTrue(socket_path.exists())
+            server = make_server(self.service, socket_path=socket_path)
+            self._serve(server)
+            status, _ = TranslationClient(socket_path=socket_path).translate(TEMPLATE_BODY, {"Alias": "prod"})
+            self.assertEqual(status, 200)
+
+            file_path = Path(directory, "template.yaml")
+            file_path.write_text(TEMPLATE_BODY)
+            with self.assertRaisesRegex(ValueError, "is not a UNIX socket"):
+                make_server(self.service, socket_path=file_path)
+            self.assertEqual(file_path.read_text(), TEMPLATE_BODY)
@@ -1,7 +1,11 @@
+import json
 import os
 import sys
+import tempfile
+import threading
+from pathlib import Path
 from unittest import TestCase
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
 from parameterized import param, parameterized
 from samtranslator.feature_toggle.dialup import DisabledDialup, SimpleAccountPercentileDialup, ToggleDialup
@@ -9,7 +13,10 @@ from samtranslator.feature_toggle.feature_toggle import (
     FeatureToggle,
     FeatureToggleAppConfigConfigProvider,
     FeatureToggleLocalConfigProvider,
+    FeatureToggleRefreshingAppConfigConfigProvider,
 )
+from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton
+from samtranslator.metrics.metrics import DummyMetricsPublisher, Metrics
 
 my_path = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, my_path + "/..")
@@ -59,6 +66,25 @@ class TestFeatureToggle(TestCase):
         dialup = feature_toggle._get_dialup(region_config, "some-feature")
         self.assertIsInstance(dialup, expected_class)
 
+    def test_is_enabled_is_cached_until_config_changes(self):
+        config_provider = FeatureToggleLocalConfigProvider(os.path.join(my_path, "input", "feature_toggle_config.json"))
+        feature_toggle = FeatureToggle(config_provider, stage="beta", region="us-west-2", account_id="123456789123")
+
+        with patch.object(feature_toggle, "_get_dialup", wraps=feature_toggle._get_dialup) as get_dialup:
+            self.assertTrue(feature_toggle.is_enabled("feature-1"))
+            self.assertTrue(feature_toggle.is_enabled("feature-1"))
+            self.assertEqual(get_dialup.call_count, 1)
+
+            feature_toggle.region = "default"
+            self.assertFalse(feature_toggle.is_enabled("feature-1"))
+            self.assertEqual(get_dialup.call_count, 2)
+
+            config_provider.feature_toggle_config = {
+                "feature-1": {"beta": {"default": {"type": "toggle", "enabled": True}}}
+            }
+            self.assertTrue(feature_toggle.is_enabled("feature-1"))
+            self.assertEqual(get_dialup.call_count, 3)
+
 
 class TestFeatureToggleAppConfig(TestCase):
     def setUp(self):
@@ -160,3 +186,121 @@ class TestFeatureToggleAppConfigConfigProvider(TestCase):
             "test_app_id", "test_env_id", "test_conf_id"
         )
         self.assertEqual(feature_toggle_config_provider.config, {})
+
+
+def _app_config_response(config, version):
+    content = Mock()
+    content.read.return_value = json.dumps(config).encode("utf-8") if config is not None else b""
+    return {"Content": content, "ConfigurationVersion": version}
+
+
+class TestFeatureToggleRefreshingAppConfigConfigProvider(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.snapshot_path = Path(directory.name, "feature_toggle_config.json")
+        self.config = {"feature-1": {"beta": {"default": {"type": "toggle", "enabled": True}}}}
+        self.app_config_client = Mock()
+        # The first refresh is made by the background thread, it waits until the test releases it
+        self.first_refresh = threading.Event()
+        self.first_refreshed = threading.Event()
+
+        def get_configuration(**kwargs):
+            self.first_refresh.wait(10)
+            self.app_config_client.get_configuration.side_effect = None
+            self.first_refreshed.set()
+            return _app_config_response(self.config, "1")
+
+        self.app_config_client.get_configuration.side_effect = get_configuration
+
+    def _provider(self, metrics=None):
+        provider = FeatureToggleRefreshingAppConfigConfigProvider(
+            "test_app_id",
+            "test_env_id",
+            "test_conf_id",
+            self.app_config_client,
+            snapshot_path=self.snapshot_path,
+            refresh_interval=3600,
+            metrics=metrics,
+        )
+        self.addCleanup(provider.close)
+        self.addCleanup(self.first_refresh.set)
+        return provider
+
+    def _wait_for_first_refresh(self, provider):
+        self.first_refresh.set()
+        self.first_refreshed.wait(10)
+        while provider.config_version is None:
+            threading.Event().wait(0.01)
+
+    def test_refreshes_in_background_and_saves_snapshot(self):
+        provider = self._provider()
+        self.assertEqual(provider.config, {})
+
+        self._wait_for_first_refresh(provider)
+
+        self.assertEqual(provider.config, self.config)
+        self.assertEqual(json.loads(self.snapshot_path.read_text()), self.config)
+        self.app_config_client.get_configuration.assert_called_once_with(
+            Application="test_app_id",
+            Environment="test_env_id",
+            Configuration="test_conf_id",
+            ClientId=FeatureToggleRefreshingAppConfigConfigProvider.CLIENT_ID,
+        )
+
+    def test_starts_with_snapshot(self):
+        self.snapshot_path.write_text(json.dumps({"feature-2": {}}))
+        provider = self._provider()
+
+        self.assertEqual(provider.config, {"feature-2": {}})
+        feature_toggle = FeatureToggle(provider, stage="beta", region="us-west-2", account_id="123456789123")
+        self.assertFalse(feature_toggle.is_enabled("feature-1"))
+
+        self._wait_for_first_refresh(provider)
+        self.assertTrue(feature_toggle.is_enabled("feature-1"))
+
+    def test_keeps_config_when_unchanged_or_failing(self):
+        provider = self._provider()
+        self._wait_for_first_refresh(provider)
+        config = provider.config
+
+        self.app_config_client.get_configuration.return_value = _app_config_response(None, "1")
+        self.assertFalse(provider.refresh())
+        self.assertEqual(self.app_config_client.get_configuration.call_args.kwargs["ClientConfigurationVersion"], "1")
+
+        self.app_config_client.get_configuration.side_effect = Exception()
+        self.assertFalse(provider.refresh())
+
+        self.app_config_client.get_configuration.side_effect = None
+        self.app_config_client.get_configuration.return_value = _app_config_response(self.config, "2")
+        self.assertTrue(provider.refresh())
+        self.assertEqual(provider.config_version, "2")
+
+        self.assertIs(provider.config, config)
+
+    def test_records_refresh_latency_to_own_metrics(self):
+        process_metrics = Metrics("ServerlessTransform", DummyMetricsPublisher())
+        MetricsMethodWrapperSingleton.set_instance(process_metrics)
+        self.addCleanup(MetricsMethodWrapperSingleton.set_instance, MetricsMethodWrapperSingleton._DUMMY_INSTANCE)
+        metrics = Metrics("ServerlessTransform", DummyMetricsPublisher())
+        provider = self._provider(metrics)
+
+        self._wait_for_first_refresh(provider)
+        self.app_config_client.get_configuration.return_value = _app_config_response(None, "1")
+        provider.refresh()
+        provider.close()
+        provider._thread.join(10)
+
+        self.assertEqual(len(metrics.get_metric("External-AppConfig")), 2)
+        self.assertEqual(process_metrics.get_metric("External-AppConfig"), [])
+
+    @patch("samtranslator.feature_toggle.feature_toggle.boto3")
+    def test_does_not_call_app_config_in_constructor(self, boto3_mock):
+        boto3_mock.client.return_value = self.app_config_client
+        provider = FeatureToggleRefreshingAppConfigConfigProvider("test_app_id", "test_env_id", "test_conf_id")
+        self.addCleanup(provider.close)
+        self.addCleanup(self.first_refresh.set)
+
+        boto3_mock.client.assert_called_once_with("appconfig", config=ANY)
+        self.assertEqual(provider.config, {})
+        self.assertFalse(self.first_refreshed.is_set())
@@ -0,0 +1,189 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from samtranslator.intrinsics.conditions import StaticConditionEvaluator
+from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton
+from samtranslator.translator.transform import transform
+
+from tests.translator.test_translator import get_policy_mock
+
+CONDITIONS = {
+    "IsProd": {"Fn::Equals": [{"Ref": "Env"}, "prod"]},
+    "IsDev": {"Fn::Not": [{"Condition": "IsProd"}]},
+    "IsUsEast1": {"Fn::Equals": [{"Ref": "AWS::Region"}, "us-east-1"]},
+    "IsProdInUsEast1": {"Fn::And": [{"Condition": "IsProd"}, {"Condition": "IsUsEast1"}]},
+    "IsAccount": {"Fn::Equals": [{"Ref": "AWS::AccountId"}, "123456789012"]},
+    "IsProdOrAccount": {"Fn::Or": [{"Condition": "IsProd"}, {"Condition": "IsAccount"}]},
+    "IsDevOrAccount": {"Fn::Or": [{"Condition": "IsDev"}, {"Condition": "IsAccount"}]},
+    "IsDevAndAccount": {"Fn::And": [{"Condition": "IsDev"}, {"Condition": "IsAccount"}]},
+    "IsTrue": {"Fn::Equals": [{"Ref": "Enabled"}, True]},
+    "Loop": {"Fn::Not": [{"Condition": "Loop"}]},
+}
+PARAMETERS = {"Env": "prod", "Enabled": "true", "AWS::Region": "us-east-1"}
+
+
+class TestStaticConditionEvaluator(TestCase):
+    def setUp(self):
+        self.evaluator = StaticConditionEvaluator(CONDITIONS, PARAMETERS)
+
+    def test_evaluate(self):
+        self.assertIs(self.evaluator.evaluate("IsProd"), True)
+        self.assertIs(self.evaluator.evaluate("IsDev"), False)
+        self.assertIs(self.evaluator.evaluate("IsProdInUsEast1"), True)
+        self.assertIs(self.evaluator.evaluate("IsTrue"), True)
+        # Decided by the known argument
+        self.assertIs(self.evaluator.evaluate("IsProdOrAccount"), True)
+        self.assertIs(self.evaluator.evaluate("IsDevAndAccount"), False)
+        # Depend on unknown values
+        self.assertIsNone(self.evaluator.evaluate("IsAccount"))
+        self.assertIsNone(self.evaluator.evaluate("IsDevOrAccount"))
+        self.assertIsNone(self.evaluator.evaluate("Loop"))
+        self.assertIsNone(self.evaluator.evaluate("Unknown"))
+        self.assertIsNone(self.evaluator.evaluate({"Ref": "IsProd"}))
+
+    def test_evaluate_does_not_modify_conditions(self):
+        conditions = {"Condition": {"Fn::Equals": [{"Fn::Join": ["", [{"Ref": "Env"}]]}, "prod"]}}
+
+        self.assertIsNone(StaticConditionEvaluator(conditions, PARAMETERS).evaluate("Condition"))
+        self.assertEqual(conditions["Condition"]["Fn::Equals"][0], {"Fn::Join": ["", [{"Ref": "Env"}]]})
+
+    def test_prune_template(self):
+        template = {
+            "Conditions": CONDITIONS,
+            "Resources": {
+                "Prod": {"Type": "AWS::SNS::Topic", "Condition": "IsProd"},
+                "Dev": {"Type": "AWS::SNS::Topic", "Condition": "IsDev"},
+                "Account": {"Type": "AWS::SNS::Topic", "Condition": "IsAccount"},
+                "Queue": {
+                    "Type": "AWS::SQS::Queue",
+                    "DependsOn": ["Dev", "Prod"],
+                    "Properties": {
+                        "QueueName": {"Fn::If": ["IsDev", "dev", {"Fn::If": ["IsProd", "prod", "other"]}]},
+                        "DelaySeconds": {"Fn::If": ["IsProd", {"Ref": "AWS::NoValue"}, 10]},
+                        "Tags": [
+                            {"Fn::If": ["IsDev", {"Key": "Dev"}, {"Ref": "AWS::NoValue"}]},
+                            {"Fn::If": ["IsAccount", {"Key": "Account"}, {"Ref": "AWS::NoValue"}]},
+                        ],
+                    },
+                },
+                "Other": {"Type": "AWS::SQS::Queue", "DependsOn": "Dev"},
+            },
+            "Outputs": {
+                "Dev": {"Condition": "IsDev", "Value": {"Ref": "Dev"}},
+                "Prod": {"Condition": "IsProd", "Value": {"Ref": "Prod"}},
+            },
+        }
+
+        removed = self.evaluator.prune_template(template)
+
+        self.assertEqual(removed, ["Dev"])
+        self.assertEqual(
+            template["Resources"],
+            {
+                "Prod": {"Type": "AWS::SNS::Topic"},
+                "Account": {"Type": "AWS::SNS::Topic", "Condition": "IsAccount"},
+                "Queue": {
+                    "Type": "AWS::SQS::Queue",
+                    "DependsOn": ["Prod"],
+                    "Properties": {
+                        "QueueName": "prod",
+                        "Tags": [{"Fn::If": ["IsAccount", {"Key": "Account"}, {"Ref": "AWS::NoValue"}]}],
+                    },
+                },
+                "Other": {"Type": "AWS::SQS::Queue"},
+            },
+        )
+        self.assertEqual(template["Outputs"], {"Prod": {"Value": {"Ref": "Prod"}}})
+        self.assertEqual(template["Conditions"], CONDITIONS)
+
+    def test_prune_template_without_static_conditions(self):
+        template = {
+            "Conditions": {"IsAccount": CONDITIONS["IsAccount"]},
+            "Resources": {"Topic": {"Type": "AWS::SNS::Topic", "Condition": "IsAccount"}},
+        }
+
+        self.assertEqual(StaticConditionEvaluator(template["Conditions"], PARAMETERS).prune_template(template), [])
+        self.assertEqual(template["Resources"], {"Topic": {"Type": "AWS::SNS::Topic", "Condition": "IsAccount"}})
+
+
+@patch("boto3.session.Session.region_name", "us-east-1")
+class TestTransformPruneStaticConditions(TestCase):
+    def tearDown(self):
+        # Translator stores its metrics globally
+        MetricsMethodWrapperSingleton.set_instance(MetricsMethodWrapperSingleton._DUMMY_INSTANCE)
+
+    def _template(self):
+        function_properties = {"CodeUri": "s3://bucket/key", "Handler": "index.handler", "Runtime": "python3.11"}
+        return {
+            "Parameters": {"Env": {"Type": "String", "Default": "dev"}},
+            "Conditions": {"IsProd": {"Fn::Equals": [{"Ref": "Env"}, "prod"]}},
+            "Resources": {
+                "Function": {
+                    "Type": "AWS::Serverless::Function",
+                    "Properties": {
+                        **function_properties,
+                        "MemorySize": {"Fn::If": ["IsProd", 1024, 128]},
+                        "AutoPublishAlias": "live",
+                        "DeploymentPreference": {"Type": "AllAtOnce"},
+                    },
+                },
+                "ProdFunction": {
+                    "Type": "AWS::Serverless::Function",
+                    "Condition": "IsProd",
+                    "Properties": {
+                        **function_properties,
+                        "Events": {"Api": {"Type": "Api", "Properties": {"Path": "/", "Method": "get"}}},
+                    },
+                },
+            },
+        }
+
+    def test_resources_disabled_by_conditions_are_not_translated(self):
+        with patch("samtranslator.model.sam_resources.SamFunction.to_cloudformation") as to_cloudformation:
+            to_cloudformation.return_value = []
+            transform(self._template(), {"Env": "dev"}, get_policy_mock(), prune_static_conditions=True)
+
+        self.assertEqual(to_cloudformation.call_count, 1)
+
+    def test_output_is_pruned(self):
+        output = transform(self._template(), {"Env": "dev"}, get_policy_mock(), prune_static_conditions=True)
+        unpruned = transform(self._template(), {"Env": "dev"}, get_policy_mock())
+
+        self.assertNotIn("ProdFunction", output["Resources"])
+        self.assertNotIn("ServerlessRestApi", output["Resources"])
+        self.assertEqual(output["Resources"]["Function"]["Properties"]["MemorySize"], 128)
+        removed = set(unpruned["Resources"]) - set(output["Resources"])
+        # The version of the function changes with its properties, which are pruned too
+        self.assertEqual(
+            {logical_id for logical_id in removed if not logical_id.startswith("FunctionVersion")},
+            {
+                "ProdFunction",
+                "ProdFunctionRole",
+                "ProdFunctionApiPermissionProd",
+                "ServerlessRestApi",
+                "ServerlessRestApiProdStage",
+                next(logical_id for logical_id in removed if logical_id.startswith("ServerlessRestApiDeployment")),
+            },
+        )
+
+        output = transform(self._template(), {"Env": "prod"}, get_policy_mock(), prune_static_conditions=True)
+        self.assertIn("ProdFunction", output["Resources"])
+        self.assertNotIn("Condition", output["Resources"]["ProdFunction"])
+        self.assertEqual(output["Resources"]["Function"]["Properties"]["MemorySize"], 1024)
+
+    def test_default_parameter_values_are_not_static(self):
+        # The stack can be deployed with another value than the default one
+        output = transform(self._template(), {}, get_policy_mock(), prune_static_conditions=True)
+        unpruned = transform(self._template(), {}, get_policy_mock())
+
+        self.assertEqual(output, unpruned)
+        self.assertEqual(output["Resources"]["ProdFunction"]["Condition"], "IsProd")
+
+    def test_session_pseudo_parameters_are_not_static(self):
+        template = self._template()
+        template["Conditions"]["IsVirginia"] = {"Fn::Equals": [{"Ref": "AWS::Region"}, "us-east-1"]}
+        template["Resources"]["ProdFunction"]["Condition"] = "IsVirginia"
+
+        output = transform(template, {"Env": "dev"}, get_policy_mock(), prune_static_conditions=True)
+
+        self.assertEqual(output["Resources"]["ProdFunction"]["Condition"], "IsVirginia")
@@ -7,6 +7,7 @@ from samtranslator.metrics.method_decorator import (
     _send_cw_metric,
     cw_timer,
 )
+from samtranslator.metrics.metrics import Metrics
 from samtranslator.model import Resource
 
 
@@ -26,6 +27,13 @@ class TestMetricsMethodWrapperSingleton(TestCase):
         MetricsMethodWrapperSingleton.set_instance(given_instance)
         self.assertEqual(given_instance, MetricsMethodWrapperSingleton.get_instance())
 
+    def test_instance_for_context(self):
+        process_instance = MetricsMethodWrapperSingleton.get_instance()
+        given_instance = Mock()
+        with MetricsMethodWrapperSingleton.instance_for_context(given_instance):
+            self.assertEqual(given_instance, MetricsMethodWrapperSingleton.get_instance())
+        self.assertEqual(process_instance, MetricsMethodWrapperSingleton.get_instance())
+
 
 class TestMetricsMethodDecoratorMetricName(TestCase):
     def test_get_metric_name_with_name(self):
@@ -75,6 +83,15 @@ class TestMetricsMethodDecoratorMetricName(TestCase):
         self.assertTrue(return_value)
         given_metrics_instance.record_latency.assert_called_with("my_method", ANY)
 
+    def test_cw_timer_records_metric_objects(self):
+        metrics = Metrics()
+        with MetricsMethodWrapperSingleton.instance_for_context(metrics):
+            MyClass().my_method()
+            MyClass().my_method()
+
+        self.assertEqual(len(metrics.get_metric("my_method")), 2)
+        metrics.publish()
+
     def test_cw_timer_should_not_break_the_method(self):
         given_metrics_instance = Mock()
         given_metrics_instance.record_latency.side_effect = Exception()
@@ -1,14 +1,20 @@
-from datetime import datetime
+import json
+import threading
+from datetime import datetime, timezone
+from io import StringIO
 from unittest import TestCase
 from unittest.mock import ANY, MagicMock, call
 
 from parameterized import param, parameterized
 from samtranslator.metrics.metrics import (
+    BackgroundMetricsPublisher,
     CWMetricsPublisher,
     DummyMetricsPublisher,
+    EMFMetricsPublisher,
     MetricDatum,
     Metrics,
     MetricsPublisher,
+    MetricStatistics,
     Unit,
 )
 
@@ -181,6 +187,61 @@ class TestMetrics(TestCase):
         m3 = metrics.get_metric(name1 + name2)
         self.assertListEqual(m3, [])
 
+    def test_record_statistics(self):
+        dimensions = [{"Name": "SAM", "Value": "Dim1"}]
+        mock_metrics_publisher = MetricPublisherTestHelper()
+        metrics = Metrics("DummyNamespace", mock_metrics_publisher)
+        for value in range(1000):
+            metrics.record_latency_statistic("Latency", value, dimensions)
+        metrics.record_latency_statistic("Latency", 5, [{"Name": "SAM", "Value": "Dim2"}])
+
+        statistics = metrics.get_statistics("Latency", Unit.Milliseconds, dimensions)
+        self.assertEqual(len(metrics.metric_statistics), 2)
+        self.assertEqual(statistics.sample_count, 1000)
+        self.assertIsNone(metrics.get_statistics("Latency", Unit.Count, dimensions))
+
+        metrics.publish()
+        self.assertEqual(len(mock_metrics_publisher.metrics_cache), 2)
+        self.assertEqual(
+            mock_metrics_publisher.metrics_cache[0].get_metric_data(),
+            {
+                "MetricName": "Latency",
+                "Unit": Unit.Milliseconds,
+                "Dimensions": dimensions,
+                "Timestamp": ANY,
+                "StatisticValues": {"SampleCount": 1000, "Sum": 499500, "Minimum": 0, "Maximum": 999},
+            },
+        )
+        self.assertEqual(metrics.metric_statistics, {})
+
+    def test_record_latency_with_aggregate_latencies(self):
+        mock_metrics_publisher = MetricPublisherTestHelper()
+        metrics = Metrics("DummyNamespace", mock_metrics_publisher, aggregate_latencies=True)
+        for value in [1, 2, 3]:
+            metrics.record_latency("Latency", value)
+        metrics.record_count("Count", 1)
+
+        self.assertEqual(metrics.get_metric("Latency"), [])
+        self.assertEqual(metrics.get_statistics("Latency", Unit.Milliseconds).sample_count, 3)
+        self.assertEqual(len(metrics.get_metric("Count")), 1)
+        metrics.publish()
+
+    def test_record_statistics_with_histogram(self):
+        mock_metrics_publisher = MetricPublisherTestHelper()
+        metrics = Metrics("DummyNamespace", mock_metrics_publisher, histogram_buckets=[100, 10, 1000])
+        for value in [1, 10, 10.5, 99, 5000, 7000]:
+            metrics.record_statistic("Size", value, Unit.Count)
+
+        metrics.publish()
+        metric_data = mock_metrics_publisher.metrics_cache[0].get_metric_data()
+        self.assertEqual(metric_data["Values"], [10, 100, 7000])
+        self.assertEqual(metric_data["Counts"], [2, 2, 2])
+        self.assertNotIn("StatisticValues", metric_data)
+
+    def test_histogram_bucket_limit(self):
+        with self.assertRaises(ValueError):
+            MetricStatistics("Size", Unit.Count, buckets=range(MetricStatistics.MAX_HISTOGRAM_BUCKETS + 1))
+
 
 class TestCWMetricPublisher(TestCase):
     @parameterized.expand(
@@ -294,3 +355,242 @@ class TestCWMetricPublisher(TestCase):
         namespace = "DummyNamespace"
         metric_publisher.publish(namespace, metrics)
         mock_cw_client.put_metric_data.assert_not_called()
+
+    def test_publish_statistics(self):
+        mock_cw_client = MagicMock()
+        metric_publisher = CWMetricsPublisher(mock_cw_client)
+        statistics = MetricStatistics("Latency", Unit.Milliseconds, [], timestamp=datetime(2022, 8, 8, 8, 8, 8))
+        statistics.add(3)
+        statistics.add(1.5)
+        metric_publisher.publish("DummyNamespace", [statistics])
+        mock_cw_client.put_metric_data.assert_called_once_with(
+            Namespace="DummyNamespace",
+            MetricData=[
+                {
+                    "MetricName": "Latency",
+                    "Unit": Unit.Milliseconds,
+                    "Dimensions": [],
+                    "Timestamp": datetime(2022, 8, 8, 8, 8, 8),
+                    "StatisticValues": {"SampleCount": 2, "Sum": 4.5, "Minimum": 1.5, "Maximum": 3},
+                }
+            ],
+        )
+
+
+class FakeCloudWatchClient:
+    def __init__(self):
+        self.requests = []
+        self.threads = set()
+        self.release = threading.Event()
+        self.release.set()
+
+    def put_metric_data(self, Namespace, MetricData):
+        self.threads.add(threading.get_ident())
+        self.release.wait(10)
+        self.requests.append((Namespace, [data["Value"] for data in MetricData]))
+
+
+def _metrics(count, start=0):
+    return [MetricDatum("Metric", i, Unit.Count) for i in range(start, start + count)]
+
+
+class TestBackgroundMetricsPublisher(TestCase):
+    def test_publishes_from_background_thread_on_flush(self):
+        client = FakeCloudWatchClient()
+        publisher = BackgroundMetricsPublisher(client, flush_interval=60)
+        self.addCleanup(publisher.shutdown)
+
+        publisher.publish("Namespace1", _metrics(2))
+        publisher.publish("Namespace2", _metrics(1, start=2))
+        self.assertEqual(client.requests, [])
+
+        self.assertTrue(publisher.flush(10))
+        self.assertEqual(client.requests, [("Namespace1", [0, 1]), ("Namespace2", [2])])
+        self.assertNotIn(threading.get_ident(), client.threads)
+        self.assertEqual(publisher.published_metrics, 3)
+
+    def test_publishes_full_batches(self):
+        client = FakeCloudWatchClient()
+        publisher = BackgroundMetricsPublisher(client, batch_size=2, flush_interval=60)
+        self.addCleanup(publisher.shutdown)
+
+        publisher.publish("Namespace", _metrics(5))
+        publisher.flush(10)
+
+        self.assertEqual(client.requests, [("Namespace", [0, 1]), ("Namespace", [2, 3]), ("Namespace", [4])])
+
+    def test_publishes_on_interval(self):
+        client = FakeCloudWatchClient()
+        publisher = BackgroundMetricsPublisher(client, flush_interval=0.05)
+        self.addCleanup(publisher.shutdown)
+
+        publisher.publish("Namespace", _metrics(1))
+        for _ in range(200):
+            if client.requests:
+                break
+            threading.Event().wait(0.05)
+        self.assertEqual(client.requests, [("Namespace", [0])])
+
+    def test_publishes_on_shutdown_and_drops_afterwards(self):
+        client = FakeCloudWatchClient()
+        publisher = BackgroundMetricsPublisher(client, flush_interval=60)
+
+        publisher.publish("Namespace", _metrics(3))
+        publisher.shutdown(10)
+        publisher.publish("Namespace", _metrics(2))
+
+        self.assertEqual(client.requests, [("Namespace", [0, 1, 2])])
+        self.assertEqual(publisher.dropped_metrics, 2)
+
+    def test_drops_metrics_when_queue_is_full(self):
+        client = FakeCloudWatchClient()
+        client.release.clear()
+        publisher = BackgroundMetricsPublisher(client, batch_size=2, flush_interval=60, max_queue_size=3)
+        self.addCleanup(publisher.shutdown)
+
+        # The first batch is being sent, blocked by the client
+        publisher.publish("Namespace", _metrics(2))
+        while not client.threads:
+            threading.Event().wait(0.01)
+        publisher.publish("Namespace", _metrics(5, start=2))
+        self.assertEqual(publisher.dropped_metrics, 2)
+
+        client.release.set()
+        publisher.flush(10)
+        self.assertEqual(client.requests, [("Namespace", [0, 1]), ("Namespace", [2, 3]), ("Namespace", [4])])
+
+    def test_counts_failed_requests(self):
+        client = MagicMock()
+        client.put_metric_data.side_effect = Exception("BOOM FAILED!!")
+        publisher = BackgroundMetricsPublisher(client, flush_interval=60)
+        self.addCleanup(publisher.shutdown)
+
+        publisher.publish("Namespace", _metrics(3))
+        publisher.flush(10)
+
+        self.assertEqual(publisher.failed_metrics, 3)
+        self.assertEqual(publisher.published_metrics, 0)
+
+    def test_splits_requests_larger_than_limit(self):
+        client = MagicMock()
+        publisher = BackgroundMetricsPublisher(client, flush_interval=60)
+        self.addCleanup(publisher.shutdown)
+        statistics = MetricStatistics("Size", Unit.Count, buckets=range(MetricStatistics.MAX_HISTOGRAM_BUCKETS))
+        for value in range(MetricStatistics.MAX_HISTOGRAM_BUCKETS + 1):
+            statistics.add(value)
+
+        publisher.publish("Namespace", [statistics] * 1000)
+        publisher.flush(10)
+
+        self.assertGreater(client.put_metric_data.call_count, 1)
+        self.assertEqual(sum(len(c.kwargs["MetricData"]) for c in client.put_metric_data.call_args_list), 1000)
+        self.assertEqual(publisher.published_metrics, 1000)
+
+    def test_invalid_batch_size(self):
+        for batch_size in [0, BackgroundMetricsPublisher.MAX_BATCH_SIZE + 1]:
+            with self.assertRaises(ValueError):
+                BackgroundMetricsPublisher(MagicMock(), batch_size=batch_size)
+
+
+class TestEMFMetricsPublisher(TestCase):
+    def test_publish_metrics(self):
+        stream = StringIO()
+        metrics = Metrics("DummyNamespace", EMFMetricsPublisher(stream))
+        dimensions = [{"Name": "Stage", "Value": "prod"}]
+        metrics.record_count("IAMError", 2, dimensions, datetime(2022, 8, 8, 8, 8, 8, tzinfo=timezone.utc))
+        metrics.record_count("IAMError", 3, dimensions)
+        metrics.record_latency("SARLatency", 1200, dimensions)
+        metrics.record_count("IAMError", 1)
+        metrics.publish()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(
+            lines,
+            [
+                {
+                    "_aws": {
+                        "Timestamp": 1659946088000,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": "DummyNamespace",
+                                "Dimensions": [["Stage"]],
+                                "Metrics": [
+                                    {"Name": "IAMError", "Unit": Unit.Count},
+                                    {"Name": "SARLatency", "Unit": Unit.Milliseconds},
+                                ],
+                            }
+                        ],
+                    },
+                    "Stage": "prod",
+                    "IAMError": [2, 3],
+                    "SARLatency": 1200,
+                },
+                {
+                    "_aws": {
+                        "Timestamp": ANY,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": "DummyNamespace",
+                                "Dimensions": [[]],
+                                "Metrics": [{"Name": "IAMError", "Unit": Unit.Count}],
+                            }
+                        ],
+                    },
+                    "IAMError": 1,
+                },
+            ],
+        )
+
+    def test_publish_statistics(self):
+        stream = StringIO()
+        metrics = Metrics("DummyNamespace", EMFMetricsPublisher(stream))
+        for value in [1, 2, 6]:
+            metrics.record_latency_statistic("Latency", value)
+        metrics.publish()
+
+        line = json.loads(stream.getvalue())
+        self.assertEqual(line["Latency"], 3)
+        self.assertEqual(line["Statistics"], {"Latency": {"SampleCount": 3, "Sum": 9, "Minimum": 1, "Maximum": 6}})
+
+    def test_publish_within_emf_limits(self):
+        stream = StringIO()
+        metrics = [MetricDatum(f"Metric{i}", 1, Unit.Count) for i in range(150)]
+        metrics += [MetricDatum("Metric0", i, Unit.Count) for i in range(150)]
+        EMFMetricsPublisher(stream).publish("DummyNamespace", metrics)
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        for line in lines:
+            metric_names = [m["Name"] for m in line["_aws"]["CloudWatchMetrics"][0]["Metrics"]]
+            self.assertLessEqual(len(metric_names), EMFMetricsPublisher.MAX_METRICS_PER_LINE)
+            for name in metric_names:
+                if isinstance(line[name], list):
+                    self.assertLessEqual(len(line[name]), EMFMetricsPublisher.MAX_VALUES_PER_METRIC)
+        self.assertEqual(
+            sum(
+                len(line[name]) if isinstance(line[name], list) else 1
+                for line in lines
+                for name in line
+                if name.startswith("Metric")
+            ),
+            300,
+        )
+
+    def test_skips_metrics_with_too_many_dimensions(self):
+        stream = StringIO()
+        dimensions = [{"Name": f"Dimension{i}", "Value": "value"} for i in range(31)]
+        EMFMetricsPublisher(stream).publish("DummyNamespace", [MetricDatum("Metric", 1, Unit.Count, dimensions)])
+        self.assertEqual(stream.getvalue(), "")
+
+    def test_skips_metrics_colliding_with_line_properties(self):
+        stream = StringIO()
+        metrics = Metrics("DummyNamespace", EMFMetricsPublisher(stream))
+        metrics.record_latency_statistic("Latency", 2)
+        metrics.record_count("Statistics", 1)
+        metrics.record_count("_aws", 1)
+        metrics.record_count("Plugin", 1, [{"Name": "Plugin", "Value": "value"}])
+        metrics.record_count("Count", 1, [{"Name": "Statistics", "Value": "value"}])
+        metrics.publish()
+
+        line = json.loads(stream.getvalue())
+        self.assertEqual([m["Name"] for m in line["_aws"]["CloudWatchMetrics"][0]["Metrics"]], ["Latency"])
+        self.assertEqual(line["Statistics"], {"Latency": {"SampleCount": 1, "Sum": 2, "Minimum": 2, "Maximum": 2}})
@@ -0,0 +1,196 @@
+import json
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import Mock
+
+from boto3 import Session
+from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton
+from samtranslator.metrics.tracing import (
+    ChromeTraceSpanExporter,
+    InMemorySpanExporter,
+    Tracer,
+    get_tracer,
+    start_span,
+    use_tracer,
+)
+from samtranslator.parser.parser import Parser
+from samtranslator.plugins.application.serverless_app_plugin import ServerlessAppPlugin
+from samtranslator.translator.arn_generator import ArnGenerator
+from samtranslator.translator.translator import Translator
+
+TEMPLATE = {
+    "Resources": {
+        "Function": {
+            "Type": "AWS::Serverless::Function",
+            "Properties": {
+                "CodeUri": "s3://bucket/key",
+                "Handler": "index.handler",
+                "Runtime": "python3.11",
+                "Events": {"Api": {"Type": "Api", "Properties": {"Path": "/", "Method": "get"}}},
+            },
+        },
+        "App": {
+            "Type": "AWS::Serverless::Application",
+            "Properties": {"Location": {"ApplicationId": "app", "SemanticVersion": "1.0.0"}},
+        },
+    }
+}
+
+
+def _spans_by_name(exporter):
+    spans = {}
+    for span in exporter.get_finished_spans():
+        spans.setdefault(span.name, []).append(span)
+    return spans
+
+
+class TestTracer(TestCase):
+    def test_start_span_without_tracer(self):
+        self.assertIsNone(get_tracer())
+        with start_span("Span", {"key": "value"}) as span:
+            self.assertIsNone(span)
+
+    def test_nested_spans(self):
+        exporter = InMemorySpanExporter()
+        tracer = Tracer([exporter])
+
+        with use_tracer(tracer):
+            self.assertIs(get_tracer(), tracer)
+            with start_span("Parent", {"key": "value"}) as parent:
+                with start_span("Child") as child:
+                    child.set_attribute("other", 1)
+                with self.assertRaises(ValueError), start_span("Failed"):
+                    raise ValueError()
+        self.assertIsNone(get_tracer())
+
+        self.assertEqual([span.name for span in exporter.get_finished_spans()], ["Child", "Failed", "Parent"])
+        self.assertIsNone(parent.parent_id)
+        self.assertEqual(parent.attributes, {"key": "value"})
+        self.assertEqual(child.parent_id, parent.span_id)
+        self.assertEqual(child.attributes, {"other": 1})
+        self.assertEqual(exporter.get_finished_spans()[1].attributes, {"exception.type": "ValueError"})
+        self.assertLessEqual(parent.start_ns, child.start_ns)
+        self.assertGreaterEqual(parent.duration_ns, child.duration_ns)
+
+        exporter.clear()
+        self.assertEqual(exporter.get_finished_spans(), [])
+
+    def test_none_attributes_are_omitted(self):
+        tracer = Mock()
+        with use_tracer(tracer):
+            start_span("Translator.translate", {"region": None, "key": "value"})
+        tracer.start_as_current_span.assert_called_once_with("Translator.translate", attributes={"key": "value"})
+
+    def test_chrome_trace(self):
+        exporter = ChromeTraceSpanExporter()
+        with use_tracer(Tracer([exporter])), start_span("Parent"), start_span("Child", {"logical_id": "Function"}):
+            pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "trace.json")
+            exporter.write(path)
+            trace = json.loads(path.read_text())
+
+        child, parent = trace["traceEvents"]
+        self.assertEqual(child["name"], "Child")
+        self.assertEqual(child["ph"], "X")
+        self.assertEqual(child["args"], {"logical_id": "Function"})
+        self.assertLessEqual(parent["ts"], child["ts"])
+        self.assertGreaterEqual(parent["ts"] + parent["dur"], child["ts"] + child["dur"])
+
+
+class TestTranslationTracing(TestCase):
+    def tearDown(self):
+        # Translator stores the region of the session and its metrics globally
+        ArnGenerator.BOTO_SESSION_REGION_NAME = None
+        MetricsMethodWrapperSingleton.set_instance(MetricsMethodWrapperSingleton._DUMMY_INSTANCE)
+
+    def _translate(self, tracer):
+        sar_client = Mock()
+        sar_client.create_cloud_formation_template.return_value = {
+            "TemplateUrl": "https://template",
+            "Status": "ACTIVE",
+            "TemplateId": "id",
+        }
+        translator = Translator(
+            {},
+            Parser(),
+            plugins=[ServerlessAppPlugin(sar_client=sar_client)],
+            boto_session=Session(region_name="us-east-1"),
+        )
+        with use_tracer(tracer):
+            return translator.translate(json.loads(json.dumps(TEMPLATE)), {})
+
+    def test_translation_spans(self):
+        exporter = InMemorySpanExporter()
+        self._translate(Tracer([exporter]))
+        spans = _spans_by_name(exporter)
+        spans_by_id = {span.span_id: span for span in exporter.get_finished_spans()}
+
+        def ancestors(span):
+            while span.parent_id is not None:
+                span = spans_by_id[span.parent_id]
+                yield span.name
+
+        (translate,) = spans["Translator.translate"]
+        self.assertEqual(translate.attributes, {"region": "us-east-1"})
+        self.assertEqual(translate.span_id, exporter.get_finished_spans()[-1].span_id)
+
+        # SAR call inside the plugin hook inside the parser
+        (sar_call,) = spans["External-SAR"]
+        self.assertEqual(
+            list(ancestors(sar_call)),
+            [
+                "Plugin-ServerlessApp-on_before_transform_template",
+                "ServerlessAppPlugin.on_before_transform_template",
+                "Parser.parse",
+                "Translator.translate",
+            ],
+        )
+
+        to_cloudformation = {
+            span.attributes["logical_id"]: span
+            for span in spans["Resource.to_cloudformation"]
+            if "logical_id" in span.attributes
+        }
+        self.assertEqual(to_cloudformation["Function"].attributes["resource_type"], "AWS::Serverless::Function")
+        self.assertIn("ServerlessRestApi", to_cloudformation)
+        self.assertEqual(
+            {span.attributes["logical_id"] for span in spans["Resource.from_dict"]},
+            {"Function", "App", "ServerlessRestApi"},
+        )
+
+        # Methods timed with cw_timer are traced in the span of their caller
+        (function,) = spans["AWS::Serverless::Function"]
+        self.assertEqual(function.attributes, {"logical_id": "Function", "resource_type": "AWS::Serverless::Function"})
+        self.assertEqual(spans_by_id[function.parent_id], to_cloudformation["Function"])
+        # The editor deep copies are made by the implicit API plugin and by the API event of the function
+        deepcopy_parents = {spans_by_id[span.parent_id].name for span in spans["SwaggerEditor-deepcopy"]}
+        self.assertIn("Plugin-ImplicitApi-on_before_transform_template", deepcopy_parents)
+        self.assertIn("FunctionEventSource-Api", deepcopy_parents)
+
+        (resolve,) = spans["Translator.resolve_references"]
+        self.assertEqual(resolve.parent_id, translate.span_id)
+
+    def test_opentelemetry_compatible_tracer(self):
+        started = []
+
+        class OpenTelemetryTracer:
+            @contextmanager
+            def start_as_current_span(self, name, context=None, kind=None, attributes=None):
+                started.append((name, attributes))
+                yield Mock()
+
+        output = self._translate(OpenTelemetryTracer())
+
+        self.assertIn("FunctionRole", output["Resources"])
+        self.assertIn(("Parser.parse", None), started)
+        self.assertIn(
+            (
+                "Resource.to_cloudformation",
+                {"logical_id": "Function", "resource_type": "AWS::Serverless::Function"},
+            ),
+            started,
+        )
@@ -2,7 +2,10 @@ from unittest import TestCase
 
 from parameterized import parameterized
 from samtranslator.model.connector_profiles.profile import (
+    PROFILE,
+    ProfileTemplate,
     get_profile,
+    get_profile_template,
     profile_replace,
     replace_cfn_resource_properties,
     verify_profile_variables_replaced,
@@ -254,3 +257,60 @@ class TestProfile(TestCase):
         d1["Type"] = "overridden"
         d2 = get_profile("AWS::Lambda::Function", "AWS::DynamoDB::Table")
         self.assertNotEqual(d1, d2)
+
+    def test_get_profile_template(self):
+        template = get_profile_template("AWS::Lambda::Function", "AWS::DynamoDB::Table")
+        self.assertIs(template, get_profile_template("AWS::Lambda::Function", "AWS::DynamoDB::Table"))
+        self.assertEqual(template.obj, get_profile("AWS::Lambda::Function", "AWS::DynamoDB::Table"))
+        self.assertIsNone(get_profile_template("AWS::Lambda::Function", "AWS::Fake::Resource"))
+
+    def test_profile_templates_only_use_connector_variables(self):
+        variables = [
+            "Source.Arn",
+            "Destination.Arn",
+            "Source.ResourceId",
+            "Destination.ResourceId",
+            "Source.Name",
+            "Destination.Name",
+            "Source.Qualifier",
+            "Destination.Qualifier",
+        ]
+        for source_type, profiles in PROFILE["Permissions"].items():
+            for dest_type in profiles:
+                get_profile_template(source_type, dest_type).verify_variables_replaced(variables)
+
+    def test_profile_template_renders_independent_copies(self):
+        destination_arn = {"Fn::GetAtt": ["Table", "Arn"]}
+        template = ProfileTemplate(
+            {"Statement": [{"Resource": ["%{Destination.Arn}", "%{Destination.Arn}/index/*"], "Effect": "Allow"}]}
+        )
+
+        first = template.render({"Destination.Arn": destination_arn})
+        first["Statement"][0]["Effect"] = "Deny"
+        second = template.render({"Destination.Arn": destination_arn})
+
+        expected = {
+            "Statement": [
+                {
+                    "Resource": [
+                        destination_arn,
+                        {"Fn::Sub": ["${DestinationArn}/index/*", {"DestinationArn": destination_arn}]},
+                    ],
+                    "Effect": "Allow",
+                }
+            ]
+        }
+        self.assertEqual(second, expected)
+        self.assertIsNot(first["Statement"], second["Statement"])
+
+    @parameterized.expand(
+        [
+            ({"Foo": {"Bar": "%{NotGood}something What"}}, {}, "['%{NotGood}']"),
+            ({"Foo": {"%{Good}": "something %{What.No}"}}, {"Good": "a"}, "['%{Good}', '%{What.No}']"),
+            ({"Foo": ["%{Good}", "%{NotGood}"]}, {"Good": "a"}, "['%{NotGood}']"),
+        ]
+    )
+    def test_profile_template_verify_not_replaced(self, profile, replacements, error_includes):
+        with self.assertRaises(ValueError) as ctx:
+            ProfileTemplate(profile).verify_variables_replaced(replacements)
+        self.assertIn(error_includes, str(ctx.exception))
@@ -1,9 +1,125 @@
+import copy
+import json
 from unittest import TestCase
 from unittest.mock import Mock
 
 from samtranslator.model.exceptions import InvalidEventException, InvalidResourceException
+from samtranslator.model.intrinsics import is_intrinsic
 from samtranslator.model.stepfunctions import StateMachineGenerator
 from samtranslator.model.stepfunctions.events import CloudWatchEvent
+from samtranslator.utils.cfn_dynamic_references import is_dynamic_reference
+
+
+def _paths_to_dynamic_values(value, path=()):
+    """Paths to the dynamic values in the order they are numbered, depth first with the keys in sorted order"""
+    if isinstance(value, dict):
+        items = sorted(value.items())
+    elif isinstance(value, list):
+        items = list(enumerate(value))
+    else:
+        return []
+    paths = []
+    for key, item in items:
+        if is_intrinsic(item) or is_dynamic_reference(item):
+            paths.append((*path, key))
+        else:
+            paths.extend(_paths_to_dynamic_values(item, (*path, key)))
+    return paths
+
+
+def _large_definition(state_count):
+    states = {}
+    for i in range(state_count):
+        states[f"State{i}"] = {
+            "Type": "Task",
+            "Resource": {"Fn::GetAtt": [f"Function{i % 7}", "Arn"]},
+            "Parameters": {
+                "Payload": {"Table": {"Ref": "Table"}, "Items": [{"Ref": "Queue"}, "static", {"Nested": {"Ref": "B"}}]},
+                "Secret": "{{resolve:secretsmanager:secret:SecretString:password}}",
+                "Name": f"state {i}",
+            },
+            "Next": f"State{i + 1}",
+        }
+    states[f"State{state_count - 1}"]["End"] = True
+    return {"Comment": {"Fn::Sub": "${AWS::StackName}"}, "StartAt": "State0", "States": states}
+
+
+class TestStateMachineDefinitionSubstitutions(TestCase):
+    def setUp(self):
+        self.generator = StateMachineGenerator(
+            logical_id="StateMachine",
+            depends_on=None,
+            managed_policy_map=None,
+            intrinsics_resolver=None,
+            definition=None,
+            definition_uri=None,
+            logging=None,
+            name=None,
+            policies=None,
+            permissions_boundary=None,
+            definition_substitutions=None,
+            role=None,
+            state_machine_type=None,
+            tracing=None,
+            events=None,
+            event_resources=None,
+            event_resolver=None,
+            tags=None,
+            resource_attributes=None,
+            passthrough_resource_attributes={},
+        )
+
+    def test_substitutions_are_numbered_depth_first_in_sorted_order(self):
+        definition = {
+            "b": {"Ref": "Second"},
+            "a": {"z": [{"Ref": "First"}, {"y": "{{resolve:ssm:parameter}}"}]},
+            "c": [{"Fn::Sub": "${Third}"}],
+        }
+
+        substitutions = self.generator._replace_dynamic_values_with_substitutions(definition)
+
+        self.assertEqual(
+            substitutions,
+            {
+                "definition_substitution_1": {"Ref": "First"},
+                "definition_substitution_2": "{{resolve:ssm:parameter}}",
+                "definition_substitution_3": {"Ref": "Second"},
+                "definition_substitution_4": {"Fn::Sub": "${Third}"},
+            },
+        )
+        self.assertEqual(
+            definition,
+            {
+                "b": "${definition_substitution_3}",
+                "a": {"z": ["${definition_substitution_1}", {"y": "${definition_substitution_2}"}]},
+                "c": ["${definition_substitution_4}"],
+            },
+        )
+
+    def test_large_definition_substitutions(self):
+        definition = _large_definition(500)
+        original = copy.deepcopy(definition)
+
+        substitutions = self.generator._replace_dynamic_values_with_substitutions(definition)
+
+        paths = _paths_to_dynamic_values(original)
+        self.assertEqual(len(substitutions), len(paths))
+        for index, path in enumerate(paths, start=1):
+            original_value, replaced_value = original, definition
+            for key in path:
+                original_value, replaced_value = original_value[key], replaced_value[key]
+            self.assertEqual(substitutions[f"definition_substitution_{index}"], original_value)
+            self.assertEqual(replaced_value, f"${{definition_substitution_{index}}}")
+
+    def test_definition_string_lines(self):
+        definition = _large_definition(50)
+        self.generator._replace_dynamic_values_with_substitutions(definition)
+
+        definition_string = self.generator._build_definition_string(definition)
+
+        expected_lines = json.dumps(definition, sort_keys=True, indent=4, separators=(",", ": ")).split("\n")
+        self.assertEqual(definition_string, {"Fn::Join": ["\n", expected_lines]})
+        self.assertEqual(self.generator._build_definition_string({}), {"Fn::Join": ["\n", ["{}"]]})
 
 
 class StepFunctionsStateMachine(TestCase):
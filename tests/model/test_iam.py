@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from samtranslator.model.iam import IAMRole
+
+
+def _policy(name, resource):
+    return {
+        "PolicyName": name,
+        "PolicyDocument": {"Statement": [{"Action": "sqs:SendMessage", "Effect": "Allow", "Resource": resource}]},
+    }
+
+
+class TestIAMRolePolicies(TestCase):
+    def test_add_managed_policy_arn(self):
+        role = IAMRole("Role")
+
+        self.assertTrue(role.add_managed_policy_arn("arn:aws:iam::aws:policy/First"))
+        self.assertTrue(role.add_managed_policy_arn({"Fn::Sub": "arn:${AWS::Partition}:iam::aws:policy/Second"}))
+        self.assertFalse(role.add_managed_policy_arn("arn:aws:iam::aws:policy/First"))
+        self.assertFalse(role.add_managed_policy_arn({"Fn::Sub": "arn:${AWS::Partition}:iam::aws:policy/Second"}))
+
+        self.assertEqual(
+            role.ManagedPolicyArns,
+            ["arn:aws:iam::aws:policy/First", {"Fn::Sub": "arn:${AWS::Partition}:iam::aws:policy/Second"}],
+        )
+
+    def test_add_policy_skips_same_policies_and_documents(self):
+        role = IAMRole("Role")
+
+        self.assertTrue(role.add_policy(_policy("First", "arn:first")))
+        self.assertFalse(role.add_policy(_policy("First", "arn:first")))
+        # Same document with another name, in another key order
+        same_document = _policy("Other", "arn:first")
+        same_document["PolicyDocument"]["Statement"][0] = dict(
+            reversed(list(same_document["PolicyDocument"]["Statement"][0].items()))
+        )
+        self.assertFalse(role.add_policy(same_document))
+        self.assertTrue(role.add_policy(_policy("Second", "arn:second")))
+
+        self.assertEqual(role.Policies, [_policy("First", "arn:first"), _policy("Second", "arn:second")])
+
+    def test_policies_set_or_appended_directly_are_taken_into_account(self):
+        role = IAMRole("Role")
+        role.Policies = [_policy("First", "arn:first")]
+        self.assertFalse(role.add_policy(_policy("First", "arn:first")))
+
+        role.Policies.append({"Fn::If": ["Condition", _policy("Second", "arn:second"), {"Ref": "AWS::NoValue"}]})
+        role.Policies.append(_policy("Third", "arn:third"))
+        self.assertFalse(role.add_policy(_policy("Other", "arn:third")))
+
+        role.Policies = [_policy("Fourth", "arn:fourth")]
+        self.assertTrue(role.add_policy(_policy("First", "arn:first")))
+        self.assertEqual(role.Policies, [_policy("Fourth", "arn:fourth"), _policy("First", "arn:first")])
+
+        role.ManagedPolicyArns = ["arn:aws:iam::aws:policy/First"]
+        self.assertFalse(role.add_managed_policy_arn("arn:aws:iam::aws:policy/First"))
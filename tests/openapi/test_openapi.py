@@ -294,6 +294,15 @@ class TestOpenApiEditor_add_lambda_integration(TestCase):
         actual = self.editor.openapi["paths"][path][method]
         self.assertEqual(expected, actual)
 
+    def test_must_follow_integrations_added_to_indexed_path(self):
+        self.assertEqual(list(self.editor.iter_on_all_methods_for_path("/foo")), [])
+        self.assertFalse(self.editor.has_integration("/foo", "post"))
+
+        self.editor.add_lambda_integration("/foo", "post", "uri", Py27Dict(), Py27Dict(), condition="Condition")
+
+        self.assertTrue(self.editor.has_integration("/foo", "post"))
+        self.assertEqual([method_name for method_name, _ in self.editor.iter_on_all_methods_for_path("/foo")], ["post"])
+
 
 class TestOpenApiEditor_iter_on_path(TestCase):
     def setUp(self):
@@ -375,6 +384,22 @@ class TestOpenApiEditor_add_auth(TestCase):
 
         self.editor = OpenApiEditor(self.original_openapi)
 
+    def test_must_set_path_default_authorizer(self):
+        self.original_openapi["paths"]["/foo"]["post"]["security"] = [{"OtherAuth": []}]
+        self.original_openapi["paths"]["/foo"]["options"] = {_X_INTEGRATION: {"a": "b"}}
+        self.original_openapi["paths"]["/bar"]["post"] = {"summary": "no integration"}
+        self.editor = OpenApiEditor(self.original_openapi)
+
+        self.editor.apply_security_rules([self.editor.get_default_authorizer_rule("MyAuth", {})])
+
+        paths = self.editor.openapi["paths"]
+        self.assertEqual(paths["/foo"]["get"]["security"], [{"MyAuth": []}])
+        self.assertEqual(paths["/foo"]["post"]["security"], [{"OtherAuth": []}])
+        self.assertNotIn("security", paths["/foo"]["options"])
+        self.assertNotIn("security", paths["/bar"]["post"])
+        # The default security block is shared by the methods
+        self.assertIs(paths["/foo"]["get"]["security"][0], paths["/bar"]["get"]["security"][0])
+
 
 class TestOpenApiEditor_is_integration_function_logical_id_match(TestCase):
     def setUp(self):
@@ -186,6 +186,53 @@ class TestGlobalPropertiesMerge(TestCase):
         self.assertEqual(actual, configuration["expected_output"])
 
 
+class TestGlobalPropertiesMergePlan(TestCase):
+    def setUp(self):
+        self.global_value = {
+            "Environment": {"Variables": {"TABLE": "table", "STAGE": "prod"}},
+            "Layers": ["layer1"],
+            "Runtime": "python3.11",
+        }
+        self.global_properties = GlobalProperties(self.global_value)
+
+    def test_global_properties_are_compiled_once(self):
+        with patch.object(GlobalProperties, "_compile", wraps=self.global_properties._compile) as compile_mock:
+            for _ in range(3):
+                self.global_properties.merge({"Runtime": "nodejs20.x"})
+
+        # Once per global value: the dictionary, Environment, Variables, TABLE, STAGE, Layers and Runtime
+        self.assertEqual(compile_mock.call_count, 7)
+
+    def test_merge_shares_global_values(self):
+        merged = self.global_properties.merge({"Layers": ["layer2"]})
+
+        self.assertEqual(merged["Layers"], ["layer1", "layer2"])
+        self.assertIs(merged["Environment"], self.global_value["Environment"])
+
+    def test_merge_with_ignored_keys(self):
+        local = {"Environment": {"Variables": {"STAGE": "dev"}}, "Layers": ["layer2"]}
+
+        merged = self.global_properties.merge(local, ["Environment", "Runtime"])
+
+        self.assertEqual(merged, {"Layers": ["layer1", "layer2"], "Environment": {"Variables": {"STAGE": "dev"}}})
+        self.assertIs(merged["Environment"], local["Environment"])
+        # Ignoring properties modifies neither the global properties nor the next merges
+        self.assertEqual(self.global_value["Environment"], {"Variables": {"TABLE": "table", "STAGE": "prod"}})
+        self.assertEqual(
+            self.global_properties.merge(local)["Environment"], {"Variables": {"TABLE": "table", "STAGE": "dev"}}
+        )
+
+    def test_merge_with_ignored_keys_copies_global_values(self):
+        merged = self.global_properties.merge({"Layers": ["layer2"]}, ["Runtime"])
+
+        self.assertEqual(merged["Environment"], self.global_value["Environment"])
+        self.assertIsNot(merged["Environment"], self.global_value["Environment"])
+        merged["Environment"]["Variables"]["STAGE"] = "modified"
+        merged["Layers"][0] = "modified"
+        self.assertEqual(self.global_value["Environment"], {"Variables": {"TABLE": "table", "STAGE": "prod"}})
+        self.assertEqual(self.global_properties.merge({})["Layers"], ["layer1"])
+
+
 class TestGlobalsPropertiesEdgeCases(TestCase):
     @patch.object(GlobalProperties, "_token_of")
     def test_merge_with_objects_of_unsupported_token_type(self, token_of_mock):
@@ -353,6 +400,26 @@ class TestGlobalsObject(TestCase):
 
         self.assertEqual(result.global_properties, GlobalProperties({"prop2": "value2"}).global_properties)
 
+    def test_merge_with_list_ignore_globals(self):
+        type = "prefix_type1"
+        globals = Globals(self.template)
+
+        result = globals.merge(type, {"a": "b"}, "MyFunction", ["prop1"])
+
+        self.assertEqual(result, {"prop2": "value2", "a": "b"})
+        self.assertEqual(globals.template_globals[type].global_properties, {"prop1": "value1", "prop2": "value2"})
+        with self.assertRaises(InvalidResourceAttributeTypeException):
+            globals.merge(type, {"a": "b"}, "MyFunction", ["prop3"])
+
+    def test_merge_with_duplicate_ignore_globals(self):
+        type = "prefix_type1"
+        globals = Globals(self.template)
+
+        with self.assertRaises(InvalidResourceAttributeTypeException):
+            globals.merge(type, {"a": "b"}, "MyFunction", ["prop1", "prop1"])
+        with self.assertRaises(InvalidResourceAttributeTypeException):
+            globals.get_template_globals("MyFunction", type, ["prop1", "prop1"])
+
     def test_get_template_globals_error(self):
         type = "prefix_type1"
         globals = Globals(self.template)
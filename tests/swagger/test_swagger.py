@@ -3,9 +3,10 @@ from unittest import TestCase
 from unittest.mock import Mock
 
 from parameterized import param, parameterized
+from samtranslator.model.apigateway import ApiGatewayAuthorizer
 from samtranslator.model.exceptions import InvalidDocumentException, InvalidTemplateException
 from samtranslator.swagger.swagger import SwaggerEditor
-from samtranslator.utils.py27hash_fix import Py27Dict
+from samtranslator.utils.py27hash_fix import Py27Dict, Py27UniStr
 
 from tests.translator.test_translator import deep_sort_lists
 
@@ -297,6 +298,58 @@ class TestSwaggerEditor_iter_on_path(TestCase):
         self.assertEqual(expected, actual)
 
 
+class TestSwaggerEditor_path_index(TestCase):
+    def setUp(self):
+        self.editor = SwaggerEditor(
+            {
+                "swagger": "2.0",
+                "paths": {
+                    "/foo": {
+                        "GET": {_X_INTEGRATION: {"a": "b"}},
+                        "post": {"Fn::If": ["Condition", {_X_INTEGRATION: {"a": "b"}}, {"Ref": "AWS::NoValue"}]},
+                        "parameters": [],
+                    },
+                },
+            }
+        )
+
+    def _methods(self, path):
+        return [method_name for method_name, _ in self.editor.iter_on_all_methods_for_path(path, False)]
+
+    def test_must_reuse_indexed_path(self):
+        self.assertEqual(self._methods("/foo"), ["get", "post"])
+        self.assertIs(self.editor._get_indexed_path("/foo"), self.editor._get_indexed_path("/foo"))
+        self.assertEqual(
+            self.editor._get_method_path_uri_list("/foo", "Stage")[0],
+            {"Fn::Sub": ["execute-api:/${__Stage__}/GET/foo", {"__Stage__": "Stage"}]},
+        )
+
+    def test_must_follow_changes_made_by_the_editor(self):
+        self.assertFalse(self.editor.has_path("/foo", "put"))
+        self.editor.add_path("/foo", "put")
+        self.assertTrue(self.editor.has_path("/foo", "put"))
+
+        self.editor.add_lambda_integration("/foo", "delete", "uri", {}, {}, condition="Condition")
+        self.assertTrue(self.editor.has_integration("/foo", "delete"))
+        self.assertEqual(self._methods("/foo"), ["get", "post", "put", "delete"])
+
+        self.editor.add_cors("/foo", "'*'")
+        self.assertEqual(self._methods("/foo"), ["get", "post", "put", "delete", "options"])
+
+        self.editor.make_path_conditional("/foo", "Condition")
+        self.assertEqual(len(self.editor._get_indexed_path("/foo").path_items), 1)
+        self.assertTrue(self.editor.has_integration("/foo", "delete"))
+
+    def test_must_follow_paths_replaced_in_the_document(self):
+        self.editor.paths["/foo"] = {"patch": {_X_INTEGRATION: {"a": "b"}}}
+        self.assertFalse(self.editor.has_integration("/foo", "get"))
+        self.assertEqual(self._methods("/foo"), ["patch"])
+
+        del self.editor.paths["/foo"]
+        self.assertFalse(self.editor.has_path("/foo"))
+        self.assertFalse(self.editor.has_integration("/foo", "patch"))
+
+
 class TestSwaggerEditor_add_cors(TestCase):
     def setUp(self):
         self.original_swagger = {
@@ -464,6 +517,35 @@ class TestSwaggerEditor_options_method_response_for_cors(TestCase):
         )
         self.assertEqual(expected, actual)
 
+    def test_snippets_of_same_configuration_are_independent(self):
+        editor = SwaggerEditor(SwaggerEditor.gen_skeleton())
+        origins = {"Fn::Sub": "'https://${Domain}'"}
+
+        first = editor._options_method_response_for_cors(origins, "'Content-Type'", "'GET,OPTIONS'", 60, True)
+        second = editor._options_method_response_for_cors(origins, "'Content-Type'", "'POST,OPTIONS'", 60, True)
+
+        self.assertEqual(
+            first, editor._build_options_method_response_for_cors(origins, "'Content-Type'", "'GET,OPTIONS'", 60, True)
+        )
+        self.assertEqual(
+            second,
+            editor._build_options_method_response_for_cors(origins, "'Content-Type'", "'POST,OPTIONS'", 60, True),
+        )
+        self.assertEqual(list(first[_X_INTEGRATION]), list(second[_X_INTEGRATION]))
+        first["responses"]["200"]["headers"]["Access-Control-Max-Age"]["type"] = "string"
+        self.assertEqual(second["responses"]["200"]["headers"]["Access-Control-Max-Age"], {"type": "integer"})
+        third = editor._options_method_response_for_cors(origins, "'Content-Type'", "'GET,OPTIONS'", 60, True)
+        self.assertEqual(third["responses"]["200"]["headers"]["Access-Control-Max-Age"], {"type": "integer"})
+
+        other = editor._options_method_response_for_cors("'*'", None, "'GET,OPTIONS'")
+        self.assertEqual(other, editor._build_options_method_response_for_cors("'*'", None, "'GET,OPTIONS'"))
+
+        # The values of the headers are never taken from another snippet
+        other_origins = Py27UniStr("'https://example.com'")
+        other = editor._options_method_response_for_cors(other_origins, "'Content-Type'", "'GET,OPTIONS'", 60, True)
+        response_parameters = other[_X_INTEGRATION]["responses"]["default"]["responseParameters"]
+        self.assertIs(response_parameters["method.response.header.Access-Control-Allow-Origin"], other_origins)
+
     def test_allow_headers_is_skipped_with_no_value(self):
         headers = None  # No value
         methods = "methods"
@@ -971,6 +1053,39 @@ class TestSwaggerEditor_add_auth(TestCase):
         self.editor._set_method_apikey_handling(path, method, True)
         self.assertEqual(expected, self.editor.swagger["paths"][path][method]["security"])
 
+    def test_must_apply_security_rules_in_a_single_walk(self):
+        authorizers = {"MyAuth": ApiGatewayAuthorizer(api_logical_id="Api", name="MyAuth", user_pool_arn="arn")}
+        self.original_swagger["paths"]["/bar"]["get"]["security"] = [{"NONE": []}]
+        self.original_swagger["paths"]["/bar"]["post"] = {
+            _X_INTEGRATION: {"a": "b"},
+            "security": [{"api_key_false": []}],
+        }
+        self.editor = SwaggerEditor(self.original_swagger)
+        walked = []
+
+        self.editor.apply_security_rules(
+            [
+                lambda path, method_name, _: walked.append((path, method_name)),
+                self.editor.get_default_authorizer_rule("MyAuth", authorizers),
+                self.editor.get_default_apikey_required_rule(),
+            ]
+        )
+
+        self.assertEqual(walked, [("/foo", "get"), ("/foo", "post"), ("/bar", "get"), ("/bar", "post")])
+        paths = self.editor.swagger["paths"]
+        self.assertEqual(paths["/foo"]["get"]["security"], [{"MyAuth": []}, {"api_key": []}])
+        self.assertEqual(paths["/bar"]["get"]["security"], [{"NONE": []}, {"api_key": []}])
+        self.assertEqual(paths["/bar"]["post"]["security"], [{"MyAuth": []}])
+        # The default security blocks are shared by the methods
+        self.assertIs(paths["/foo"]["get"]["security"][0], paths["/foo"]["post"]["security"][0])
+        self.assertIs(paths["/foo"]["get"]["security"][1], paths["/bar"]["get"]["security"][1])
+
+    def test_must_apply_security_rules_to_given_paths(self):
+        self.editor.apply_security_rules([self.editor.get_default_apikey_required_rule()], ["/bar"])
+
+        self.assertEqual(self.editor.swagger["paths"]["/bar"]["get"]["security"], [{"api_key": []}])
+        self.assertNotIn("security", self.editor.swagger["paths"]["/foo"]["get"])
+
 
 class TestSwaggerEditor_add_request_parameter_to_method(TestCase):
     def setUp(self):
@@ -1472,6 +1587,93 @@ class TestSwaggerEditor_add_resource_policy(TestCase):
         self.assertEqual(deep_sort_lists(expected), deep_sort_lists(self.editor.swagger[_X_POLICY]))
 
 
+def _uri(method, path):
+    return {"Fn::Sub": [f"execute-api:/${{__Stage__}}/{method}{path}", {"__Stage__": "prod"}]}
+
+
+class TestSwaggerEditor_add_resource_policy_aggregated(TestCase):
+    def setUp(self):
+        self.swagger = {"swagger": "2.0", "paths": {"/foo": {"get": {}, "put": {}}, "/bar": {"get": {}}}}
+        self.resource_policy = {
+            "AwsAccountWhitelist": ["123456"],
+            "IpRangeBlacklist": ["1.2.3.4"],
+            "SourceVpcWhitelist": ["vpc-1234"],
+        }
+
+    def _add_resource_policy(self, editor, paths):
+        with SwaggerEditor.aggregate_resource_policies():
+            for path in paths:
+                editor.add_resource_policy(self.resource_policy, path, "prod")
+        return editor.swagger[_X_POLICY]
+
+    def test_must_merge_statements_of_all_paths(self):
+        policy = self._add_resource_policy(SwaggerEditor(self.swagger), ["/foo", "/bar", "/foo"])
+
+        resources = [_uri("GET", "/foo"), _uri("PUT", "/foo"), _uri("GET", "/bar")]
+        allow = {"Effect": "Allow", "Action": "execute-api:Invoke", "Resource": resources, "Principal": "*"}
+        expected = {
+            "Version": "2012-10-17",
+            "Statement": [
+                {
+                    "Effect": "Allow",
+                    "Action": "execute-api:Invoke",
+                    "Resource": resources,
+                    "Principal": {"AWS": ["123456"]},
+                },
+                allow,
+                {**allow, "Effect": "Deny", "Condition": {"IpAddress": {"aws:SourceIp": ["1.2.3.4"]}}},
+                {**allow, "Effect": "Deny", "Condition": {"StringNotEquals": {"aws:SourceVpc": ["vpc-1234"]}}},
+            ],
+        }
+        self.assertEqual(policy, expected)
+
+    def test_must_allow_and_deny_the_same_requests(self):
+        def requests(policy):
+            statements = policy["Statement"] if isinstance(policy["Statement"], list) else [policy["Statement"]]
+            return sorted(
+                (statement["Effect"], str(statement.get("Principal")), str(statement.get("Condition")), str(resource))
+                for statement in statements
+                for resource in statement["Resource"]
+            )
+
+        editor = SwaggerEditor(self.swagger)
+        for path in ["/foo", "/bar"]:
+            editor.add_resource_policy(self.resource_policy, path, "prod")
+        expected = editor.swagger[_X_POLICY]
+
+        self.assertEqual(
+            requests(self._add_resource_policy(SwaggerEditor(self.swagger), ["/foo", "/bar"])), requests(expected)
+        )
+        self.assertLess(
+            len(self._add_resource_policy(SwaggerEditor(self.swagger), ["/foo", "/bar"])["Statement"]),
+            len(expected["Statement"]),
+        )
+
+    def test_must_merge_into_statements_of_the_document(self):
+        """
+        Each event of an API adds its statements with a new editor, on the document of the previous one
+        """
+        custom_statement = {"Sid": "Custom", "Effect": "Allow", "Action": "execute-api:Invoke", "Resource": ["*"]}
+        swagger = self._add_resource_policy(SwaggerEditor(self.swagger), ["/foo"])
+        self.swagger[_X_POLICY] = swagger
+        swagger["Statement"].insert(0, custom_statement)
+
+        policy = self._add_resource_policy(SwaggerEditor(self.swagger), ["/bar"])
+
+        self.assertEqual(len(policy["Statement"]), 5)
+        self.assertEqual(policy["Statement"][0], custom_statement)
+        for statement in policy["Statement"][1:]:
+            self.assertEqual(statement["Resource"], [_uri("GET", "/foo"), _uri("PUT", "/foo"), _uri("GET", "/bar")])
+
+    def test_must_not_aggregate_outside_of_the_context(self):
+        editor = SwaggerEditor(self.swagger)
+        with SwaggerEditor.aggregate_resource_policies():
+            editor.add_resource_policy(self.resource_policy, "/foo", "prod")
+        editor.add_resource_policy(self.resource_policy, "/bar", "prod")
+
+        self.assertEqual(len(editor.swagger[_X_POLICY]["Statement"]), 8)
+
+
 class TestSwaggerEditor_add_authorization_scopes(TestCase):
     def setUp(self):
         self.api = {
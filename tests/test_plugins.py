@@ -2,6 +2,8 @@ from enum import Enum
 from unittest import TestCase
 from unittest.mock import Mock, call
 
+from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton
+from samtranslator.metrics.metrics import Metrics, Unit
 from samtranslator.plugins import BasePlugin, LifeCycleEvents
 from samtranslator.plugins.sam_plugins import SamPlugins
 
@@ -269,6 +271,57 @@ class TestSamPluginsAct(TestCase):
         parent_mock.assert_has_calls([call.plugin1_hook(), call.plugin2_hook()])
 
 
+class TemplatePlugin(BasePlugin):
+    def __init__(self):
+        super().__init__()
+        self.templates = []
+
+    def on_before_transform_template(self, template_dict):
+        self.templates.append(template_dict)
+
+
+class TestSamPluginsDispatch(TestCase):
+    def test_act_must_only_invoke_overridden_hooks(self):
+        template_plugin = TemplatePlugin()
+        instance_hook_plugin = Yoyoyo("instance-hook")
+        instance_hook_plugin.on_after_transform_template = Mock()
+        sam_plugins = SamPlugins([Yoyoyo(), template_plugin, instance_hook_plugin])
+
+        self.assertEqual(sam_plugins._subscribers["on_before_transform_template"], [template_plugin])
+        self.assertEqual(sam_plugins._subscribers["on_before_transform_resource"], [])
+        self.assertEqual(sam_plugins._subscribers["on_after_transform_template"], [instance_hook_plugin])
+
+        sam_plugins.act(LifeCycleEvents.before_transform_template, {"Resources": {}})
+        sam_plugins.act(LifeCycleEvents.after_transform_template, {"Resources": {}})
+
+        self.assertEqual(template_plugin.templates, [{"Resources": {}}])
+        instance_hook_plugin.on_after_transform_template.assert_called_once_with({"Resources": {}})
+
+    def test_act_must_record_hook_latency(self):
+        failing_plugin = Yoyoyo("failing")
+        failing_plugin.on_before_transform_template = Mock(side_effect=IOError)
+        sam_plugins = SamPlugins([Yoyoyo(), TemplatePlugin(), failing_plugin])
+        metrics = Metrics()
+
+        with MetricsMethodWrapperSingleton.instance_for_context(metrics):
+            for _ in range(2):
+                with self.assertRaises(IOError):
+                    sam_plugins.act(LifeCycleEvents.before_transform_template, {})
+
+        def get_statistics(plugin_name, hook):
+            return metrics.get_statistics(
+                SamPlugins.HOOK_LATENCY_METRIC,
+                Unit.Milliseconds,
+                [{"Name": "Plugin", "Value": plugin_name}, {"Name": "Hook", "Value": hook}],
+            )
+
+        self.assertEqual(get_statistics("TemplatePlugin", "on_before_transform_template").sample_count, 2)
+        # Hooks raising exceptions are timed too, the no-op hooks are not invoked
+        self.assertEqual(get_statistics("failing", "on_before_transform_template").sample_count, 2)
+        self.assertIsNone(get_statistics("Yoyoyo", "on_before_transform_template"))
+        metrics.publish()
+
+
 class Yoyoyo(BasePlugin):
     pass
 
@@ -141,3 +141,74 @@ class TestApiGatewayDeploymentResource(TestCase):
 
         LogicalIdGeneratorMock.assert_not_called()
         stage.update_deployment_ref.assert_not_called()
+
+
+@patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+def test_aggregate_resource_policies():
+    def function(path, method):
+        return {
+            "Type": "AWS::Serverless::Function",
+            "Properties": {
+                "CodeUri": "s3://bucket/code.zip",
+                "Handler": "index.handler",
+                "Runtime": "python3.11",
+                "Events": {
+                    "Api": {
+                        "Type": "Api",
+                        "Properties": {"Path": path, "Method": method, "RestApiId": {"Ref": "ExplicitApi"}},
+                    },
+                    "Other": {
+                        "Type": "Api",
+                        "Properties": {
+                            "Path": path + "/other",
+                            "Method": method,
+                            "RestApiId": {"Ref": "ExplicitApi"},
+                            "Auth": {"ResourcePolicy": {"IpRangeWhitelist": ["10.0.0.0/8"]}},
+                        },
+                    },
+                },
+            },
+        }
+
+    resource_policy = {
+        "AwsAccountWhitelist": ["123456789012"],
+        "IpRangeBlacklist": ["1.2.3.4"],
+        "SourceVpcWhitelist": ["vpc-1234", "vpce-5678"],
+    }
+    manifest = {
+        "Transform": "AWS::Serverless-2016-10-31",
+        "Resources": {
+            "ExplicitApi": {
+                "Type": "AWS::Serverless::Api",
+                "Properties": {"StageName": "prod", "Auth": {"ResourcePolicy": resource_policy}},
+            },
+            **{
+                f"Function{index}": function(f"/path{index}", method)
+                for index, method in enumerate(["get", "post", "any"])
+            },
+        },
+    }
+
+    def get_policy(aggregate_resource_policies):
+        output = transform(
+            json.loads(json.dumps(manifest)),
+            {},
+            mock_policy_loader,
+            aggregate_resource_policies=aggregate_resource_policies,
+        )
+        return output["Resources"]["ExplicitApi"]["Properties"]["Body"]["x-amazon-apigateway-policy"]
+
+    def get_requests(policy):
+        return sorted(
+            json.dumps([statement["Effect"], statement["Principal"], statement.get("Condition"), resource])
+            for statement in policy["Statement"]
+            for resource in statement["Resource"]
+        )
+
+    policy = get_policy(False)
+    aggregated_policy = get_policy(True)
+
+    # The same requests are allowed and denied, with one statement per effect, principal and condition
+    assert get_requests(aggregated_policy) == sorted(set(get_requests(policy)))
+    assert len(aggregated_policy["Statement"]) == 5
+    assert len(policy["Statement"]) > 20
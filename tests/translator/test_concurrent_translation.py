@@ -0,0 +1,99 @@
+import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import TestCase
+
+from boto3 import Session
+from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton
+from samtranslator.metrics.metrics import DummyMetricsPublisher, Metrics
+from samtranslator.parser.parser import Parser
+from samtranslator.translator.arn_generator import ArnGenerator
+from samtranslator.translator.translator import Translator
+from samtranslator.yaml_helper import yaml_parse
+
+INPUT_FOLDER = Path(__file__).parent / "input"
+
+TEMPLATES = [
+    "all_policy_templates",
+    "api_endpoint_configuration",
+    "api_with_auth_all_maximum",
+    "connector_function_to_table",
+    "function_with_deployment_preference_all_parameters",
+    "function_with_event_source_mapping",
+    "function_with_sns_event_source_all_parameters",
+    "globals_for_function",
+    "state_machine_with_api",
+]
+REGIONS = ["us-east-1", "cn-north-1", "us-gov-west-1", "us-isob-east-1"]
+ROUNDS = 3
+
+
+def _managed_policy_map(partition):
+    return {
+        "AWSLambdaBasicExecutionRole": f"arn:{partition}:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole",
+        "AmazonDynamoDBFullAccess": f"arn:{partition}:iam::aws:policy/AmazonDynamoDBFullAccess",
+        "AmazonDynamoDBReadOnlyAccess": f"arn:{partition}:iam::aws:policy/AmazonDynamoDBReadOnlyAccess",
+        "AWSLambdaRole": f"arn:{partition}:iam::aws:policy/service-role/AWSLambdaRole",
+        "AWSXrayWriteOnlyAccess": f"arn:{partition}:iam::aws:policy/AWSXrayWriteOnlyAccess",
+    }
+
+
+def _translate(template, region):
+    partition = ArnGenerator.get_partition_name(region)
+    metrics = Metrics("ServerlessTransform", DummyMetricsPublisher())
+    translator = Translator(None, Parser(), boto_session=Session(region_name=region), metrics=metrics)
+    output = translator.translate(
+        copy.deepcopy(template), {}, get_managed_policy_map=lambda: _managed_policy_map(partition)
+    )
+    recorded = {name: len(data) for name, data in metrics.metrics_cache.items()}
+    metrics.publish()
+    return json.dumps(output, sort_keys=True), recorded
+
+
+class TestConcurrentTranslation(TestCase):
+    def tearDown(self):
+        # Translator sets the region of its session and its metrics process wide
+        ArnGenerator.BOTO_SESSION_REGION_NAME = None
+        MetricsMethodWrapperSingleton.set_instance(MetricsMethodWrapperSingleton._DUMMY_INSTANCE)
+
+    def test_concurrent_translations_match_serial_translations(self):
+        templates = {name: yaml_parse((INPUT_FOLDER / f"{name}.yaml").read_text()) for name in TEMPLATES}
+        cases = [(name, region) for name in TEMPLATES for region in REGIONS]
+        expected = {(name, region): _translate(templates[name], region) for name, region in cases}
+
+        # Every region has to produce a different output, otherwise the test would not catch region mix-ups
+        self.assertEqual(len({expected[("all_policy_templates", region)][0] for region in REGIONS}), len(REGIONS))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {
+                (name, region, i): executor.submit(_translate, templates[name], region)
+                for i in range(ROUNDS)
+                for name, region in cases
+            }
+            for (name, region, _), future in futures.items():
+                output, recorded = future.result()
+                self.assertEqual(output, expected[(name, region)][0], f"{name} in {region}")
+                self.assertEqual(recorded, expected[(name, region)][1], f"{name} in {region}")
+
+    def test_constructor_sets_process_wide_fallbacks(self):
+        default_metrics = MetricsMethodWrapperSingleton.get_instance()
+        metrics = Metrics("ServerlessTransform", DummyMetricsPublisher())
+        try:
+            Translator(None, Parser(), boto_session=Session(region_name="cn-north-1"), metrics=metrics)
+
+            # Used outside translate()
+            self.assertEqual(ArnGenerator.get_partition_name(), "aws-cn")
+            self.assertIs(MetricsMethodWrapperSingleton.get_instance(), metrics)
+        finally:
+            ArnGenerator.BOTO_SESSION_REGION_NAME = None
+            MetricsMethodWrapperSingleton.set_instance(default_metrics)
+
+    def test_context_region_takes_precedence_over_process_wide_region(self):
+        ArnGenerator.BOTO_SESSION_REGION_NAME = "us-east-1"
+        try:
+            with ArnGenerator.boto_session_region("cn-north-1"):
+                self.assertEqual(ArnGenerator.get_partition_name(), "aws-cn")
+            self.assertEqual(ArnGenerator.get_partition_name(), "aws")
+        finally:
+            ArnGenerator.BOTO_SESSION_REGION_NAME = None
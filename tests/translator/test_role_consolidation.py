@@ -0,0 +1,132 @@
+import copy
+from unittest import TestCase
+
+from samtranslator.translator.role_consolidation import consolidate_function_roles
+from samtranslator.translator.transform import transform
+
+from bin.benchmark_transform import StubManagedPolicyLoader, offline_transform_context
+
+
+def _function(**properties):
+    return {
+        "Type": "AWS::Serverless::Function",
+        "Properties": {"CodeUri": "s3://bucket/key", "Handler": "index.handler", "Runtime": "python3.11", **properties},
+    }
+
+
+def _role_of(output, function_id):
+    return output["Resources"][function_id]["Properties"]["Role"]["Fn::GetAtt"][0]
+
+
+class TestConsolidateFunctionRoles(TestCase):
+    def _transform(self, resources, share_function_roles=True, **kwargs):
+        with offline_transform_context("us-east-1"):
+            return transform(
+                {"Transform": "AWS::Serverless-2016-10-31", "Resources": copy.deepcopy(resources), **kwargs},
+                {},
+                StubManagedPolicyLoader(),
+                share_function_roles=share_function_roles,
+            )
+
+    def test_identical_roles_are_shared(self):
+        policies = [{"SQSPollerPolicy": {"QueueName": "queue"}}, "AWSLambdaExecute"]
+        resources = {
+            "First": _function(Policies=policies),
+            "Second": _function(Policies=policies),
+            "Third": _function(Policies=policies),
+            "Other": _function(Policies=["AWSLambdaExecute"]),
+        }
+        output = self._transform(resources)
+
+        # The shared role keeps the logical id of the first role, the logical ids of the functions do not change
+        self.assertEqual(
+            [_role_of(output, function_id) for function_id in resources], ["FirstRole"] * 3 + ["OtherRole"]
+        )
+        self.assertNotIn("SecondRole", output["Resources"])
+        self.assertNotIn("ThirdRole", output["Resources"])
+        self.assertEqual(
+            output["Resources"]["FirstRole"],
+            self._transform(resources, share_function_roles=False)["Resources"]["FirstRole"],
+        )
+
+    def test_roles_with_different_permissions_are_not_shared(self):
+        resources = {
+            "First": _function(Policies=[{"SQSPollerPolicy": {"QueueName": "first"}}]),
+            "Second": _function(Policies=[{"SQSPollerPolicy": {"QueueName": "second"}}]),
+            "Boundary": _function(PermissionsBoundary="arn:aws:iam::aws:policy/Boundary"),
+            "Tagged": _function(Tags={"team": "a"}),
+            "Default": _function(),
+        }
+        expected = self._transform(resources, share_function_roles=False)
+
+        self.assertEqual(self._transform(resources), expected)
+
+    def test_roles_with_event_source_policies(self):
+        queue_event = {"Queue": {"Type": "SQS", "Properties": {"Queue": "arn:aws:sqs:us-east-1:123456789012:queue"}}}
+        resources = {
+            "Poller": _function(Events=queue_event),
+            "OtherPoller": _function(Events=copy.deepcopy(queue_event)),
+            "Plain": _function(),
+        }
+        output = self._transform(resources)
+
+        # The policies added by the event sources are part of the fingerprint
+        self.assertEqual(_role_of(output, "OtherPoller"), "PollerRole")
+        self.assertEqual(_role_of(output, "Plain"), "PlainRole")
+
+    def test_roles_referenced_elsewhere_are_not_shared(self):
+        resources = {
+            "First": _function(),
+            "Second": _function(),
+            "Third": _function(),
+            "Fourth": _function(),
+            "Profile": {
+                "Type": "AWS::IAM::InstanceProfile",
+                "Properties": {"Roles": [{"Ref": "SecondRole"}]},
+            },
+        }
+        output = self._transform(resources, Outputs={"Role": {"Value": {"Fn::GetAtt": ["ThirdRole", "Arn"]}}})
+
+        self.assertEqual(_role_of(output, "First"), "FirstRole")
+        self.assertEqual(_role_of(output, "Second"), "SecondRole")
+        self.assertEqual(_role_of(output, "Third"), "ThirdRole")
+        self.assertEqual(_role_of(output, "Fourth"), "FirstRole")
+
+    def test_inline_policy_names_are_normalized(self):
+        def role(logical_id, **properties):
+            return {
+                "Type": "AWS::IAM::Role",
+                "Properties": {
+                    "Policies": [{"PolicyName": f"{logical_id}Policy0", "PolicyDocument": {"Statement": []}}],
+                    "Tags": [{"Key": "lambda:createdBy", "Value": "SAM"}],
+                    **properties,
+                },
+            }
+
+        def function(role_id):
+            return {"Type": "AWS::Lambda::Function", "Properties": {"Role": {"Fn::GetAtt": [role_id, "Arn"]}}}
+
+        template = {
+            "Resources": {
+                "ARole": role("ARole"),
+                "A": function("ARole"),
+                "BRole": role("BRole"),
+                "B": function("BRole"),
+                "CRole": role("CRole", RoleName="custom"),
+                "C": function("CRole"),
+                "DRole": {**role("DRole"), "Properties": {**role("DRole")["Properties"], "Tags": []}},
+                "D": function("DRole"),
+                "ERole": role("ERole"),
+                "E": function("ERole"),
+                "F": function("ERole"),
+            }
+        }
+        expected_a_role = copy.deepcopy(template["Resources"]["ARole"])
+
+        self.assertEqual(consolidate_function_roles(template), {"ARole": ["BRole"]})
+        self.assertEqual(template["Resources"]["ARole"], expected_a_role)
+        self.assertEqual(template["Resources"]["B"], function("ARole"))
+        # Roles not generated by SAM, and roles shared by several functions, are left as they are
+        self.assertEqual(
+            set(template["Resources"]) - {"A", "B", "C", "D", "E", "F"}, {"ARole", "CRole", "DRole", "ERole"}
+        )
@@ -0,0 +1,321 @@
+import copy
+import json
+from unittest import TestCase
+
+from samtranslator.translator.stack_splitter import (
+    MAX_OUTPUTS,
+    MAX_PARAMETERS,
+    MAX_RESOURCES,
+    NESTED_STACK_TYPE,
+    analyze_template_size,
+    split_template,
+)
+from samtranslator.translator.transform import transform
+
+from bin._template_generator import TemplateShape, generate_template
+from bin.benchmark_transform import StubManagedPolicyLoader, offline_transform_context
+
+PSEUDO_PARAMETERS = {"AWS::Region", "AWS::AccountId", "AWS::Partition", "AWS::URLSuffix", "AWS::NoValue"}
+
+
+def _references(value):
+    """Returns the names referenced with Ref and Fn::GetAtt, and the variables of Fn::Sub"""
+    references = set()
+    values = [value]
+    while values:
+        current = values.pop()
+        if isinstance(current, dict):
+            if "Ref" in current:
+                references.add(current["Ref"])
+            if "Fn::GetAtt" in current:
+                references.add(current["Fn::GetAtt"][0])
+            if "Fn::Sub" in current:
+                string, variables = (
+                    current["Fn::Sub"] if isinstance(current["Fn::Sub"], list) else (current["Fn::Sub"], {})
+                )
+                references.update(
+                    name.split(".")[0]
+                    for name in (part.split("}")[0] for part in string.split("${")[1:])
+                    if not name.startswith("!") and name not in variables
+                )
+            values.extend(current.values())
+        elif isinstance(current, list):
+            values.extend(current)
+    return references
+
+
+class TestStackSplitter(TestCase):
+    def assert_valid_split(self, template, parent, children, max_resources):
+        # Every resource is in exactly one nested stack, which all fit in the limit
+        resources = {}
+        for child in children.values():
+            self.assertLessEqual(len(child["Resources"]), max_resources)
+            for logical_id, resource in child["Resources"].items():
+                self.assertNotIn(logical_id, resources)
+                resources[logical_id] = resource
+            # References are to the resources, parameters and conditions of the nested stack
+            known = set(child["Resources"]) | set(child.get("Parameters", {})) | PSEUDO_PARAMETERS
+            self.assertLessEqual(_references(child["Resources"]), known)
+            self.assertLessEqual(_references(child.get("Outputs", {})), known)
+        self.assertEqual(set(resources), set(template["Resources"]))
+
+        # The parent passes every parameter of the nested stacks, from the outputs of earlier nested stacks
+        self.assertEqual(list(parent["Resources"]), list(children))
+        for index, (stack_id, stack) in enumerate(parent["Resources"].items()):
+            self.assertEqual(stack["Type"], NESTED_STACK_TYPE)
+            parameters = stack["Properties"].get("Parameters", {})
+            self.assertEqual(set(parameters), set(children[stack_id].get("Parameters", {})))
+            for name, value in parameters.items():
+                if "Fn::If" in value:
+                    # Outputs of resources with a condition are only passed when the resource is created
+                    condition, passed, no_value = value["Fn::If"]
+                    self.assertEqual(no_value, {"Ref": "AWS::NoValue"})
+                    self.assertIn(condition, parent["Conditions"])
+                    self.assertEqual(children[stack_id]["Parameters"][name]["Default"], "")
+                else:
+                    passed = value
+                if "Fn::GetAtt" in passed:
+                    other_stack, output = passed["Fn::GetAtt"]
+                    self.assertLess(list(children).index(other_stack), index)
+                    self.assertIn(output.split(".", 1)[1], children[other_stack]["Outputs"])
+                    self.assertIn(other_stack, stack["DependsOn"])
+                else:
+                    self.assertLessEqual(_references(value), set(template.get("Parameters", {})) | {"AWS::StackName"})
+
+    def test_analyze_template_size(self):
+        template = {
+            "Resources": {
+                "Small": {"Type": "AWS::SNS::Topic"},
+                "Large": {"Type": "AWS::SQS::Queue", "Properties": {"QueueName": "a" * 100}},
+                "Other": {"Type": "AWS::SNS::Topic"},
+            }
+        }
+
+        analysis = analyze_template_size(template)
+
+        self.assertEqual(analysis["resource_count"], 3)
+        self.assertEqual(analysis["template_bytes"], len(json.dumps(template, separators=(",", ":"))))
+        self.assertEqual([size["logical_id"] for size in analysis["resources"]], ["Large", "Small", "Other"])
+        self.assertEqual(list(analysis["bytes_by_type"]), ["AWS::SQS::Queue", "AWS::SNS::Topic"])
+        self.assertEqual(analysis["bytes_by_type"]["AWS::SNS::Topic"], 2 * analysis["resources"][-1]["bytes"])
+        self.assertFalse(analysis["exceeds_resource_limit"])
+        self.assertFalse(analysis["exceeds_size_limit"])
+
+        many = {"Resources": {f"Topic{i}": {"Type": "AWS::SNS::Topic"} for i in range(MAX_RESOURCES + 1)}}
+        self.assertTrue(analyze_template_size(many)["exceeds_resource_limit"])
+
+    def test_split_template(self):
+        template = {
+            "Parameters": {
+                "Env": {"Type": "String", "Default": "dev"},
+                "Subnets": {"Type": "List<AWS::EC2::Subnet::Id>"},
+                "Unused": {"Type": "String"},
+            },
+            "Conditions": {
+                "IsProd": {"Fn::Equals": [{"Ref": "Env"}, "prod"]},
+                "IsNotProd": {"Fn::Not": [{"Condition": "IsProd"}]},
+            },
+            "Resources": {
+                "Topic": {"Type": "AWS::SNS::Topic", "Condition": "IsNotProd"},
+                "Queue": {"Type": "AWS::SQS::Queue"},
+                "Subscription": {
+                    "Type": "AWS::SNS::Subscription",
+                    "DependsOn": "Queue",
+                    "Properties": {
+                        "TopicArn": {"Ref": "Topic"},
+                        "Endpoint": {"Fn::GetAtt": ["Queue", "Arn"]},
+                        "Name": {"Fn::Sub": "${AWS::StackName}-${Queue.QueueName}-${Env}"},
+                    },
+                },
+                "Independent": {"Type": "AWS::EC2::SecurityGroup", "Properties": {"Subnets": {"Ref": "Subnets"}}},
+            },
+            "Outputs": {"QueueUrl": {"Value": {"Fn::Sub": "${Queue}"}, "Export": {"Name": "queue"}}},
+        }
+        original = copy.deepcopy(template)
+
+        parent, children = split_template(template, max_resources=2, template_url=lambda name: f"s3://b/{name}")
+
+        self.assertEqual(template, original)
+        self.assert_valid_split(template, parent, children, 2)
+        self.assertEqual(
+            [list(child["Resources"]) for child in children.values()],
+            [["Topic", "Queue"], ["Subscription", "Independent"]],
+        )
+        self.assertEqual(parent["Resources"]["NestedStack1"]["Properties"]["TemplateURL"], "s3://b/NestedStack1")
+
+        first, second = children.values()
+        self.assertEqual(first["Conditions"], template["Conditions"])
+        self.assertEqual(first["Parameters"], {"Env": {"Type": "String"}})
+        self.assertEqual(
+            first["Outputs"],
+            {
+                "Topic": {"Value": {"Ref": "Topic"}, "Condition": "IsNotProd"},
+                "QueueQueueName": {"Value": {"Fn::GetAtt": ["Queue", "QueueName"]}},
+                "QueueArn": {"Value": {"Fn::GetAtt": ["Queue", "Arn"]}},
+                "Queue": {"Value": {"Ref": "Queue"}},
+            },
+        )
+        self.assertNotIn("Conditions", second)
+        self.assertEqual(
+            second["Resources"]["Subscription"],
+            {
+                "Type": "AWS::SNS::Subscription",
+                "Properties": {
+                    "TopicArn": {"Ref": "Topic"},
+                    "Endpoint": {"Ref": "QueueArn"},
+                    "Name": {
+                        "Fn::Sub": [
+                            "${ParentStackName}-${QueueQueueName}-${Env}",
+                            {
+                                "ParentStackName": {"Ref": "ParentStackName"},
+                                "QueueQueueName": {"Ref": "QueueQueueName"},
+                            },
+                        ]
+                    },
+                },
+            },
+        )
+        self.assertEqual(
+            parent["Resources"]["NestedStack2"],
+            {
+                "Type": NESTED_STACK_TYPE,
+                "DependsOn": ["NestedStack1"],
+                "Properties": {
+                    "TemplateURL": "s3://b/NestedStack2",
+                    "Parameters": {
+                        "Env": {"Ref": "Env"},
+                        "ParentStackName": {"Ref": "AWS::StackName"},
+                        "QueueArn": {"Fn::GetAtt": ["NestedStack1", "Outputs.QueueArn"]},
+                        "QueueQueueName": {"Fn::GetAtt": ["NestedStack1", "Outputs.QueueQueueName"]},
+                        "Subnets": {"Fn::Join": [",", {"Ref": "Subnets"}]},
+                        "Topic": {
+                            "Fn::If": [
+                                "IsNotProd",
+                                {"Fn::GetAtt": ["NestedStack1", "Outputs.Topic"]},
+                                {"Ref": "AWS::NoValue"},
+                            ]
+                        },
+                    },
+                },
+            },
+        )
+        self.assertEqual(second["Parameters"]["Subnets"], {"Type": "List<AWS::EC2::Subnet::Id>"})
+        self.assertEqual(second["Parameters"]["Topic"], {"Type": "String", "Default": ""})
+        self.assertEqual(
+            parent["Outputs"],
+            {
+                "QueueUrl": {
+                    "Value": {"Fn::Sub": ["${Queue}", {"Queue": {"Fn::GetAtt": ["NestedStack1", "Outputs.Queue"]}}]},
+                    "Export": {"Name": "queue"},
+                }
+            },
+        )
+        self.assertEqual(parent["Parameters"], template["Parameters"])
+
+    def test_connected_resources_are_kept_together(self):
+        template = {
+            "Resources": {
+                "A1": {"Type": "AWS::SNS::Topic"},
+                "B1": {"Type": "AWS::SNS::Topic"},
+                "A2": {"Type": "AWS::SNS::Topic", "Properties": {"Name": {"Ref": "A1"}}},
+                "B2": {"Type": "AWS::SNS::Topic", "DependsOn": ["B1"]},
+            }
+        }
+
+        parent, children = split_template(template, max_resources=3)
+
+        self.assertEqual([list(child["Resources"]) for child in children.values()], [["A1", "A2"], ["B1", "B2"]])
+        self.assertNotIn("Outputs", children["NestedStack1"])
+        self.assertEqual(parent["Resources"]["NestedStack1"]["Properties"], {"TemplateURL": "NestedStack1.json"})
+
+    def test_conditions_use_pseudo_parameters_of_parent_stack(self):
+        template = {
+            "Conditions": {"IsMain": {"Fn::Equals": [{"Ref": "AWS::StackName"}, "main"]}},
+            "Resources": {
+                "Topic": {"Type": "AWS::SNS::Topic", "Condition": "IsMain"},
+                "Queue": {
+                    "Type": "AWS::SQS::Queue",
+                    "Properties": {"QueueName": {"Fn::GetAtt": ["Topic", "TopicName"]}},
+                },
+            },
+        }
+
+        parent, children = split_template(template, max_resources=1)
+
+        first, second = children.values()
+        self.assertEqual(first["Conditions"], {"IsMain": {"Fn::Equals": [{"Ref": "ParentStackName"}, "main"]}})
+        self.assertEqual(first["Parameters"], {"ParentStackName": {"Type": "String"}})
+        self.assertEqual(
+            parent["Resources"]["NestedStack1"]["Properties"]["Parameters"],
+            {"ParentStackName": {"Ref": "AWS::StackName"}},
+        )
+        self.assertEqual(parent["Conditions"], template["Conditions"])
+        self.assertEqual(second["Parameters"], {"TopicTopicName": {"Type": "String", "Default": ""}})
+        self.assertEqual(
+            parent["Resources"]["NestedStack2"]["Properties"]["Parameters"],
+            {
+                "TopicTopicName": {
+                    "Fn::If": [
+                        "IsMain",
+                        {"Fn::GetAtt": ["NestedStack1", "Outputs.TopicTopicName"]},
+                        {"Ref": "AWS::NoValue"},
+                    ]
+                }
+            },
+        )
+
+    def test_mappings_used_by_conditions(self):
+        template = {
+            "Mappings": {"Envs": {"prod": {"Enabled": "true"}}},
+            "Conditions": {"IsEnabled": {"Fn::Equals": [{"Fn::FindInMap": ["Envs", "prod", "Enabled"]}, "true"]}},
+            "Resources": {
+                "Topic": {"Type": "AWS::SNS::Topic", "Condition": "IsEnabled"},
+                "Queue": {"Type": "AWS::SQS::Queue"},
+            },
+        }
+
+        _, children = split_template(template, max_resources=1)
+
+        first, second = children.values()
+        self.assertEqual(first["Mappings"], template["Mappings"])
+        self.assertEqual(first["Conditions"], template["Conditions"])
+        self.assertNotIn("Mappings", second)
+
+    def test_nested_stack_limits(self):
+        template = {
+            "Parameters": {f"Name{i}": {"Type": "String"} for i in range(MAX_PARAMETERS + 1)},
+            "Resources": {
+                "Topic": {
+                    "Type": "AWS::SNS::Topic",
+                    "Properties": {
+                        "Tags": [{"Key": f"Name{i}", "Value": {"Ref": f"Name{i}"}} for i in range(MAX_PARAMETERS + 1)]
+                    },
+                }
+            },
+        }
+        with self.assertRaisesRegex(ValueError, "NestedStack1 has 201 parameters"):
+            split_template(template)
+
+        template = {
+            "Resources": {
+                **{f"Topic{i}": {"Type": "AWS::SNS::Topic"} for i in range(MAX_OUTPUTS + 1)},
+                "Queue": {
+                    "Type": "AWS::SQS::Queue",
+                    "Properties": {
+                        "Tags": [{"Key": "Topic", "Value": {"Ref": f"Topic{i}"}} for i in range(MAX_OUTPUTS + 1)]
+                    },
+                },
+            }
+        }
+        with self.assertRaisesRegex(ValueError, "has 201 outputs"):
+            split_template(template, max_resources=MAX_OUTPUTS + 1)
+
+    def test_split_translated_template(self):
+        shape = TemplateShape(functions=60, api_events=1, sqs_events=1, connectors=10, layers=2)
+        with offline_transform_context("us-east-1"):
+            template = transform(generate_template(shape), {}, StubManagedPolicyLoader())
+
+        parent, children = split_template(template, max_resources=100)
+
+        self.assertGreater(len(children), 1)
+        self.assert_valid_split(template, parent, children, 100)
@@ -0,0 +1,216 @@
+import asyncio
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from boto3 import Session
+from botocore.exceptions import ClientError
+from samtranslator.feature_toggle.feature_toggle import FeatureToggle, FeatureToggleLocalConfigProvider
+from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton
+from samtranslator.model.exceptions import InvalidDocumentException
+from samtranslator.parser.parser import Parser
+from samtranslator.plugins.application.serverless_app_plugin import ServerlessAppPlugin
+from samtranslator.translator.arn_generator import ArnGenerator
+from samtranslator.translator.transform import transform, transform_async
+from samtranslator.translator.translator import Translator
+from samtranslator.yaml_helper import yaml_parse
+
+from tests.translator.test_translator import mock_sar_service_call
+
+INPUT_FOLDER = Path(__file__).parent / "input"
+
+TEMPLATES = [
+    "all_policy_templates",
+    "application_preparing_state",
+    "application_with_intrinsics",
+    "basic_application",
+    "function_with_policy_templates",
+    "function_with_resource_refs",
+    "state_machine_with_managed_policy",
+    "error_application_does_not_exist",
+    "error_application_no_access",
+    "error_function_invalid_codeuri",
+]
+
+FUNCTION = {
+    "Type": "AWS::Serverless::Function",
+    "Properties": {"CodeUri": "s3://bucket/key", "Handler": "index.handler", "Runtime": "python3.11"},
+}
+
+
+def _application(application_id):
+    return {
+        "Type": "AWS::Serverless::Application",
+        "Properties": {"Location": {"ApplicationId": application_id, "SemanticVersion": "1.0.0"}},
+    }
+
+
+def _policy_loader(policy_map):
+    loader = Mock()
+    loader.load.return_value = policy_map
+    return loader
+
+
+def _transform_or_error(transform_function, manifest):
+    try:
+        return transform_function(copy.deepcopy(manifest), {}, _policy_loader({"CustomPolicy": "arn:custom"}))
+    except InvalidDocumentException as e:
+        return sorted(cause.message for cause in e.causes)
+
+
+@patch("boto3.session.Session.region_name", "us-east-1")
+@patch("samtranslator.plugins.application.serverless_app_plugin.ServerlessAppPlugin._sar_service_call")
+class TestTransformAsync(TestCase):
+    def tearDown(self):
+        # Translator stores the region of the session and its metrics globally
+        ArnGenerator.BOTO_SESSION_REGION_NAME = None
+        MetricsMethodWrapperSingleton.set_instance(MetricsMethodWrapperSingleton._DUMMY_INSTANCE)
+
+    def test_transform_async_matches_transform(self, _):
+        for name in TEMPLATES:
+            manifest = yaml_parse((INPUT_FOLDER / f"{name}.yaml").read_text())
+            with patch.object(ServerlessAppPlugin, "_sar_service_call", mock_sar_service_call):
+                expected = _transform_or_error(transform, manifest)
+                actual = _transform_or_error(lambda *args: asyncio.run(transform_async(*args)), manifest)
+            self.assertEqual(actual, expected, name)
+
+    @patch("boto3.client", Mock())
+    def test_applications_are_requested_concurrently(self, sar_service_call):
+        threads = set()
+        # Every request waits for the others, so the test fails unless the four are made concurrently
+        all_requested = threading.Barrier(4, timeout=10)
+
+        def create_cfn_template(*args):
+            threads.add(threading.get_ident())
+            all_requested.wait()
+            return {
+                "ApplicationId": args[2],
+                "TemplateUrl": f"https://{args[2]}",
+                "Status": "ACTIVE",
+                "TemplateId": "id",
+            }
+
+        sar_service_call.side_effect = create_cfn_template
+        manifest = {"Resources": {f"App{i}": _application(f"app-{i}") for i in range(4)}}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            output = asyncio.run(transform_async(manifest, {}, _policy_loader({}), executor=executor))
+
+        # Every application is requested once, by the prefetch
+        self.assertEqual(sar_service_call.call_count, 4)
+        self.assertEqual(len(threads), 4)
+        self.assertEqual(output["Resources"]["App3"]["Properties"]["TemplateURL"], "https://app-3")
+
+    def test_sar_errors_are_raised_like_transform(self, sar_service_call):
+        sar_service_call.side_effect = ClientError({"Error": {"Code": "BadBadError"}}, "CreateCloudFormationTemplate")
+        manifest = {"Resources": {"App": _application("app")}}
+
+        with self.assertRaises(ClientError):
+            asyncio.run(transform_async(manifest, {}, _policy_loader({})))
+        # Once by the prefetch, the transform raises the error of the prefetch
+        self.assertEqual(sar_service_call.call_count, 1)
+
+    def test_sar_is_not_called_for_invalid_templates(self, sar_service_call):
+        with self.assertRaises(InvalidDocumentException):
+            asyncio.run(transform_async({"Resources": []}, {}, _policy_loader({})))
+        sar_service_call.assert_not_called()
+
+    def test_managed_policies_are_loaded_only_when_needed(self, sar_service_call):
+        known_policies = copy.deepcopy(FUNCTION)
+        known_policies["Properties"]["Policies"] = ["AWSLambdaExecute", "arn:aws:iam::aws:policy/Custom"]
+        loader = _policy_loader({"CustomPolicy": "arn:custom"})
+
+        asyncio.run(transform_async({"Resources": {"Function": known_policies}}, {}, loader))
+        loader.load.assert_not_called()
+
+        custom_policy = copy.deepcopy(FUNCTION)
+        custom_policy["Properties"]["Policies"] = "CustomPolicy"
+        output = asyncio.run(transform_async({"Resources": {"Function": custom_policy}}, {}, loader))
+        loader.load.assert_called_once_with()
+        self.assertIn("arn:custom", output["Resources"]["FunctionRole"]["Properties"]["ManagedPolicyArns"])
+
+    def test_managed_policy_errors_are_raised_like_transform(self, sar_service_call):
+        loader = Mock()
+        loader.load.side_effect = ClientError({"Error": {"Code": "AccessDenied"}}, "ListPolicies")
+        function = copy.deepcopy(FUNCTION)
+        function["Properties"]["Policies"] = "CustomPolicy"
+
+        with self.assertRaises(ClientError):
+            transform({"Resources": {"Function": copy.deepcopy(function)}}, {}, loader)
+        with self.assertRaises(ClientError):
+            asyncio.run(transform_async({"Resources": {"Function": function}}, {}, loader))
+
+    def test_create_feature_toggle_runs_on_executor(self, sar_service_call):
+        threads = []
+
+        def create_feature_toggle():
+            threads.append(threading.get_ident())
+            return FeatureToggle(
+                FeatureToggleLocalConfigProvider(
+                    str(Path(__file__).parents[1] / "feature_toggle" / "input" / "feature_toggle_config.json")
+                ),
+                stage="beta",
+                account_id="123456789012",
+                region="us-west-2",
+            )
+
+        translator = Translator({}, Parser(), boto_session=Session(region_name="us-east-1"))
+        asyncio.run(
+            translator.translate_async(
+                {"Resources": {"Function": FUNCTION}}, {}, create_feature_toggle=create_feature_toggle
+            )
+        )
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+        self.assertEqual(translator.feature_toggle.stage, "beta")
+
+    def test_translation_runs_on_executor(self, sar_service_call):
+        translations = []
+        translate = Translator._translate
+
+        def _translate(translator, *args):
+            translations.append((threading.get_ident(), ArnGenerator.get_boto_session_region_name()))
+            return translate(translator, *args)
+
+        translator = Translator({}, Parser(), boto_session=Session(region_name="us-east-1"))
+        ArnGenerator.BOTO_SESSION_REGION_NAME = None
+        with patch.object(Translator, "_translate", _translate):
+            asyncio.run(translator.translate_async({"Resources": {"Function": FUNCTION}}, {}))
+
+        self.assertEqual(len(translations), 1)
+        self.assertNotEqual(translations[0][0], threading.get_ident())
+        # In the context of the translation
+        self.assertEqual(translations[0][1], "us-east-1")
+
+    @patch("boto3.client", Mock())
+    def test_concurrent_retries_share_wait_time(self, sar_service_call):
+        # Every throttled request sleeps at the same time as the others
+        all_throttled = threading.Barrier(4, timeout=10)
+        throttled = set()
+
+        def create_cfn_template(*args):
+            if args[2] not in throttled:
+                throttled.add(args[2])
+                raise ClientError({"Error": {"Code": "TooManyRequestsException"}}, "CreateCloudFormationTemplate")
+            return {
+                "ApplicationId": args[2],
+                "TemplateUrl": f"https://{args[2]}",
+                "Status": "ACTIVE",
+                "TemplateId": "id",
+            }
+
+        sar_service_call.side_effect = create_cfn_template
+        plugin = ServerlessAppPlugin()
+        translator = Translator({}, Parser(), plugins=[plugin], boto_session=Session(region_name="us-east-1"))
+        manifest = {"Resources": {f"App{i}": _application(f"app-{i}") for i in range(4)}}
+
+        with ThreadPoolExecutor(max_workers=4) as executor, patch.object(
+            ServerlessAppPlugin, "_get_sleep_time_sec", return_value=1
+        ), patch("samtranslator.plugins.application.serverless_app_plugin.sleep", lambda _: all_throttled.wait()):
+            asyncio.run(translator.translate_async(manifest, {}, executor=executor))
+
+        self.assertEqual(plugin._total_wait_time, 4)
@@ -1129,6 +1129,22 @@ class TestPluginsUsage(TestCase):
         policy_templates_processor_mock.assert_called_once_with(default_templates)
         policy_templates_for_function_plugin_mock.assert_called_once_with(processor_instance)
 
+    @patch("samtranslator.translator.translator.PolicyTemplatesProcessor")
+    @patch("samtranslator.translator.translator.PolicyTemplatesForResourcePlugin")
+    def test_make_policy_template_for_function_plugin_must_reuse_given_processor(
+        self, policy_templates_for_function_plugin_mock, policy_templates_processor_mock
+    ):
+        processor_instance = Mock()
+        plugin_instance = Mock()
+        policy_templates_for_function_plugin_mock.return_value = plugin_instance
+
+        result = make_policy_template_for_function_plugin(processor_instance)
+
+        self.assertEqual(plugin_instance, result)
+        policy_templates_processor_mock.get_default_policy_templates_json.assert_not_called()
+        policy_templates_processor_mock.assert_not_called()
+        policy_templates_for_function_plugin_mock.assert_called_once_with(processor_instance)
+
     @patch.object(Resource, "from_dict")
     @patch("samtranslator.translator.translator.SamPlugins")
     @patch("samtranslator.translator.translator.prepare_plugins")
@@ -1152,7 +1168,7 @@ class TestPluginsUsage(TestCase):
             "MyTable", manifest["Resources"]["MyTable"], sam_plugins=sam_plugins_object_mock
         )
         prepare_plugins_mock.assert_called_once_with(
-            initial_plugins, {"AWS::Region": "ap-southeast-1", "AWS::Partition": "aws"}
+            initial_plugins, {"AWS::Region": "ap-southeast-1", "AWS::Partition": "aws"}, None
         )
 
 
@@ -0,0 +1,21 @@
+import asyncio
+import contextvars
+import threading
+from unittest import TestCase
+
+from samtranslator.utils.concurrency import run_in_executor
+
+_value: contextvars.ContextVar[str] = contextvars.ContextVar("value", default="default")
+
+
+class TestRunInExecutor(TestCase):
+    def test_runs_in_a_copy_of_the_context(self):
+        async def run():
+            _value.set("translation")
+            return await run_in_executor(None, lambda suffix: (_value.get() + suffix, threading.get_ident()), "!")
+
+        value, thread = asyncio.run(run())
+
+        self.assertEqual(value, "translation!")
+        self.assertNotEqual(thread, threading.get_ident())
+        self.assertEqual(_value.get(), "default")
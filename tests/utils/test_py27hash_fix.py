@@ -145,6 +145,18 @@ class TestPy27Keys(TestCase):
         copied = py27_keys.copy()
         self.assertEqual(copied.keys(), ["a", "c", "b", "d"])
 
+    def test_clone(self):
+        py27_keys = Py27Keys()
+        for key in ["a", "b", "c", "d", "e", "f"]:
+            py27_keys.add(key)
+        py27_keys.remove("b")
+
+        cloned = py27_keys.clone()
+        self.assertEqual(cloned.keys(), py27_keys.keys())
+        self.assertEqual(cloned.__dict__, py27_keys.__dict__)
+        cloned.add("b")
+        self.assertNotIn("b", py27_keys.keys())
+
     def test_pop(self):
         input_keys = ["a", "b", "c", "d"]
         py27_keys = Py27Keys()
@@ -440,6 +452,24 @@ class TestPy27Dict(TestCase):
         py27_dict = Py27Dict({"a": ""})
         self.assertEqual(py27_dict.copy(), {"a": ""})
 
+    def test_clone_dict(self):
+        py27_dict = Py27Dict()
+        for key in ["/users", "/users/{id}", "/orders", "/orders/{id}", "/items", "/items/{id}"]:
+            py27_dict[key] = Py27Dict({"get": {"parameters": [{"name": "id"}]}, "value": ("a", "b")})
+        del py27_dict["/orders"]
+
+        cloned = py27_dict.clone()
+        self.assertEqual(cloned, py27_dict)
+        self.assertEqual(list(cloned), list(py27_dict))
+        self.assertEqual(cloned.keylist.__dict__, py27_dict.keylist.__dict__)
+        # Dicts and lists are copied, other values are shared
+        self.assertIsInstance(cloned["/users"], Py27Dict)
+        self.assertIsNot(cloned["/users"], py27_dict["/users"])
+        self.assertIsNot(cloned["/users"]["get"]["parameters"][0], py27_dict["/users"]["get"]["parameters"][0])
+        self.assertIs(cloned["/users"]["value"], py27_dict["/users"]["value"])
+        cloned["/orders"] = {}
+        self.assertNotIn("/orders", py27_dict)
+
     def test_pop(self):
         py27_dict = Py27Dict({"a": "b"})
         self.assertEqual(py27_dict.pop("a"), "b")